@@ -0,0 +1,270 @@
+### Standard Libraries
+import hashlib
+import multiprocessing
+import os
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, List, Optional, Tuple
+
+# Third-Party Libraries
+from rdkit import Chem
+from rdkit.Chem.Draw import rdMolDraw2D
+
+### On-disk cache of rendered compound depictions
+###
+### Depictions are rendered once per canonical SMILES, format and size and kept as files, so plate views and
+### reports that show the same compound again read the file instead of rendering it:
+###
+###     depictions = client.depiction_cache()
+###     svg = depictions.get("OCC", size=(300, 300), fmt="svg").decode()
+###     path = depictions.path("OCC", size=(200, 200), fmt="png")
+###
+### Files are written atomically (temporary file and rename), so several processes can share one directory.
+### Once the directory grows beyond max_bytes, the least recently used depictions are removed. After
+### import_library or import_library_chunked of the client, all compounds of the library are pre-rendered
+### in the background across a process pool.
+
+FORMATS = ("svg", "png")
+
+DEFAULT_DIRECTORY = os.path.join(os.path.expanduser("~"), ".ffcs_db_client", "depictions")
+
+def render(mol, size: Tuple[int, int], fmt: str) -> bytes:
+    """
+    Renders a molecule as SVG or PNG.
+    """
+    width, height = size
+    if fmt == "svg":
+        drawer = rdMolDraw2D.MolDraw2DSVG(width, height)
+    elif fmt == "png":
+        drawer = rdMolDraw2D.MolDraw2DCairo(width, height)
+    else:
+        raise ValueError(f"Unsupported format: {fmt}")
+    rdMolDraw2D.PrepareAndDrawMolecule(drawer, mol)
+    drawer.FinishDrawing()
+    text = drawer.GetDrawingText()
+    return text.encode("utf-8") if isinstance(text, str) else text
+
+def _prerender(directory: str, max_bytes: int, smiles: List[str], sizes: List[Tuple[int, int]],
+               formats: List[str]) -> Tuple[int, List[str]]:
+    """
+    Worker of the process pool; returns the number of rendered depictions and the SMILES that could not be parsed.
+    """
+    cache = DepictionCache(directory, max_bytes=max_bytes)
+    rendered = 0
+    failures = []
+    for value in smiles:
+        try:
+            for size in sizes:
+                for fmt in formats:
+                    rendered += cache._ensure(value, size, fmt)
+        except ValueError:
+            failures.append(value)
+    return rendered, failures
+
+class DepictionCache:
+    """
+    Size-bounded on-disk cache of SVG and PNG depictions keyed by canonical SMILES, format and size.
+
+    Args:
+        directory (str, optional): Directory of the cache, shared by all processes using it; by default
+                                   ~/.ffcs_db_client/depictions.
+        max_bytes (int): Size of the cache above which the least recently used depictions are removed.
+        prerender_sizes (List[Tuple[int, int]]): Sizes pre-rendered for imported libraries.
+        prerender_formats (List[str]): Formats pre-rendered for imported libraries.
+        processes (int, optional): Number of processes used for pre-rendering; by default the number of CPUs.
+        client (ffcsdbclient, optional): The client used to retrieve libraries imported with import_library_chunked.
+    """
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: int = 256 * 1024 * 1024,
+                 prerender_sizes: Iterable[Tuple[int, int]] = ((300, 300),), prerender_formats: Iterable[str] = ("svg",),
+                 processes: Optional[int] = None, client=None):
+        self.directory = directory or DEFAULT_DIRECTORY
+        self.max_bytes = max_bytes
+        self.prerender_sizes = [tuple(size) for size in prerender_sizes]
+        self.prerender_formats = list(prerender_formats)
+        self.processes = processes or os.cpu_count() or 1
+        self.client = client
+
+        ### Bytes written since the size of the directory was last checked
+        self.lock = threading.Lock()
+        self.written = 0
+        self.threads: List[threading.Thread] = []
+        os.makedirs(self.directory, exist_ok=True)
+
+    ### Files
+
+    @staticmethod
+    def canonical_smiles(smiles: str) -> Tuple[str, Chem.Mol]:
+        """
+        Returns the canonical SMILES and the molecule of a SMILES.
+
+        Raises:
+            ValueError: If the SMILES cannot be parsed.
+        """
+        mol = Chem.MolFromSmiles(smiles) if smiles else None
+        if mol is None:
+            raise ValueError(f"Invalid SMILES: {smiles}")
+        return Chem.MolToSmiles(mol), mol
+
+    def _file(self, canonical_smiles: str, size: Tuple[int, int], fmt: str) -> str:
+        if fmt not in FORMATS:
+            raise ValueError(f"Unsupported format: {fmt}")
+        key = hashlib.sha256(f"{canonical_smiles}|{size[0]}x{size[1]}".encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, key[:2], f"{key}.{fmt}")
+
+    def _ensure(self, smiles: str, size: Tuple[int, int], fmt: str) -> bool:
+        """
+        Renders the depiction into the cache unless it exists; returns whether it was rendered.
+        """
+        canonical_smiles, mol = self.canonical_smiles(smiles)
+        path = self._file(canonical_smiles, size, fmt)
+        if os.path.exists(path):
+            return False
+        self._write(path, render(mol, size, fmt))
+        return True
+
+    def _write(self, path: str, content: bytes):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        descriptor, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, 'wb') as file:
+                file.write(content)
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        with self.lock:
+            self.written += len(content)
+            prune = self.written > self.max_bytes // 10
+            if prune:
+                self.written = 0
+        if prune:
+            self.prune()
+
+    def prune(self):
+        """
+        Removes the least recently used depictions until the cache is below 90% of max_bytes.
+        """
+        files = []
+        total = 0
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                if name.endswith(".tmp"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+
+        if total <= self.max_bytes:
+            return
+        for _, file_size, path in sorted(files):
+            if total <= self.max_bytes * 0.9:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= file_size
+
+    ### Depictions
+
+    def path(self, smiles: str, size: Tuple[int, int] = (300, 300), fmt: str = "svg") -> str:
+        """
+        Returns the file of the depiction of a compound, rendering it if it is not cached.
+
+        Raises:
+            ValueError: If the SMILES cannot be parsed or the format is not supported.
+        """
+        canonical_smiles, mol = self.canonical_smiles(smiles)
+        path = self._file(canonical_smiles, size, fmt)
+        try:
+            ### The modification time marks the depiction as recently used for prune
+            os.utime(path)
+        except FileNotFoundError:
+            self._write(path, render(mol, size, fmt))
+        return path
+
+    def get(self, smiles: str, size: Tuple[int, int] = (300, 300), fmt: str = "svg") -> bytes:
+        """
+        Returns the depiction of a compound (SVG or PNG), rendering it if it is not cached.
+
+        Raises:
+            ValueError: If the SMILES cannot be parsed or the format is not supported.
+        """
+        canonical_smiles, mol = self.canonical_smiles(smiles)
+        path = self._file(canonical_smiles, size, fmt)
+        try:
+            with open(path, 'rb') as file:
+                content = file.read()
+            os.utime(path)
+            return content
+        except FileNotFoundError:
+            content = render(mol, size, fmt)
+            self._write(path, content)
+            return content
+
+    ### Pre-rendering
+
+    def prerender_library(self, library: dict, chunk_size: int = 200) -> dict:
+        """
+        Renders the depictions of all fragments of a library in prerender_sizes and prerender_formats across
+        a process pool; depictions that are cached already are skipped.
+
+        Returns:
+            dict: 'rendered', the number of depictions rendered, and 'failures', the SMILES that could not be parsed.
+        """
+        smiles = list(dict.fromkeys(fragment.get("smiles") for fragment in library.get("fragments", [])
+                                    if fragment.get("smiles")))
+        chunks = [smiles[start:start + chunk_size] for start in range(0, len(smiles), chunk_size)]
+        arguments = (self.directory, self.max_bytes)
+
+        if self.processes == 1 or len(chunks) <= 1:
+            results = [_prerender(*arguments, chunk, self.prerender_sizes, self.prerender_formats) for chunk in chunks]
+        else:
+            ### Pre-rendering runs in a background thread of a client with open connections; forking such a
+            ### process can deadlock the workers, so they are spawned
+            with ProcessPoolExecutor(max_workers=self.processes, mp_context=multiprocessing.get_context("spawn")) as executor:
+                futures = [executor.submit(_prerender, *arguments, chunk, self.prerender_sizes, self.prerender_formats)
+                           for chunk in chunks]
+                results = [future.result() for future in futures]
+
+        self.prune()
+        return {
+            "rendered": sum(rendered for rendered, _ in results),
+            "failures": [value for _, failures in results for value in failures],
+        }
+
+    def _library_imported(self, library_id: str, library: Optional[dict] = None):
+        """
+        Called by the client after a library was imported; pre-renders it in a background thread.
+        """
+        def prerender():
+            nonlocal library
+            if library is None and self.client is not None:
+                library = self.client.get_one_library(str(library_id))
+            if isinstance(library, dict):
+                try:
+                    self.prerender_library(library)
+                except Exception as e:
+                    print(f"Pre-rendering of library {library_id} failed: {e}")
+
+        thread = threading.Thread(target=prerender, name=f"prerender-{library_id}", daemon=True)
+        with self.lock:
+            self.threads = [running for running in self.threads if running.is_alive()] + [thread]
+        thread.start()
+
+    def wait(self, timeout: Optional[float] = None):
+        """
+        Waits until the pre-rendering of imported libraries is finished.
+        """
+        with self.lock:
+            threads = list(self.threads)
+        for thread in threads:
+            thread.join(timeout)
@@ -0,0 +1,233 @@
+### Standard Libraries
+import csv
+import os
+import re
+from typing import Dict, Iterable, Iterator, List, Optional
+
+# Third-Party Libraries
+import numpy as np
+
+# Your Libraries
+from ffcsdbclient import ffcsdbclient
+
+### Echo pick lists for soaking, cryoprotection and redesolving
+###
+### export_to_soak, export_cryo_to_soak and export_redesolve_to_soak only mark the wells as exported on the
+### server. EchoPickList builds the matching Echo transfer files (CSV pick lists) for the wells of many plates
+### at once:
+###
+###     pick_list = EchoPickList.from_plates(client, user_account, campaign_id, ["98765", "98764"], kind="soak")
+###     pick_list.errors                      ### [{'_id', 'plateId', 'well', 'error'}, ...] wells left out
+###     pick_list.write("soak.csv")           ### one file for all plates
+###     pick_list.write_per_plate("exports")  ### exports/soak_98765.csv, exports/soak_98764.csv
+###
+### The wells are kept as a columnar table (one numpy array per field), so volumes are validated and transfers
+### sorted for the whole table at once. Transfers are ordered by source plate and source well (row, then
+### column), which keeps the moves of the Echo transducer short, and written to disk row by row.
+
+### Fields of the wells used by each kind of transfer
+KINDS = {
+    "soak": {
+        "selected": "libraryAssigned",
+        "source_name": "libraryName",
+        "source_barcode": "libraryBarcode",
+        "source_well": "sourceWell",
+        "volume": "ligandTransferVolume",
+    },
+    "cryo": {
+        "selected": "cryoProtection",
+        "source_name": "cryoName",
+        "source_barcode": "cryoBarcode",
+        "source_well": "cryoSourceWell",
+        "volume": "cryoTransferVolume",
+    },
+    "redesolve": {
+        "selected": "redesolveApplied",
+        "source_name": "redesolveName",
+        "source_barcode": "redesolveBarcode",
+        "source_well": "redesolveSourceWell",
+        "volume": "redesolveTransferVolume",
+    },
+}
+
+HEADER = [
+    "Source Plate Name",
+    "Source Plate Barcode",
+    "Source Well",
+    "Destination Plate Name",
+    "Destination Plate Barcode",
+    "Destination Well",
+    "Transfer Volume",
+    "Destination Well X Offset",
+    "Destination Well Y Offset",
+]
+
+WELL_NAME = re.compile(r"^([A-Za-z]+)(\d+)$")
+
+def well_position(name: str) -> tuple:
+    """
+    Returns the (row, column) index of an Echo well name like 'A1' or 'AF48', (-1, -1) if it is invalid.
+    """
+    match = WELL_NAME.match(name or "")
+    if match is None:
+        return -1, -1
+    row = 0
+    for letter in match.group(1).upper():
+        row = row * 26 + ord(letter) - ord("A") + 1
+    return row - 1, int(match.group(2)) - 1
+
+def to_float(value) -> float:
+    """
+    Returns a number or numeric string as float, NaN for anything else.
+    """
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float("nan")
+
+class EchoPickList:
+    """
+    Echo transfers of one kind ('soak', 'cryo' or 'redesolve') for the wells of many plates.
+
+    Wells that are not selected for the kind (e.g. wells without libraryAssigned for 'soak') are ignored. Selected
+    wells with a missing source, an invalid well name or a volume that the Echo cannot transfer are left out
+    and reported in errors.
+
+    Args:
+        wells (Iterable[dict]): The wells, as returned by get_wells_from_plate.
+        kind (str): The kind of transfer, a key of KINDS.
+        droplet_volume (float): Volume of one Echo droplet in nL; every volume must be a multiple of it.
+        max_volume (float): Largest volume of one transfer in nL.
+    """
+
+    def __init__(self, wells: Iterable[dict], kind: str = "soak", droplet_volume: float = 2.5,
+                 max_volume: float = 10000.0):
+        if kind not in KINDS:
+            raise ValueError(f"Unsupported kind: {kind}")
+        self.kind = kind
+        self.droplet_volume = droplet_volume
+        self.max_volume = max_volume
+        fields = KINDS[kind]
+
+        wells = [well for well in wells if well.get(fields["selected"])]
+        def column(key: str, default="") -> np.ndarray:
+            return np.array([str(well.get(key) if well.get(key) is not None else default) for well in wells], dtype=str)
+        def numeric(key: str) -> np.ndarray:
+            return np.array([to_float(well.get(key)) for well in wells], dtype=float)
+
+        table = {
+            "_id": column("_id"),
+            "plateId": column("plateId"),
+            "well": column("well"),
+            "wellEcho": column("wellEcho"),
+            "sourceName": column(fields["source_name"]),
+            "sourceBarcode": column(fields["source_barcode"]),
+            "sourceWell": column(fields["source_well"]),
+            "volume": numeric(fields["volume"]),
+            "xEcho": numeric("xEcho"),
+            "yEcho": numeric("yEcho"),
+        }
+        source_positions = np.array([well_position(name) for name in table["sourceWell"]], dtype=int).reshape(-1, 2)
+        destination_positions = np.array([well_position(name) for name in table["wellEcho"]], dtype=int).reshape(-1, 2)
+
+        ### Validation of all wells at once; the first failing check of a well is reported
+        droplets = table["volume"] / droplet_volume
+        checks = [
+            (table["sourceBarcode"] == "", f"Missing {fields['source_barcode']}"),
+            (source_positions[:, 0] < 0, f"Invalid {fields['source_well']}"),
+            (destination_positions[:, 0] < 0, "Invalid wellEcho"),
+            (np.isnan(table["volume"]), f"Missing {fields['volume']}"),
+            (table["volume"] <= 0, f"{fields['volume']} must be positive"),
+            (table["volume"] > max_volume, f"{fields['volume']} exceeds {max_volume} nL"),
+            (np.abs(droplets - np.round(droplets)) > 1e-6, f"{fields['volume']} is not a multiple of {droplet_volume} nL"),
+        ]
+        error = np.full(len(wells), "", dtype=object)
+        for failed, message in checks:
+            error[(error == "") & failed] = message
+        invalid = error != ""
+
+        self.errors: List[dict] = [
+            {"_id": str(table["_id"][index]), "plateId": str(table["plateId"][index]), "well": str(table["well"][index]), "error": error[index]}
+            for index in np.flatnonzero(invalid)
+        ]
+
+        ### Transfers ordered by source plate, source row and column, then destination plate and well
+        valid = np.flatnonzero(~invalid)
+        order = np.lexsort((
+            destination_positions[valid, 1],
+            destination_positions[valid, 0],
+            table["plateId"][valid],
+            source_positions[valid, 1],
+            source_positions[valid, 0],
+            table["sourceBarcode"][valid],
+        ))
+        self.table = {key: values[valid][order] for key, values in table.items()}
+
+    @classmethod
+    def from_plates(cls, client: ffcsdbclient, user_account: str, campaign_id: str, plate_ids: List[str],
+                    kind: str = "soak", **kwargs) -> 'EchoPickList':
+        """
+        Builds the pick list for all wells of the given plates, retrieved with get_wells_from_plate.
+        """
+        def wells() -> Iterator[dict]:
+            for plate_id in plate_ids:
+                yield from client.get_wells_from_plate(user_account, campaign_id, str(plate_id)) or []
+        return cls(wells(), kind=kind, **kwargs)
+
+    def __len__(self) -> int:
+        return len(self.table["plateId"])
+
+    def plate_ids(self) -> List[str]:
+        return sorted(set(self.table["plateId"].tolist()))
+
+    def rows(self, plate_id: Optional[str] = None) -> Iterator[list]:
+        """
+        Yields the rows of the pick list (without HEADER), of one destination plate if plate_id is given.
+        """
+        indices = np.arange(len(self)) if plate_id is None else np.flatnonzero(self.table["plateId"] == str(plate_id))
+        table = self.table
+        for index in indices:
+            yield [
+                str(table["sourceName"][index]),
+                str(table["sourceBarcode"][index]),
+                str(table["sourceWell"][index]),
+                str(table["plateId"][index]),
+                str(table["plateId"][index]),
+                str(table["wellEcho"][index]),
+                f"{table['volume'][index]:g}",
+                f"{table['xEcho'][index]:g}" if not np.isnan(table["xEcho"][index]) else "0",
+                f"{table['yEcho'][index]:g}" if not np.isnan(table["yEcho"][index]) else "0",
+            ]
+
+    def write(self, path: str, plate_id: Optional[str] = None) -> int:
+        """
+        Streams the pick list (of one destination plate if plate_id is given) to a CSV file, which is replaced
+        atomically once it is complete.
+
+        Returns:
+            int: The number of transfers written.
+        """
+        temp_path = f"{path}.tmp"
+        count = 0
+        with open(temp_path, 'w', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(HEADER)
+            for row in self.rows(plate_id):
+                writer.writerow(row)
+                count += 1
+        os.replace(temp_path, path)
+        return count
+
+    def write_per_plate(self, directory: str, name: str = "{kind}_{plate_id}.csv") -> Dict[str, str]:
+        """
+        Writes one pick list per destination plate into directory.
+
+        Returns:
+            Dict[str, str]: The path of the pick list by plateId.
+        """
+        os.makedirs(directory, exist_ok=True)
+        paths = {}
+        for plate_id in self.plate_ids():
+            paths[plate_id] = os.path.join(directory, name.format(kind=self.kind, plate_id=plate_id))
+            self.write(paths[plate_id], plate_id)
+        return paths
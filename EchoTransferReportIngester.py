@@ -0,0 +1,174 @@
+### Standard Libraries
+import json
+import os
+import xml.etree.ElementTree as ET
+from typing import Callable, Iterator, List, Optional
+
+# Your Libraries
+from ffcsdbclient import ffcsdbclient
+
+### Streaming import of Echo Transfer Reports
+###
+### An Echo Transfer Report is an XML file with the destination plate in <plateInfo> and one <w> element per well,
+### in <printmap> for completed transfers and in <skippedwells> (with the reason) for failed ones:
+###
+###     <transfer date="...">
+###       <plateInfo>
+###         <plate type="source" barcode="L1234" .../>
+###         <plate type="destination" barcode="98765" .../>
+###       </plateInfo>
+###       <printmap total="2">
+###         <w n="A1" dn="A26a" vt="25" avt="25" .../>
+###       </printmap>
+###       <skippedwells total="1">
+###         <w n="A2" dn="B26b" reason="MM1234: Insufficient volume"/>
+###       </skippedwells>
+###     </transfer>
+###
+### The ingester parses the report incrementally with constant memory, maps every well to the
+### {'plateId', 'wellEcho', 'transferStatus'} records of import_soaking_results and uploads them in chunks:
+###
+###     ingester = EchoTransferReportIngester(client, chunk_size=500, state_path="report.xml.state")
+###     summary = ingester.ingest("report.xml")
+###
+### After every uploaded chunk, the number of uploaded records is written to the state file, so an interrupted
+### import continues after the last uploaded chunk when it is started again with the same file.
+
+### transferStatus of wells in <printmap>; wells in <skippedwells> get their reason
+TRANSFER_STATUS_OK = "OK"
+
+class EchoTransferReportIngester:
+    """
+    Uploads the transfer status of all wells of Echo Transfer Reports through import_soaking_results in chunks.
+
+    Args:
+        client (ffcsdbclient): The client used for the upload.
+        chunk_size (int): Number of wells per import_soaking_results request.
+        progress (Callable, optional): Called after every uploaded chunk with the number of uploaded wells, the bytes
+                                       of the report read so far and the size of the report.
+        state_path (str, optional): File keeping the number of uploaded wells to resume an interrupted import.
+        plate_id_from_barcode (Callable, optional): Maps the destination plate barcode to the plateId; by default the
+                                                    barcode is used as it is.
+        well_echo_from_name (Callable, optional): Maps the destination well name of the report to wellEcho; by default
+                                                  the name is used as it is.
+    """
+
+    def __init__(self, client: ffcsdbclient, chunk_size: int = 500,
+                 progress: Optional[Callable[[int, int, int], None]] = None, state_path: Optional[str] = None,
+                 plate_id_from_barcode: Optional[Callable[[str], str]] = None,
+                 well_echo_from_name: Optional[Callable[[str], str]] = None):
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1.")
+        self.client = client
+        self.chunk_size = chunk_size
+        self.progress = progress
+        self.state_path = state_path
+        self.plate_id_from_barcode = plate_id_from_barcode or (lambda barcode: barcode.strip())
+        self.well_echo_from_name = well_echo_from_name or (lambda name: name.strip())
+
+    ### Parsing
+
+    def iter_records(self, file) -> Iterator[dict]:
+        """
+        Yields the import_soaking_results record of every well of a report (a path or a binary file object)
+        while parsing it, without keeping processed elements in memory.
+        """
+        plate_id = None
+        section = None
+        stack: List[ET.Element] = []
+
+        for event, element in ET.iterparse(file, events=("start", "end")):
+            if event == "start":
+                stack.append(element)
+                if element.tag in ("printmap", "skippedwells"):
+                    section = element.tag
+                continue
+
+            stack.pop()
+            if element.tag == "plate" and element.get("type", "").lower() == "destination":
+                plate_id = self.plate_id_from_barcode(element.get("barcode", ""))
+            elif element.tag == "w" and section is not None:
+                if plate_id is None:
+                    raise ValueError("Echo Transfer Report has no destination plate before its wells.")
+                yield {
+                    "plateId": plate_id,
+                    "wellEcho": self.well_echo_from_name(element.get("dn", "")),
+                    "transferStatus": TRANSFER_STATUS_OK if section == "printmap" else element.get("reason", "skipped"),
+                }
+            elif element.tag in ("printmap", "skippedwells"):
+                section = None
+
+            ### Processed elements are detached from their parent, so memory does not grow with the report
+            if stack:
+                stack[-1].remove(element)
+
+    ### Resume state
+
+    def _file_signature(self, path: str) -> dict:
+        stat = os.stat(path)
+        return {"path": os.path.abspath(path), "size": stat.st_size, "mtime": stat.st_mtime}
+
+    def _load_offset(self, path: str) -> int:
+        """
+        Returns the number of wells already uploaded from the report, 0 if there is no state for this exact file.
+        """
+        if not self.state_path or not os.path.exists(self.state_path):
+            return 0
+        with open(self.state_path, 'r') as file:
+            state = json.load(file)
+        if state.get("file") != self._file_signature(path):
+            return 0
+        return state.get("uploaded", 0)
+
+    def _save_offset(self, path: str, uploaded: int):
+        if not self.state_path:
+            return
+        state = {"file": self._file_signature(path), "uploaded": uploaded}
+        temp_path = f"{self.state_path}.tmp"
+        with open(temp_path, 'w') as file:
+            json.dump(state, file)
+        os.replace(temp_path, self.state_path)
+
+    ### Upload
+
+    def ingest(self, path: str) -> dict:
+        """
+        Uploads the transfer status of all wells of the report at path, resuming after the last uploaded chunk if
+        a state file for it exists.
+
+        Returns:
+            dict: 'uploaded' (wells uploaded in total, including earlier runs), 'skipped' (wells skipped because they
+                  were uploaded by an earlier run), 'chunks' (requests sent by this run) and 'completed' (False if a
+                  chunk failed; the import can then be resumed).
+        """
+        offset = self._load_offset(path)
+        total_bytes = os.path.getsize(path)
+        uploaded = offset
+        chunks = 0
+        chunk: List[dict] = []
+
+        def upload() -> bool:
+            nonlocal uploaded, chunks
+            result = self.client.import_soaking_results(chunk)
+            if result is None:
+                print(f"Upload of wells {uploaded} to {uploaded + len(chunk)} of {path} failed.")
+                return False
+            uploaded += len(chunk)
+            chunks += 1
+            self._save_offset(path, uploaded)
+            if self.progress is not None:
+                self.progress(uploaded, file.tell(), total_bytes)
+            chunk.clear()
+            return True
+
+        with open(path, 'rb') as file:
+            for index, record in enumerate(self.iter_records(file)):
+                if index < offset:
+                    continue
+                chunk.append(record)
+                if len(chunk) >= self.chunk_size and not upload():
+                    return {"uploaded": uploaded, "skipped": offset, "chunks": chunks, "completed": False}
+            if chunk and not upload():
+                return {"uploaded": uploaded, "skipped": offset, "chunks": chunks, "completed": False}
+
+        return {"uploaded": uploaded, "skipped": offset, "chunks": chunks, "completed": True}
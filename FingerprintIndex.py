@@ -0,0 +1,343 @@
+### Standard Libraries
+import json
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+# Third-Party Libraries
+import numpy as np
+from rdkit import Chem, DataStructs
+from rdkit.Chem import rdFingerprintGenerator
+
+### Local search index over the compounds of libraries and campaign libraries
+###
+### For every compound, a Morgan fingerprint (for similarity) and an RDKit pattern fingerprint (for substructure
+### screening) are computed once and kept as packed bit arrays, one row of n_bits / 8 bytes per compound:
+###
+###     index = client.fingerprint_index(path="fragments.npz")
+###     index.build(user_account, campaign_id)      ### all libraries and the campaign libraries of the campaign
+###     hits = index.similar("c1ccccc1O", k=10)     ### [{'compoundCode', 'smiles', 'libraryBarcode', ..., 'similarity'}]
+###     hits = index.substructure("c1ccccc1")
+###     index.wells_for_hits(user_account, campaign_id, hits)  ### adds the wells that received each compound
+###
+### The index is saved to path after every change and loaded from it when the index is created. Libraries
+### imported with import_library or import_library_chunked through the same client are added incrementally in
+### a background thread; index.wait() waits until they are indexed.
+
+### Number of set bits of every byte value, used to count the bits of packed fingerprints
+POPCOUNT = np.array([bin(value).count("1") for value in range(256)], dtype=np.uint16)
+
+### Collections whose libraries are indexed
+SOURCES = ("libraries", "campaign_libraries")
+
+class FingerprintIndex:
+    """
+    Packed Morgan and pattern fingerprints of library compounds with Tanimoto top-k and substructure search.
+
+    Args:
+        client (ffcsdbclient, optional): The client used by build, wells_for_hits and the incremental updates.
+        path (str, optional): File (.npz) the index is loaded from and saved to after every change.
+        radius (int): Radius of the Morgan fingerprints.
+        n_bits (int): Number of bits of the fingerprints, a multiple of 8.
+    """
+
+    def __init__(self, client=None, path: Optional[str] = None, radius: int = 2, n_bits: int = 2048):
+        if n_bits % 8:
+            raise ValueError("n_bits must be a multiple of 8.")
+        self.client = client
+        self.path = path
+        self.radius = radius
+        self.n_bits = n_bits
+        self.lock = threading.RLock()
+        self.threads: List[threading.Thread] = []
+        self.morgan_generator = rdFingerprintGenerator.GetMorganGenerator(radius=radius, fpSize=n_bits)
+
+        ### One entry per compound: compoundCode, smiles, libraryBarcode, libraryName, library (key) and source
+        self.compounds: List[dict] = []
+        self.morgan = np.zeros((0, n_bits // 8), dtype=np.uint8)
+        self.pattern = np.zeros((0, n_bits // 8), dtype=np.uint8)
+        self.bit_counts = np.zeros(0, dtype=np.uint16)
+
+        if path and os.path.exists(path):
+            self.load()
+
+    def __len__(self) -> int:
+        return len(self.compounds)
+
+    ### Fingerprints
+
+    def _pack(self, bit_vector) -> np.ndarray:
+        bits = np.zeros((self.n_bits,), dtype=np.uint8)
+        DataStructs.ConvertToNumpyArray(bit_vector, bits)
+        return np.packbits(bits)
+
+    def _fingerprints(self, mol) -> Tuple[np.ndarray, np.ndarray]:
+        return (self._pack(self.morgan_generator.GetFingerprint(mol)),
+                self._pack(Chem.PatternFingerprint(mol, fpSize=self.n_bits)))
+
+    @staticmethod
+    def _parse_query(query: str):
+        mol = Chem.MolFromSmiles(query)
+        if mol is None:
+            mol = Chem.MolFromSmarts(query)
+        if mol is None:
+            raise ValueError(f"Invalid SMILES or SMARTS: {query}")
+        return mol
+
+    ### Updates
+
+    @staticmethod
+    def library_key(library: dict, source: str) -> str:
+        return f"{source}/{library.get('_id') or library.get('libraryBarcode')}"
+
+    def _fingerprint_library(self, library: dict, source: str) -> Tuple[str, List[dict], np.ndarray, np.ndarray, int]:
+        """
+        Returns the key, compounds, Morgan and pattern fingerprints and the number of skipped fragments of a library.
+        """
+        if source not in SOURCES:
+            raise ValueError(f"Unsupported source: {source}")
+
+        key = self.library_key(library, source)
+        compounds, morgan, pattern = [], [], []
+        skipped = 0
+        for fragment in library.get("fragments", []):
+            smiles = fragment.get("canonicalSmiles") or fragment.get("smiles")
+            mol = Chem.MolFromSmiles(smiles) if smiles else None
+            if mol is None:
+                skipped += 1
+                continue
+            morgan_fingerprint, pattern_fingerprint = self._fingerprints(mol)
+            morgan.append(morgan_fingerprint)
+            pattern.append(pattern_fingerprint)
+            compounds.append({
+                "compoundCode": fragment.get("compoundCode"),
+                "smiles": smiles,
+                "libraryBarcode": str(library["libraryBarcode"]) if library.get("libraryBarcode") is not None else None,
+                "libraryName": library.get("libraryName"),
+                "library": key,
+                "source": source,
+            })
+
+        shape = (len(compounds), self.n_bits // 8)
+        return (key, compounds, np.array(morgan, dtype=np.uint8).reshape(shape),
+                np.array(pattern, dtype=np.uint8).reshape(shape), skipped)
+
+    def _replace(self, libraries: List[Tuple[str, List[dict], np.ndarray, np.ndarray, int]]):
+        """
+        Replaces the compounds of the given fingerprinted libraries, appending all new rows at once. Only the
+        bits of the new rows are counted.
+        """
+        ### A library listed twice is replaced by its last entry, as with consecutive add_library calls
+        libraries = list({library[0]: library for library in libraries}.values())
+        with self.lock:
+            self._remove({key for key, _, _, _, _ in libraries})
+            libraries = [library for library in libraries if library[1]]
+            if not libraries:
+                return
+            morgan = np.concatenate([library[2] for library in libraries])
+            for _, compounds, _, _, _ in libraries:
+                self.compounds.extend(compounds)
+            self.morgan = np.concatenate([self.morgan, morgan])
+            self.pattern = np.concatenate([self.pattern] + [library[3] for library in libraries])
+            self.bit_counts = np.concatenate([self.bit_counts, POPCOUNT[morgan].sum(axis=1, dtype=np.uint16)])
+
+    def add_library(self, library: dict, source: str = "libraries", save: bool = True) -> int:
+        """
+        Adds the fragments of a library document, replacing the compounds indexed for it before.
+
+        Args:
+            library (dict): The library with 'fragments', as returned by get_libraries or get_campaign_libraries.
+            source (str): The collection of the library, 'libraries' or 'campaign_libraries'.
+            save (bool): Save the index to path afterwards.
+
+        Returns:
+            int: The number of fragments that were skipped because their SMILES could not be parsed.
+        """
+        fingerprinted = self._fingerprint_library(library, source)
+        with self.lock:
+            self._replace([fingerprinted])
+            if save:
+                self.save()
+        return fingerprinted[4]
+
+    def _remove(self, keys: set):
+        keep = np.array([compound["library"] not in keys for compound in self.compounds], dtype=bool)
+        if keep.all():
+            return
+        self.compounds = [compound for compound, kept in zip(self.compounds, keep) if kept]
+        self.morgan = self.morgan[keep]
+        self.pattern = self.pattern[keep]
+        self.bit_counts = self.bit_counts[keep]
+
+    def remove_library(self, library: dict, source: str = "libraries"):
+        """
+        Removes the compounds of a library from the index.
+        """
+        with self.lock:
+            self._remove({self.library_key(library, source)})
+            self.save()
+
+    def build(self, user_account: Optional[str] = None, campaign_id: Optional[str] = None) -> int:
+        """
+        (Re)indexes all libraries and, if user_account and campaign_id are given, the campaign libraries of
+        that campaign. Libraries that are indexed already are replaced.
+
+        Returns:
+            int: The number of fragments that were skipped because their SMILES could not be parsed.
+        """
+        libraries = [(library, "libraries") for library in self.client.get_libraries() or []]
+        if user_account is not None and campaign_id is not None:
+            libraries += [(library, "campaign_libraries")
+                          for library in self.client.get_campaign_libraries(user_account, campaign_id) or []]
+
+        ### All libraries are fingerprinted first and appended to the index at once
+        fingerprinted = [self._fingerprint_library(library, source) for library, source in libraries]
+        with self.lock:
+            self._replace(fingerprinted)
+            self.save()
+        return sum(skipped for _, _, _, _, skipped in fingerprinted)
+
+    def _library_imported(self, library_id: str, library: Optional[dict] = None):
+        """
+        Called by the client after a library was imported; adds it in a background thread. Chunked imports pass
+        no document, which is then retrieved from the server.
+        """
+        def add():
+            nonlocal library
+            if library is None and self.client is not None:
+                library = self.client.get_one_library(str(library_id))
+            if isinstance(library, dict) and library.get("fragments"):
+                try:
+                    self.add_library({**library, "_id": str(library_id)}, "libraries")
+                except Exception as e:
+                    print(f"Indexing of library {library_id} failed: {e}")
+
+        thread = threading.Thread(target=add, name=f"fingerprint-index-{library_id}", daemon=True)
+        with self.lock:
+            self.threads = [running for running in self.threads if running.is_alive()] + [thread]
+        thread.start()
+
+    def wait(self, timeout: Optional[float] = None):
+        """
+        Waits until the imported libraries are indexed.
+        """
+        with self.lock:
+            threads = list(self.threads)
+        for thread in threads:
+            thread.join(timeout)
+
+    ### Search
+
+    def _hit(self, position: int, **values) -> dict:
+        return {**{key: value for key, value in self.compounds[position].items() if key != "library"}, **values}
+
+    def similar(self, smiles: str, k: int = 10, min_similarity: float = 0.0) -> List[dict]:
+        """
+        Returns the k compounds most similar to the query by Tanimoto similarity of their Morgan fingerprints.
+
+        Returns:
+            List[dict]: The compounds ('compoundCode', 'smiles', 'libraryBarcode', 'libraryName', 'source') with
+                        their 'similarity', most similar first.
+
+        Raises:
+            ValueError: If the query cannot be parsed.
+        """
+        mol = Chem.MolFromSmiles(smiles)
+        if mol is None:
+            raise ValueError(f"Invalid SMILES: {smiles}")
+        query = self._fingerprints(mol)[0]
+        query_count = int(POPCOUNT[query].sum())
+
+        with self.lock:
+            if not self.compounds or k < 1:
+                return []
+            common = POPCOUNT[self.morgan & query].sum(axis=1, dtype=np.uint16).astype(np.float64)
+            union = self.bit_counts.astype(np.float64) + query_count - common
+            similarity = np.divide(common, union, out=np.zeros_like(common), where=union > 0)
+
+            k = min(k, len(similarity))
+            top = np.argpartition(-similarity, k - 1)[:k]
+            top = top[np.argsort(-similarity[top], kind="stable")]
+            return [self._hit(int(position), similarity=float(similarity[position]))
+                    for position in top if similarity[position] >= min_similarity]
+
+    def substructure(self, query: str, limit: Optional[int] = None) -> List[dict]:
+        """
+        Returns the compounds containing the query (SMILES or SMARTS) as substructure. Candidates are screened
+        with the pattern fingerprints and then confirmed with a substructure match.
+
+        Raises:
+            ValueError: If the query cannot be parsed.
+        """
+        query_mol = self._parse_query(query)
+        screen = self._pack(Chem.PatternFingerprint(query_mol, fpSize=self.n_bits))
+
+        with self.lock:
+            if not self.compounds:
+                return []
+            candidates = np.flatnonzero(((self.pattern & screen) == screen).all(axis=1))
+            smiles = [(int(position), self.compounds[position]["smiles"]) for position in candidates]
+
+        hits = []
+        for position, candidate_smiles in smiles:
+            mol = Chem.MolFromSmiles(candidate_smiles)
+            if mol is not None and mol.HasSubstructMatch(query_mol):
+                with self.lock:
+                    hits.append(self._hit(position))
+                if limit is not None and len(hits) >= limit:
+                    break
+        return hits
+
+    def wells_for_hits(self, user_account: str, campaign_id: str, hits: List[dict]) -> List[dict]:
+        """
+        Adds to every hit the 'wells' of the campaign that received the compound, matched by compoundCode and,
+        where both are known, libraryBarcode.
+        """
+        wells_by_code: Dict[str, List[dict]] = {}
+        for well in self.client.get_all_wells(user_account, campaign_id) or []:
+            if well.get("compoundCode"):
+                wells_by_code.setdefault(well["compoundCode"], []).append(well)
+
+        def received(hit: dict, well: dict) -> bool:
+            return not hit.get("libraryBarcode") or not well.get("libraryBarcode") or \
+                str(well["libraryBarcode"]) == hit["libraryBarcode"]
+
+        return [{**hit, "wells": [well for well in wells_by_code.get(hit["compoundCode"], []) if received(hit, well)]}
+                for hit in hits]
+
+    ### Persistence
+
+    def save(self):
+        """
+        Writes the index to path, if given, replacing the file atomically.
+        """
+        if not self.path:
+            return
+        temp_path = f"{self.path}.tmp"
+        with self.lock:
+            with open(temp_path, 'wb') as file:
+                np.savez_compressed(
+                    file,
+                    morgan=self.morgan,
+                    pattern=self.pattern,
+                    compounds=np.array(json.dumps(self.compounds)),
+                    parameters=np.array([self.radius, self.n_bits]),
+                )
+            os.replace(temp_path, self.path)
+
+    def load(self):
+        """
+        Reads the index from path.
+
+        Raises:
+            ValueError: If the index at path was built with a different radius or number of bits.
+        """
+        with np.load(self.path, allow_pickle=False) as data:
+            radius, n_bits = (int(value) for value in data["parameters"])
+            if (radius, n_bits) != (self.radius, self.n_bits):
+                raise ValueError(f"The index at {self.path} has radius {radius} and {n_bits} bits.")
+            with self.lock:
+                self.morgan = data["morgan"]
+                self.pattern = data["pattern"]
+                self.compounds = json.loads(str(data["compounds"]))
+                self.bit_counts = POPCOUNT[self.morgan].sum(axis=1, dtype=np.uint16)
@@ -0,0 +1,138 @@
+### Standard Libraries
+import os
+import ssl
+import threading
+
+# Third-Party Libraries
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.utils import DEFAULT_CA_BUNDLE_PATH, select_proxy
+
+# Your Libraries
+from HttpCassette import build_response
+
+### Optional HTTP/2 transport for ffcsdbclient
+###
+### With HTTP/1.1, every connection carries one request at a time, so concurrent requests (e.g. fetching many
+### plates from a thread pool or in a client.batch) need one socket each. The HTTP/2 transport sends all
+### requests of a client multiplexed over a single connection with compressed headers:
+###
+###     from Http2Transport import http2_session
+###     client = ffcsdbclient(base_url, session=http2_session())
+###
+### It needs httpx with HTTP/2 support (pip install "httpx[http2]"), which is only imported when the transport
+### is used. Whether HTTP/2 is actually spoken depends on the server: over https it is negotiated with ALPN,
+### over plain http the server must accept HTTP/2 with prior knowledge (http2_prior_knowledge=True).
+
+### Connection-specific headers set by requests, which are not allowed in HTTP/2
+HOP_BY_HOP_HEADERS = {'connection', 'keep-alive', 'proxy-connection', 'transfer-encoding', 'upgrade'}
+
+class Http2Adapter(BaseAdapter):
+    """
+    Transport adapter that sends the requests of a requests.Session over HTTP/2 with httpx.
+
+    Streamed requests (the server-sent events of subscribe_notifications) are long-lived and are passed to a
+    regular HTTP/1.1 adapter, so they do not occupy the shared HTTP/2 connection.
+
+    The verify, cert and proxies of the session (or of a request) are settings of the httpx client, so one
+    client is kept per combination of them; normally all requests use the same one.
+    """
+
+    def __init__(self, http2_prior_knowledge: bool = False, max_connections: int = 10):
+        super().__init__()
+        try:
+            import httpx
+        except ImportError as e:
+            raise ImportError('The HTTP/2 transport requires httpx with HTTP/2 support: pip install "httpx[http2]"') from e
+
+        self.httpx = httpx
+        self.http2_prior_knowledge = http2_prior_knowledge
+        self.max_connections = max_connections
+        self.lock = threading.Lock()
+        self.clients = {}
+        self.stream_adapter = HTTPAdapter()
+
+    def _client(self, verify, cert, proxy):
+        """
+        Returns the httpx client for the given TLS verification, client certificate and proxy URL.
+        """
+        if isinstance(cert, list):
+            cert = tuple(cert)
+        key = (verify, cert, proxy)
+        with self.lock:
+            if key not in self.clients:
+                self.clients[key] = self.httpx.Client(
+                    http1=not self.http2_prior_knowledge,
+                    http2=True,
+                    limits=self.httpx.Limits(max_connections=self.max_connections),
+                    verify=self._ssl_context(verify, cert),
+                    proxy=proxy,
+                )
+            return self.clients[key]
+
+    @staticmethod
+    def _ssl_context(verify, cert):
+        """
+        Returns the SSL context for the verify (bool or path of a CA bundle or directory) and cert (path or
+        (certificate, key) paths) arguments of requests, or verify itself if the httpx defaults can be used.
+        """
+        if isinstance(verify, bool) and not cert:
+            return verify
+        if isinstance(verify, str):
+            context = ssl.create_default_context(**{"capath" if os.path.isdir(verify) else "cafile": verify})
+        else:
+            context = ssl.create_default_context(cafile=DEFAULT_CA_BUNDLE_PATH)
+        if verify is False:
+            context.check_hostname = False
+            context.verify_mode = ssl.CERT_NONE
+        if cert:
+            certfile, keyfile = cert if isinstance(cert, tuple) else (cert, None)
+            context.load_cert_chain(certfile, keyfile)
+        return context
+
+    def _timeout(self, timeout):
+        if isinstance(timeout, tuple):
+            connect, read = timeout
+            return self.httpx.Timeout(read, connect=connect)
+        return self.httpx.Timeout(timeout)
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        if stream:
+            return self.stream_adapter.send(request, stream=stream, timeout=timeout, verify=verify, cert=cert, proxies=proxies)
+
+        headers = {key: value for key, value in request.headers.items() if key.lower() not in HOP_BY_HOP_HEADERS}
+        client = self._client(verify, cert, select_proxy(request.url, proxies or {}))
+        try:
+            response = client.request(request.method, request.url, headers=headers, content=request.body,
+                                           timeout=self._timeout(timeout))
+        except self.httpx.TimeoutException as e:
+            raise requests.exceptions.Timeout(str(e), request=request) from e
+        except self.httpx.TransportError as e:
+            raise requests.exceptions.ConnectionError(str(e), request=request) from e
+
+        return build_response(request, response.status_code, dict(response.headers), response.content,
+                              reason=response.reason_phrase, elapsed=response.elapsed.total_seconds(), connection=self)
+
+    def close(self):
+        with self.lock:
+            for client in self.clients.values():
+                client.close()
+            self.clients = {}
+        self.stream_adapter.close()
+
+def http2_session(http2_prior_knowledge: bool = False, max_connections: int = 10) -> requests.Session:
+    """
+    Returns a session that sends all requests over HTTP/2.
+
+    Args:
+        http2_prior_knowledge (bool): Speak HTTP/2 right away instead of negotiating it, needed for plain http servers.
+        max_connections (int): Upper limit of connections; with HTTP/2 one connection per server is normally used.
+
+    Raises:
+        ImportError: If httpx with HTTP/2 support is not installed.
+    """
+    session = requests.Session()
+    adapter = Http2Adapter(http2_prior_knowledge=http2_prior_knowledge, max_connections=max_connections)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
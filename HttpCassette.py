@@ -0,0 +1,183 @@
+### Standard Libraries
+import base64
+import gzip
+import hashlib
+import json
+import threading
+import time
+from collections import deque
+from datetime import timedelta
+from typing import Dict, Optional, Tuple
+
+# Third-Party Libraries
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+### Record/replay of the HTTP traffic of ffcsdbclient
+###
+### A cassette is a gzip-compressed file with one JSON line per request/response pair, including bodies,
+### headers and the time the request took. Recording and replaying are done by transport adapters mounted
+### on the requests.Session of the client, so every ffcsdbclient method is covered:
+###
+###     client = ffcsdbclient(base_url, session=recording_session("get_all_wells.cassette"))
+###     client.get_all_wells("e14965", "EP_SmarGon")
+###     client.close()
+###
+###     client = ffcsdbclient(base_url, session=replaying_session("get_all_wells.cassette", reproduce_latency=True))
+###     client.get_all_wells("e14965", "EP_SmarGon")  ### Served from the cassette without network
+
+class CassetteMiss(requests.exceptions.ConnectionError):
+    """
+    Raised in replay mode for a request that is not in the cassette.
+    """
+
+def _encode_body(body) -> Optional[str]:
+    if body is None:
+        return None
+    if isinstance(body, str):
+        body = body.encode('utf-8')
+    return base64.b64encode(body).decode('ascii')
+
+def _decode_body(body: Optional[str]) -> bytes:
+    if body is None:
+        return b''
+    return base64.b64decode(body)
+
+def build_response(request, status: int, headers: dict, content: bytes, reason: Optional[str] = None,
+                   elapsed: float = 0.0, connection=None) -> requests.Response:
+    """
+    Builds a requests.Response for a request from a status, headers and an already decoded body.
+    """
+    response = requests.Response()
+    response.status_code = status
+    response.reason = reason
+    response.headers = CaseInsensitiveDict(headers)
+    ### The body is already decoded, so the original transfer encoding must not be applied again
+    response.headers.pop('Content-Encoding', None)
+    response._content = content
+    response.encoding = get_encoding_from_headers(response.headers)
+    response.url = request.url
+    response.request = request
+    response.connection = connection
+    response.elapsed = timedelta(seconds=elapsed)
+    return response
+
+def request_key(method: str, url: str, body) -> Tuple[str, str, str]:
+    """
+    Key identifying a request in a cassette: method, full URL including the query and a hash of the body.
+    """
+    if isinstance(body, str):
+        body = body.encode('utf-8')
+    return method.upper(), url, hashlib.sha1(body or b'').hexdigest()
+
+class RecordingAdapter(HTTPAdapter):
+    """
+    Sends requests over the network like the default HTTPAdapter and appends each request/response pair
+    to the cassette file.
+    """
+
+    def __init__(self, path: str, **kwargs):
+        super().__init__(**kwargs)
+        self.path = path
+        self.lock = threading.Lock()
+        self.file = gzip.open(path, 'wt', encoding='utf-8')
+
+    def send(self, request, stream=False, **kwargs):
+        start = time.perf_counter()
+        response = super().send(request, stream=stream, **kwargs)
+
+        ### Streamed responses (e.g. server-sent events) are passed through without being recorded
+        if stream:
+            return response
+
+        content = response.content
+        elapsed = time.perf_counter() - start
+        entry = {
+            "method": request.method,
+            "url": request.url,
+            "request_headers": dict(request.headers),
+            "request_body": _encode_body(request.body),
+            "status": response.status_code,
+            "reason": response.reason,
+            "headers": dict(response.headers),
+            "body": _encode_body(content),
+            "elapsed": elapsed,
+        }
+        with self.lock:
+            self.file.write(json.dumps(entry) + "\n")
+        return response
+
+    def close(self):
+        with self.lock:
+            if not self.file.closed:
+                self.file.close()
+        super().close()
+
+class ReplayAdapter(BaseAdapter):
+    """
+    Serves responses from a cassette without any network access.
+
+    Identical requests are answered in the order in which they were recorded; once all recorded responses
+    for a request have been served, the last one is repeated (e.g. for polling loops that run longer than
+    during recording).
+    """
+
+    def __init__(self, path: str, reproduce_latency: bool = False, latency_scale: float = 1.0):
+        super().__init__()
+        self.reproduce_latency = reproduce_latency
+        self.latency_scale = latency_scale
+        self.lock = threading.Lock()
+        self.entries: Dict[Tuple[str, str, str], deque] = {}
+
+        with gzip.open(path, 'rt', encoding='utf-8') as file:
+            for line in file:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                key = request_key(entry["method"], entry["url"], _decode_body(entry["request_body"]))
+                self.entries.setdefault(key, deque()).append(entry)
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        key = request_key(request.method, request.url, request.body)
+        with self.lock:
+            recorded = self.entries.get(key)
+            if not recorded:
+                raise CassetteMiss(f"No recorded response for {request.method} {request.url}", request=request)
+            entry = recorded.popleft() if len(recorded) > 1 else recorded[0]
+
+        if self.reproduce_latency:
+            time.sleep(entry["elapsed"] * self.latency_scale)
+
+        return build_response(request, entry["status"], entry["headers"], _decode_body(entry["body"]),
+                              reason=entry["reason"], elapsed=entry["elapsed"], connection=self)
+
+    def close(self):
+        pass
+
+def recording_session(path: str) -> requests.Session:
+    """
+    Returns a session that records all requests to the cassette at path. The cassette is complete once the
+    session (or the ffcsdbclient using it) is closed.
+    """
+    session = requests.Session()
+    adapter = RecordingAdapter(path)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+def replaying_session(path: str, reproduce_latency: bool = False, latency_scale: float = 1.0) -> requests.Session:
+    """
+    Returns a session that serves all requests from the cassette at path.
+
+    Args:
+        path (str): The cassette file written by a recording session.
+        reproduce_latency (bool): Delay each response by the time the request took during recording.
+        latency_scale (float): Factor applied to the recorded latencies if reproduce_latency is set.
+    """
+    session = requests.Session()
+    adapter = ReplayAdapter(path, reproduce_latency=reproduce_latency, latency_scale=latency_scale)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
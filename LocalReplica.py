@@ -0,0 +1,228 @@
+### Standard Libraries
+import os
+import sqlite3
+import threading
+import time
+from typing import List, Optional
+
+# Third-Party Libraries
+from bson import json_util
+
+### Local SQLite replica of a campaign
+###
+### The replica holds the plates, wells and campaign libraries of one campaign of a user in a SQLite file
+### and serves reads locally, while a background thread keeps it in sync with the server. Documents are
+### stored as MongoDB extended JSON, so that ObjectId and datetime fields are returned exactly as by the
+### corresponding ffcsdbclient methods (get_plates, get_all_wells, get_campaign_libraries).
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS plates (
+    _id TEXT PRIMARY KEY,
+    plateId TEXT,
+    doc TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS plates_plateId ON plates (plateId);
+
+CREATE TABLE IF NOT EXISTS wells (
+    _id TEXT PRIMARY KEY,
+    plateId TEXT,
+    well TEXT,
+    wellEcho TEXT,
+    xtalName TEXT,
+    doc TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS wells_plateId ON wells (plateId);
+CREATE INDEX IF NOT EXISTS wells_well ON wells (plateId, well);
+CREATE INDEX IF NOT EXISTS wells_wellEcho ON wells (plateId, wellEcho);
+CREATE INDEX IF NOT EXISTS wells_xtalName ON wells (xtalName);
+
+CREATE TABLE IF NOT EXISTS campaign_libraries (
+    _id TEXT PRIMARY KEY,
+    libraryName TEXT,
+    doc TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+def default_replica_path(user_account: str, campaign_id: str) -> str:
+    directory = os.path.join(os.path.expanduser("~"), ".ffcs_db_client", "replicas")
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, f"{user_account}_{campaign_id}.sqlite")
+
+class CampaignReplica:
+    """
+    SQLite-backed local replica of the plates, wells and campaign libraries of a campaign.
+
+    Reads never go to the server. If the replica file already contains data, opening it needs no network
+    round trip; otherwise the first sync() is done when the replica is opened by ffcsdbclient.open_replica.
+    """
+
+    def __init__(self, client, user_account: str, campaign_id: str, path: Optional[str] = None):
+        self.client = client
+        self.user_account = user_account
+        self.campaign_id = campaign_id
+        self.path = path or default_replica_path(user_account, campaign_id)
+
+        self.lock = threading.RLock()
+        self.connection = sqlite3.connect(self.path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.executescript(SCHEMA)
+
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    ### Reads
+
+    def _query(self, sql: str, params: tuple = ()) -> List[dict]:
+        with self.lock:
+            rows = self.connection.execute(sql, params).fetchall()
+        return [json_util.loads(row[0]) for row in rows]
+
+    def is_empty(self) -> bool:
+        with self.lock:
+            return self.connection.execute("SELECT value FROM meta WHERE key = 'last_sync'").fetchone() is None
+
+    def get_plates(self) -> List[dict]:
+        return self._query("SELECT doc FROM plates")
+
+    def get_plate(self, plate_id: str) -> Optional[dict]:
+        plates = self._query("SELECT doc FROM plates WHERE plateId = ?", (str(plate_id),))
+        return plates[0] if plates else None
+
+    def get_all_wells(self) -> List[dict]:
+        return self._query("SELECT doc FROM wells")
+
+    def get_wells_from_plate(self, plate_id: str) -> List[dict]:
+        return self._query("SELECT doc FROM wells WHERE plateId = ?", (str(plate_id),))
+
+    def get_one_well(self, well_id: str) -> Optional[dict]:
+        wells = self._query("SELECT doc FROM wells WHERE _id = ?", (str(well_id),))
+        return wells[0] if wells else None
+
+    def get_well(self, plate_id: str, well: str) -> Optional[dict]:
+        wells = self._query("SELECT doc FROM wells WHERE plateId = ? AND well = ?", (str(plate_id), well))
+        return wells[0] if wells else None
+
+    def get_well_by_echo(self, plate_id: str, well_echo: str) -> Optional[dict]:
+        wells = self._query("SELECT doc FROM wells WHERE plateId = ? AND wellEcho = ?", (str(plate_id), well_echo))
+        return wells[0] if wells else None
+
+    def get_well_by_xtal_name(self, xtal_name: str) -> Optional[dict]:
+        wells = self._query("SELECT doc FROM wells WHERE xtalName = ?", (xtal_name,))
+        return wells[0] if wells else None
+
+    def get_campaign_libraries(self) -> List[dict]:
+        return self._query("SELECT doc FROM campaign_libraries")
+
+    ### Writes
+
+    def _replace_plates(self, plates: List[dict]):
+        self.connection.execute("DELETE FROM plates")
+        self._upsert_plates(plates)
+
+    def _upsert_plates(self, plates: List[dict]):
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO plates (_id, plateId, doc) VALUES (?, ?, ?)",
+            [(str(plate["_id"]), str(plate.get("plateId")), json_util.dumps(plate)) for plate in plates])
+
+    def _replace_wells(self, wells: List[dict]):
+        self.connection.execute("DELETE FROM wells")
+        self._upsert_wells(wells)
+
+    def _upsert_wells(self, wells: List[dict]):
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO wells (_id, plateId, well, wellEcho, xtalName, doc) VALUES (?, ?, ?, ?, ?, ?)",
+            [(str(well["_id"]), str(well.get("plateId")), well.get("well"), well.get("wellEcho"), well.get("xtalName"),
+              json_util.dumps(well)) for well in wells])
+
+    def _replace_campaign_libraries(self, libraries: List[dict]):
+        self.connection.execute("DELETE FROM campaign_libraries")
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO campaign_libraries (_id, libraryName, doc) VALUES (?, ?, ?)",
+            [(str(library["_id"]), library.get("libraryName"), json_util.dumps(library)) for library in libraries])
+
+    def _delete(self, table: str, doc_ids: List[str]):
+        self.connection.executemany(f"DELETE FROM {table} WHERE _id = ?", [(str(doc_id),) for doc_id in doc_ids])
+
+    def _set_meta(self, key: str, value: str):
+        self.connection.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def _get_meta(self, key: str) -> Optional[str]:
+        row = self.connection.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def sync(self) -> bool:
+        """
+        Brings the replica up to date with the server.
+
+        Plates and wells are synced incrementally with sync_plates and sync_wells, so that only documents changed
+        or deleted since the last sync are transferred; the campaign libraries are replaced completely.
+
+        Returns:
+            bool: True if the replica was updated, False if the server could not be reached.
+        """
+        with self.lock:
+            plates_watermark = self._get_meta("plates_watermark")
+            wells_watermark = self._get_meta("wells_watermark")
+
+        plates = self.client.sync_plates(self.user_account, self.campaign_id, since=plates_watermark)
+        wells = self.client.sync_wells(self.user_account, self.campaign_id, since=wells_watermark)
+        libraries = self.client.get_campaign_libraries(self.user_account, self.campaign_id)
+        if plates is None or wells is None:
+            return False
+
+        with self.lock, self.connection:
+            if plates_watermark is None:
+                self._replace_plates(plates["changed"])
+            else:
+                self._upsert_plates(plates["changed"])
+                self._delete("plates", plates["deleted"])
+            if wells_watermark is None:
+                self._replace_wells(wells["changed"])
+            else:
+                self._upsert_wells(wells["changed"])
+                self._delete("wells", wells["deleted"])
+            ### get_campaign_libraries returns an empty list on errors, which must not wipe the local libraries
+            if libraries:
+                self._replace_campaign_libraries(libraries)
+            self._set_meta("plates_watermark", plates["watermark"])
+            self._set_meta("wells_watermark", wells["watermark"])
+            self._set_meta("last_sync", str(time.time()))
+        return True
+
+    ### Background sync
+
+    def start_sync(self, interval: float = 60.0, immediately: bool = True):
+        """
+        Starts a daemon thread that syncs the replica with the server every interval seconds, starting
+        right away in the background if immediately is set.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._sync_loop, args=(interval, immediately),
+                                        name=f"replica-{self.user_account}-{self.campaign_id}", daemon=True)
+        self._thread.start()
+
+    def _sync_loop(self, interval: float, immediately: bool):
+        delay = 0.0 if immediately else interval
+        while not self._stop.wait(delay):
+            try:
+                self.sync()
+            except Exception as e:
+                print(f"Replica sync failed: {e}")
+            delay = interval
+
+    def close(self, timeout: Optional[float] = 5.0):
+        """
+        Stops the background sync and closes the SQLite file.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        with self.lock:
+            self.connection.close()
@@ -0,0 +1,238 @@
+### Standard Libraries
+import csv
+import queue
+import threading
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterator, Optional, Tuple
+
+# Third-Party Libraries
+from dateutil import parser as date_parser
+
+# Your Libraries
+from ffcsdbclient import ffcsdbclient
+
+### Streaming import of Shifter CSV exports
+###
+### The rows of a Shifter CSV export are parsed one by one, normalized to the well_shifter_data records of
+### import_fishing_results and uploaded in bounded chunks. Parsing runs in a background thread and hands complete
+### chunks to the uploading thread through a bounded queue, so the next chunk is parsed while the previous one is
+### uploaded and memory does not grow with the size of the file:
+###
+###     ingester = ShifterCsvIngester(client, chunk_size=200)
+###     summary = ingester.ingest("shifter_export.csv")
+###     summary["failures"]  ### [{"row": 17, "error": "...", "data": {...}}, ...]
+
+### Header of the Shifter export (normalized, see normalize_header) -> key of the import_fishing_results records
+COLUMNS = {
+    "plateid": "plateId",
+    "platerow": "plateRow",
+    "platecolumn": "plateColumn",
+    "positionsubwell": "plateSubwell",
+    "platesubwell": "plateSubwell",
+    "subwell": "plateSubwell",
+    "timearrival": "timeOfArrival",
+    "timeofarrival": "timeOfArrival",
+    "timedeparture": "timeOfDeparture",
+    "timeofdeparture": "timeOfDeparture",
+    "pickduration": "duration",
+    "duration": "duration",
+    "comment": "comment",
+    "crystalid": "xtalId",
+    "xtalid": "xtalId",
+    "destinationname": "destinationName",
+    "destinationlocation": "destinationLocation",
+    "barcode": "barcode",
+    "externalcomment": "externalComment",
+}
+
+REQUIRED_KEYS = ["plateId", "plateRow", "plateColumn", "plateSubwell"]
+
+### Time format of timeOfArrival and timeOfDeparture expected by import_fishing_results, e.g. '2023-08-03 12:30:15.000'
+TIME_FORMAT = '%Y-%m-%d %H:%M:%S.%f'
+
+def normalize_header(name: str) -> str:
+    return "".join(character for character in name.lower() if character.isalnum())
+
+def normalize_time(value: str) -> Optional[str]:
+    """
+    Converts a time of the Shifter export to TIME_FORMAT with milliseconds; None for an empty value.
+
+    Raises:
+        ValueError: If the value is not a time.
+    """
+    value = value.strip()
+    if not value:
+        return None
+    return date_parser.parse(value).strftime(TIME_FORMAT)[:-3]
+
+def normalize_duration(value: str, time_of_arrival: Optional[str], time_of_departure: Optional[str]) -> Optional[str]:
+    """
+    Converts a duration given as [H]H:MM:SS[.fff] or in seconds to the str() of a timedelta, e.g. '0:05:00'.
+    Without a duration, it is computed from the times of arrival and departure.
+
+    Raises:
+        ValueError: If the value is not a duration.
+    """
+    value = value.strip()
+    if not value:
+        if time_of_arrival is None or time_of_departure is None:
+            return None
+        return str(datetime.strptime(time_of_departure, TIME_FORMAT) - datetime.strptime(time_of_arrival, TIME_FORMAT))
+
+    if ":" not in value:
+        return str(timedelta(seconds=float(value)))
+
+    parts = value.split(":")
+    if len(parts) != 3:
+        raise ValueError(f"Invalid duration: {value}")
+    hours, minutes, seconds = parts
+    return str(timedelta(hours=int(hours), minutes=int(minutes), seconds=float(seconds)))
+
+def normalize_row(row: Dict[str, str]) -> dict:
+    """
+    Maps a row of the Shifter export, keyed by the normalized header, to a well_shifter_data record.
+
+    Raises:
+        ValueError: If a required field is empty or a time or duration cannot be parsed.
+    """
+    record = {}
+    for column, value in row.items():
+        key = COLUMNS.get(column)
+        if key is not None and key not in record:
+            record[key] = (value or "").strip()
+
+    missing = [key for key in REQUIRED_KEYS if not record.get(key)]
+    if missing:
+        raise ValueError(f"Missing {', '.join(missing)}")
+
+    record["timeOfArrival"] = normalize_time(record.get("timeOfArrival", ""))
+    record["timeOfDeparture"] = normalize_time(record.get("timeOfDeparture", ""))
+    record["duration"] = normalize_duration(record.get("duration", ""), record["timeOfArrival"], record["timeOfDeparture"])
+    return record
+
+class ShifterCsvIngester:
+    """
+    Uploads the fishing results of Shifter CSV exports through import_fishing_results in bounded chunks.
+
+    Args:
+        client (ffcsdbclient): The client used for the upload.
+        chunk_size (int): Number of rows per import_fishing_results request.
+        max_pending_chunks (int): Number of parsed chunks that may wait for their upload.
+        progress (Callable, optional): Called after every chunk with the number of parsed rows, uploaded rows
+                                       and failed rows so far.
+    """
+
+    def __init__(self, client: ffcsdbclient, chunk_size: int = 200, max_pending_chunks: int = 2,
+                 progress: Optional[Callable[[int, int, int], None]] = None):
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1.")
+        self.client = client
+        self.chunk_size = chunk_size
+        self.max_pending_chunks = max_pending_chunks
+        self.progress = progress
+
+    def iter_rows(self, path: str) -> Iterator[Tuple[int, Dict[str, str], Optional[dict], Optional[str]]]:
+        """
+        Yields (line number, raw row, normalized record or None, error or None) for every row of the export.
+        """
+        with open(path, 'r', newline='', encoding='utf-8-sig') as file:
+            sample = file.read(4096)
+            file.seek(0)
+            try:
+                dialect = csv.Sniffer().sniff(sample, delimiters=",;\t")
+            except csv.Error:
+                dialect = csv.excel
+
+            reader = csv.reader(file, dialect)
+            header = next(reader, None)
+            if header is None:
+                return
+            columns = [normalize_header(name) for name in header]
+
+            for row in reader:
+                if not any(value.strip() for value in row):
+                    continue
+                raw = dict(zip(columns, row))
+                try:
+                    yield reader.line_num, raw, normalize_row(raw), None
+                except (ValueError, OverflowError) as e:
+                    yield reader.line_num, raw, None, str(e)
+
+    def _parse(self, path: str, chunks: queue.Queue, stop: threading.Event):
+        """
+        Producer: puts chunks of (line number, raw row, record) and lists of failures into the queue, then None.
+        """
+        def put(item) -> bool:
+            while not stop.is_set():
+                try:
+                    chunks.put(item, timeout=0.5)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        try:
+            chunk = []
+            failures = []
+            for line, raw, record, error in self.iter_rows(path):
+                if error is not None:
+                    failures.append({"row": line, "error": error, "data": raw})
+                    continue
+                chunk.append((line, raw, record))
+                if len(chunk) >= self.chunk_size:
+                    if not put((chunk, failures)):
+                        return
+                    chunk, failures = [], []
+            if (chunk or failures) and not put((chunk, failures)):
+                return
+            put(None)
+        except Exception as e:
+            put(e)
+
+    def ingest(self, path: str) -> dict:
+        """
+        Parses the export at path and uploads its rows, while the next chunk is parsed in the background.
+
+        Returns:
+            dict: 'rows' (parsed rows), 'uploaded' (rows uploaded), 'chunks' (requests sent), 'modified_count' (summed
+                  over all requests) and 'failures', a list of {'row', 'error', 'data'} for every row that could
+                  not be parsed or whose chunk could not be uploaded, with 'row' the line number in the file.
+
+        Raises:
+            OSError: If the file cannot be read.
+        """
+        chunks: queue.Queue = queue.Queue(maxsize=self.max_pending_chunks)
+        stop = threading.Event()
+        producer = threading.Thread(target=self._parse, args=(path, chunks, stop), name="shifter-csv-parser", daemon=True)
+        producer.start()
+
+        summary = {"rows": 0, "uploaded": 0, "chunks": 0, "modified_count": 0, "failures": []}
+        try:
+            while True:
+                item = chunks.get()
+                if item is None:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+
+                chunk, failures = item
+                summary["rows"] += len(chunk) + len(failures)
+                summary["failures"].extend(failures)
+
+                if chunk:
+                    result = self.client.import_fishing_results([record for _, _, record in chunk])
+                    summary["chunks"] += 1
+                    if result is None:
+                        summary["failures"].extend({"row": line, "error": "Upload failed", "data": raw} for line, raw, _ in chunk)
+                    else:
+                        summary["uploaded"] += len(chunk)
+                        summary["modified_count"] += result.modified_count or 0
+
+                if self.progress is not None:
+                    self.progress(summary["rows"], summary["uploaded"], len(summary["failures"]))
+        finally:
+            stop.set()
+            producer.join()
+
+        summary["failures"].sort(key=lambda failure: failure["row"])
+        return summary
@@ -0,0 +1,139 @@
+### Standard Libraries
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, islice
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+# Third-Party Libraries
+from rdkit import Chem, RDLogger
+
+### Canonicalization and validation of the SMILES of library fragments before import_library
+###
+### Every fragment is parsed with RDKit; fragments that parse get their canonical SMILES and InChIKey attached,
+### fragments that do not are reported with their row number (1-based position in the library):
+###
+###     preprocessor = SmilesPreprocessor()
+###     summary = preprocessor.preprocess_library(library)
+###     summary["failures"]  ### [{"row": 17, "compoundCode": "C17", "smiles": "C1CC", "error": "..."}, ...]
+###     client.import_library(summary["library"])
+###
+### The SMILES are sent to a process pool in chunks, so large libraries use all cores; libraries smaller than
+### one chunk are processed in the calling process without starting a pool.
+
+### SMILES in the fragment records; the results are added as CANONICAL_SMILES_KEY and INCHI_KEY_KEY
+SMILES_KEY = "smiles"
+CANONICAL_SMILES_KEY = "canonicalSmiles"
+INCHI_KEY_KEY = "inchiKey"
+
+def canonicalize_smiles(smiles: str) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    """
+    Returns (canonical SMILES, InChIKey, None) for a valid SMILES and (None, None, error) otherwise.
+    """
+    if not isinstance(smiles, str) or not smiles.strip():
+        return None, None, "Empty SMILES"
+
+    mol = Chem.MolFromSmiles(smiles.strip())
+    if mol is None:
+        return None, None, "Unparsable SMILES"
+
+    inchi_key = Chem.MolToInchiKey(mol)
+    return Chem.MolToSmiles(mol), inchi_key or None, None
+
+def _canonicalize_chunk(smiles: List[str]) -> List[Tuple[Optional[str], Optional[str], Optional[str]]]:
+    return [canonicalize_smiles(value) for value in smiles]
+
+def _init_worker():
+    ### Parse errors are reported per row, RDKit does not need to log them in every worker
+    RDLogger.DisableLog('rdApp.*')
+
+class SmilesPreprocessor:
+    """
+    Canonicalizes and validates the SMILES of library fragments across a process pool.
+
+    Args:
+        processes (int, optional): Number of worker processes; by default the number of CPUs.
+        chunk_size (int): Number of SMILES sent to a worker at once.
+    """
+
+    def __init__(self, processes: Optional[int] = None, chunk_size: int = 500):
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1.")
+        self.processes = processes or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+
+    def _chunks(self, fragments: Iterable[dict]) -> Iterator[List[dict]]:
+        iterator = iter(fragments)
+        while True:
+            chunk = list(islice(iterator, self.chunk_size))
+            if not chunk:
+                return
+            yield chunk
+
+    def _results(self, chunks: Iterator[List[dict]]) -> Iterator[Tuple[List[dict], list]]:
+        """
+        Yields every chunk of fragments with the results of its SMILES, in the order of the chunks.
+        """
+        def smiles(chunk: List[dict]) -> List[str]:
+            return [fragment.get(SMILES_KEY) for fragment in chunk]
+
+        first = next(chunks, None)
+        if first is None:
+            return
+        if self.processes == 1 or len(first) < self.chunk_size:
+            for chunk in chain([first], chunks):
+                yield chunk, _canonicalize_chunk(smiles(chunk))
+            return
+
+        with ProcessPoolExecutor(max_workers=self.processes, initializer=_init_worker) as executor:
+            ### At most two chunks per worker are in flight, so memory does not grow with the library
+            pending = deque()
+            for chunk in chain([first], chunks):
+                if len(pending) >= 2 * self.processes:
+                    done, future = pending.popleft()
+                    yield done, future.result()
+                pending.append((chunk, executor.submit(_canonicalize_chunk, smiles(chunk))))
+            for done, future in pending:
+                yield done, future.result()
+
+    def iter_fragments(self, fragments: Iterable[dict], failures: list) -> Iterator[dict]:
+        """
+        Yields a copy of every valid fragment with CANONICAL_SMILES_KEY and INCHI_KEY_KEY added, in input order,
+        and appends a {'row', 'compoundCode', 'smiles', 'error'} record to failures for every invalid one. Can be
+        passed to import_library_chunked.
+        """
+        row = 0
+        for chunk, results in self._results(self._chunks(fragments)):
+            for fragment, (canonical_smiles, inchi_key, error) in zip(chunk, results):
+                row += 1
+                if error is not None:
+                    failures.append({
+                        "row": row,
+                        "compoundCode": fragment.get("compoundCode"),
+                        "smiles": fragment.get(SMILES_KEY),
+                        "error": error,
+                    })
+                    continue
+                yield {**fragment, CANONICAL_SMILES_KEY: canonical_smiles, INCHI_KEY_KEY: inchi_key}
+
+    def process(self, fragments: Iterable[dict]) -> dict:
+        """
+        Canonicalizes and validates the SMILES of all fragments.
+
+        Returns:
+            dict: 'fragments', the valid fragments with CANONICAL_SMILES_KEY and INCHI_KEY_KEY added, and
+                  'failures', a list of {'row', 'compoundCode', 'smiles', 'error'} for every fragment whose SMILES
+                  could not be parsed, with 'row' the 1-based position of the fragment.
+        """
+        failures: list = []
+        return {"fragments": list(self.iter_fragments(fragments, failures)), "failures": failures}
+
+    def preprocess_library(self, library: dict) -> dict:
+        """
+        Like process for the fragments of a library document for import_library.
+
+        Returns:
+            dict: 'library', a copy of the library with the valid fragments only, and 'failures'.
+        """
+        summary = self.process(library.get("fragments", []))
+        return {"library": {**library, "fragments": summary["fragments"]}, "failures": summary["failures"]}
@@ -0,0 +1,159 @@
+### Standard Libraries
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+# Third-Party Libraries
+import numpy as np
+
+# Your Libraries
+from ffcsdbclient import ffcsdbclient
+
+class SoakClock:
+    """
+    Client-side clock for the soakDuration of all soaking wells of a campaign.
+
+    The soak duration of a well is the time since its soakTransferTime. Instead of writing soakDuration for
+    every soaking well on every tick with update_soaking_duration, the clock computes the durations of all
+    soaking wells locally in one vectorized pass and serves them to readers. The server is only written to
+
+    - on state transitions, i.e. when a well starts soaking or stops soaking (e.g. because it was fished),
+    - and otherwise at most every persist_interval seconds,
+
+    and then only with the wells whose persisted soakDuration is off by at least min_delta seconds. Wells that
+    stopped soaking get their final soakDuration up to the moment the stop was observed, not up to the flush.
+
+    A well is soaking if it has a soakTransferTime and has not been fished.
+    """
+
+    def __init__(self, client: ffcsdbclient, user: str, campaign_id: str,
+                 persist_interval: float = 600.0, min_delta: float = 60.0):
+        self.client = client
+        self.user = user
+        self.campaign_id = campaign_id
+        self.persist_interval = persist_interval
+        self.min_delta = min_delta
+
+        self.lock = threading.Lock()
+        self.well_ids: List[str] = []
+        self.transfer_times = np.array([], dtype='datetime64[us]')
+        self.persisted_durations = np.array([], dtype=float)
+        self.pending_transitions: Dict[str, tuple] = {}  ### well ID -> (soakTransferTime, stop time or None if started)
+        self.last_persist = time.monotonic()
+
+    @staticmethod
+    def is_soaking(well: dict) -> bool:
+        return well.get("soakTransferTime") is not None and not well.get("fished")
+
+    def load(self, wells: Optional[List[dict]] = None, now: Optional[datetime] = None):
+        """
+        (Re-)loads the soaking wells, from the given wells or from get_all_wells. Wells that started or
+        stopped soaking since the last load are persisted with the next flush; wells that stopped are
+        recorded as stopped at now.
+        """
+        now = now or datetime.now()
+        if wells is None:
+            wells = self.client.get_all_wells(self.user, self.campaign_id)
+
+        soaking = {}
+        for well in wells:
+            if self.is_soaking(well):
+                transfer_time = well["soakTransferTime"]
+                if isinstance(transfer_time, str):
+                    transfer_time = datetime.fromisoformat(transfer_time)
+                soaking[str(well["_id"])] = (transfer_time, well.get("soakDuration"))
+
+        with self.lock:
+            previous = dict(zip(self.well_ids, self.transfer_times.tolist()))
+            for well_id in set(previous) - set(soaking):
+                self.pending_transitions[well_id] = (previous[well_id], now)
+            for well_id in set(soaking) - set(previous):
+                self.pending_transitions[well_id] = (soaking[well_id][0], None)
+
+            self.well_ids = list(soaking)
+            self.transfer_times = np.array([soaking[well_id][0] for well_id in self.well_ids], dtype='datetime64[us]')
+            self.persisted_durations = np.array([soaking[well_id][1] if soaking[well_id][1] is not None else np.nan
+                                                 for well_id in self.well_ids], dtype=float)
+
+    def _durations(self, now: Optional[datetime] = None) -> np.ndarray:
+        now = np.datetime64(now or datetime.now(), 'us')
+        return (now - self.transfer_times) / np.timedelta64(1, 's')
+
+    def durations(self, now: Optional[datetime] = None) -> Dict[str, int]:
+        """
+        Returns the current soak duration in seconds for every soaking well, keyed by the well's ObjectId string.
+        """
+        with self.lock:
+            durations = self._durations(now).astype(int)
+            return dict(zip(self.well_ids, durations.tolist()))
+
+    def apply(self, wells: List[dict], now: Optional[datetime] = None) -> List[dict]:
+        """
+        Sets soakDuration of the given well documents (e.g. from get_all_wells) to the current local value.
+        """
+        durations = self.durations(now)
+        for well in wells:
+            duration = durations.get(str(well.get("_id")))
+            if duration is not None:
+                well["soakDuration"] = duration
+        return wells
+
+    def flush(self, force: bool = False, now: Optional[datetime] = None):
+        """
+        Persists the soak durations to the server if there are state transitions or the persist interval
+        has elapsed (or force is set). Only wells with a stale persisted soakDuration are sent.
+
+        update_soaking_duration computes soakDuration from the time of the request, so wells that stopped soaking
+        are not sent with it; their final soakDuration, computed up to the recorded stop time, is set with
+        update_many_by_object_ids instead.
+
+        Returns:
+            MockUpdateOneResultOld: The result of update_soaking_duration (MockUpdateResult of
+                                    update_many_by_object_ids if only stopped wells were persisted), or None if
+                                    nothing was sent or a request failed.
+        """
+        with self.lock:
+            due = force or self.pending_transitions or time.monotonic() - self.last_persist >= self.persist_interval
+            if not due:
+                return None
+
+            durations = self._durations(now)
+            stale = np.isnan(self.persisted_durations) | (np.abs(durations - self.persisted_durations) >= self.min_delta)
+            sent = {self.well_ids[index]: (self.transfer_times[index].item(), durations[index]) for index in np.flatnonzero(stale)}
+            transitions = dict(self.pending_transitions)
+            final = {well_id: {"soakDuration": int((stopped - transfer_time).total_seconds())}
+                     for well_id, (transfer_time, stopped) in transitions.items() if stopped is not None}
+            self.last_persist = time.monotonic()
+
+        result = None
+        if sent:
+            wells = [{"_id": well_id, "soakTransferTime": transfer_time} for well_id, (transfer_time, _) in sent.items()]
+            result = self.client.update_soaking_duration(self.user, self.campaign_id, wells)
+            if result is None:
+                return None
+            with self.lock:
+                for index, well_id in enumerate(self.well_ids):
+                    if well_id in sent:
+                        self.persisted_durations[index] = sent[well_id][1]
+
+        if final:
+            final_result = self.client.update_many_by_object_ids(self.user, self.campaign_id, "wells", final)
+            if final_result is None:
+                return None
+            result = result if result is not None else final_result
+
+        ### Transitions recorded by a load during the requests are kept for the next flush
+        with self.lock:
+            for well_id, transition in transitions.items():
+                if self.pending_transitions.get(well_id) == transition:
+                    del self.pending_transitions[well_id]
+        return result
+
+    def tick(self, now: Optional[datetime] = None) -> Dict[str, int]:
+        """
+        To be called by a periodic timer such as the GUI's SoakTimer thread instead of update_soaking_duration:
+        returns the current durations and persists them only if due.
+        """
+        self.flush(now=now)
+        return self.durations(now)
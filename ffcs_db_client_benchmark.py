@@ -0,0 +1,147 @@
+### Standard Libraries
+import argparse
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List
+
+# Third-Party Libraries
+import requests
+from requests.adapters import HTTPAdapter
+
+# Your Libraries
+from ffcsdbclient import ffcsdbclient, Settings
+from ffcs_db_client_load_test import LatencyRecorder, VirtualUser, percentile, TEST_USER_ACCOUNT, TEST_CAMPAIGN_ID
+
+### Micro-benchmarks of ffcsdbclient transports and methods against ffcs_db_server
+###
+###     python ffcs_db_client_benchmark.py --benchmark get_wells_from_plate --concurrency 100 --transports http1 http2
+###     python ffcs_db_client_benchmark.py --benchmark cryo_per_well --wells-per-plate 288 --transports http1
+###     python ffcs_db_client_benchmark.py --benchmark cryo_bulk --wells-per-plate 288 --transports http1
+###
+### Every benchmark runs on a test plate with test wells and a test campaign library created like by the load
+### test (ffcs_db_client_load_test.VirtualUser), which are removed again at the end.
+
+def parse_args():
+    """
+    Parse command line arguments for the script.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark ffcsdbclient against ffcs_db_server.")
+    parser.add_argument('--base-url', default=Settings.BASE_URL, help='Base URL of ffcs_db_server.')
+    parser.add_argument('--benchmark', default='get_wells_from_plate', choices=sorted(BENCHMARKS), help='Benchmark to run.')
+    parser.add_argument('--concurrency', type=int, default=100, help='Number of concurrent calls (get_wells_from_plate only).')
+    parser.add_argument('--repeat', type=int, default=3, help='Number of rounds of concurrent calls.')
+    parser.add_argument('--transports', nargs='+', default=['http1', 'http2'], choices=['http1', 'http2'], help='Transports to compare.')
+    parser.add_argument('--http2-prior-knowledge', action='store_true', help='Speak HTTP/2 without negotiation (plain http servers).')
+    parser.add_argument('--wells-per-plate', type=int, default=24, help='Number of test wells.')
+    parser.add_argument('--plate-id', type=int, default=98790, help='Plate id of the test plate.')
+    parser.add_argument('--report', default=None, help='Write the JSON report to this file.')
+    return parser.parse_args()
+
+def make_session(transport: str, args) -> requests.Session:
+    """
+    Returns a session for the transport: HTTP/1.1 with a connection pool large enough for all concurrent
+    calls, or HTTP/2 multiplexing them over one connection.
+    """
+    if transport == 'http2':
+        from Http2Transport import http2_session
+        return http2_session(http2_prior_knowledge=args.http2_prior_knowledge)
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=args.concurrency)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+### Benchmarks
+
+def get_wells_from_plate(client: ffcsdbclient, user: VirtualUser, recorder: LatencyRecorder, args):
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        list(executor.map(
+            lambda _: recorder.timed("get_wells_from_plate", client.get_wells_from_plate,
+                                     TEST_USER_ACCOUNT, TEST_CAMPAIGN_ID, user.plate_id),
+            range(args.concurrency)))
+
+def cryo_targets(user: VirtualUser) -> List[dict]:
+    return [{
+        'user_account': TEST_USER_ACCOUNT,
+        'campaign_id': TEST_CAMPAIGN_ID,
+        'target_plate': user.plate_id,
+        'target_well': f"A{index + 1}a",
+        'cryo_desired_concentration': 1.5,
+        'cryo_transfer_volume': 100,
+        'cryo_source_well': "A1",
+        'cryo_name': "Cryo Benchmark",
+        'cryo_barcode': "CB98790",
+    } for index in range(len(user.well_ids))]
+
+def cryo_per_well(client: ffcsdbclient, user: VirtualUser, recorder: LatencyRecorder, args):
+    """
+    Cryoprotects all wells of the test plate and removes the cryo again, one request per well.
+    """
+    recorder.timed("add_cryo (plate, per well)", lambda: [client.add_cryo(target) for target in cryo_targets(user)])
+    recorder.timed("remove_cryo_from_well (plate, per well)", lambda: [client.remove_cryo_from_well(well_id) for well_id in user.well_ids])
+
+def cryo_bulk(client: ffcsdbclient, user: VirtualUser, recorder: LatencyRecorder, args):
+    """
+    Same as cryo_per_well with one bulk request per operation.
+    """
+    recorder.timed("add_cryo_many (plate)", client.add_cryo_many, cryo_targets(user))
+    recorder.timed("remove_cryo_from_wells (plate)", client.remove_cryo_from_wells, user.well_ids)
+
+BENCHMARKS: Dict[str, Callable] = {
+    "get_wells_from_plate": get_wells_from_plate,
+    "cryo_per_well": cryo_per_well,
+    "cryo_bulk": cryo_bulk,
+}
+
+def run_benchmark(transport: str, user: VirtualUser, args) -> dict:
+    client = ffcsdbclient(args.base_url, session=make_session(transport, args))
+    benchmark = BENCHMARKS[args.benchmark]
+    try:
+        ### Warm-up, so that connection setup is not part of the measurement
+        benchmark(client, user, LatencyRecorder(), args)
+
+        recorder = LatencyRecorder()
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            benchmark(client, user, recorder, args)
+        elapsed = time.perf_counter() - start
+    finally:
+        client.close()
+
+    endpoints = {}
+    for endpoint, latencies in sorted(recorder.latencies.items()):
+        latencies = sorted(latencies)
+        endpoints[endpoint] = {
+            "calls": len(latencies),
+            "errors": recorder.errors.get(endpoint, 0),
+            "throughput_per_s": len(latencies) / elapsed,
+            "p50_ms": percentile(latencies, 0.50) * 1000,
+            "p99_ms": percentile(latencies, 0.99) * 1000,
+        }
+    return {"transport": transport, "duration_s": elapsed, "endpoints": endpoints}
+
+def main():
+    args = parse_args()
+
+    user = VirtualUser(ffcsdbclient(args.base_url), LatencyRecorder(), str(args.plate_id), args.wells_per_plate)
+    user.setup()
+    try:
+        results = [run_benchmark(transport, user, args) for transport in args.transports]
+    finally:
+        user.teardown()
+
+    print(f"Benchmark '{args.benchmark}', {args.concurrency} concurrent calls x {args.repeat} against {args.base_url}")
+    print(f"{'transport':12s}{'endpoint':40s}{'calls':>8s}{'req/s':>10s}{'p50 ms':>10s}{'p99 ms':>10s}{'errors':>8s}")
+    for result in results:
+        for endpoint, stats in result["endpoints"].items():
+            print(f"{result['transport']:12s}{endpoint:40s}{stats['calls']:8d}{stats['throughput_per_s']:10.1f}"
+                  f"{stats['p50_ms']:10.1f}{stats['p99_ms']:10.1f}{stats['errors']:8d}")
+
+    if args.report:
+        with open(args.report, 'w') as file:
+            json.dump(results, file, indent=4)
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,14 @@
 ### Standard Libraries
 import unittest
 import json
+import csv
+import io
 import time
 from datetime import datetime, timedelta, date
 import argparse
+import os
+import tempfile
+import threading
 from typing import List, Dict, Union, Any
 import logging
 
@@ -13,10 +18,20 @@ from dateutil.parser import parse
 from pymongo import MongoClient
 from rdkit import Chem
 from rdkit.Chem import Draw
+import requests
+from requests.adapters import HTTPAdapter
 
 # Your Libraries
 ###from ffcsdbclient import ffcsdbclient, base_url
-from ffcsdbclient import ffcsdbclient
+from ffcsdbclient import ffcsdbclient, MockInsertOneResult
+from HttpCassette import recording_session, replaying_session, CassetteMiss, build_response
+from SoakClock import SoakClock
+from EchoTransferReportIngester import EchoTransferReportIngester
+from ShifterCsvIngester import ShifterCsvIngester
+from SmilesPreprocessor import SmilesPreprocessor
+from FingerprintIndex import FingerprintIndex
+from EchoPickList import EchoPickList, HEADER
+from ffcs_db_client_load_test import VirtualUser, LatencyRecorder, TEST_USER_ACCOUNT, TEST_CAMPAIGN_ID
 
 class Settings:
     pass
@@ -119,23 +134,22 @@ class ffcsdbclient_integration_test(unittest.TestCase):
         printv("")
         printv("Preparation with setUp")
 
-        ### Delete all entries from the wells collection with plateId: "98765"
-        query = {"plateId": "98765", "userAccount": "e14965", "campaignId": "EP_SmarGon"}
-        retrieved_data = self.client.delete_by_query("wells", query)
-        retrieved_data = self.client.delete_by_query("plates", query)
-        query = {"plateId": "98764", "userAccount": "e14965", "campaignId": "EP_SmarGon"}
-        retrieved_data = self.client.delete_by_query("wells", query)
-
-        query = {"plateId": "98765", "userAccount": "e14965", "campaignId": "EP_SmarGon_TEST"}
-        retrieved_data = self.client.delete_by_query("wells", query)
-        retrieved_data = self.client.delete_by_query("plates", query)
-
-        ### Delete test library
-        query = {"userAccount": "e14965", "campaignId": "EP_SmarGon", "libraryName": "Test_Library_Heidi_C", "libraryBarcode": "A98765"}
-        retrieved_data = self.client.delete_by_query("libraries", query)
-        retrieved_data = self.client.delete_by_query("campaign_libraries", query)
-
-        printv(retrieved_data['message'])
+        ### Delete all test entries from the wells, plates and library collections in a single request
+        query_98765 = {"plateId": "98765", "userAccount": "e14965", "campaignId": "EP_SmarGon"}
+        query_98764 = {"plateId": "98764", "userAccount": "e14965", "campaignId": "EP_SmarGon"}
+        query_98765_test = {"plateId": "98765", "userAccount": "e14965", "campaignId": "EP_SmarGon_TEST"}
+        query_library = {"userAccount": "e14965", "campaignId": "EP_SmarGon", "libraryName": "Test_Library_Heidi_C", "libraryBarcode": "A98765"}
+        retrieved_data = self.client.delete_many([
+            ("wells", query_98765),
+            ("plates", query_98765),
+            ("wells", query_98764),
+            ("wells", query_98765_test),
+            ("plates", query_98765_test),
+            ("libraries", query_library),
+            ("campaign_libraries", query_library),
+        ])
+
+        printv(retrieved_data)
 
         self.delete_by_id("libraries", "64d4d1bea8f822476c37f97a")
 
@@ -151,15 +165,18 @@ class ffcsdbclient_integration_test(unittest.TestCase):
         printv("")
         printv("Cleanup with tearDown")
 
-        ### Delete all entries from the wells collection with plateId: "98765"
-        query = {"plateId": "98765", "userAccount": "e14965", "campaignId": "EP_SmarGon"}
-        retrieved_data = self.client.delete_by_query("wells", query)
-        retrieved_data = self.client.delete_by_query("plates", query)
-        query = {"plateId": "98764", "userAccount": "e14965", "campaignId": "EP_SmarGon"}
-        retrieved_data = self.client.delete_by_query("wells", query)
+        ### Delete all test entries from the wells and plates collections in a single request
+        query_98765 = {"plateId": "98765", "userAccount": "e14965", "campaignId": "EP_SmarGon"}
+        query_98764 = {"plateId": "98764", "userAccount": "e14965", "campaignId": "EP_SmarGon"}
+        query_56789 = {"plateId": "56789", "userAccount": "e14965", "campaignId": "EP_SmarGon"}
+        retrieved_data = self.client.delete_many([
+            ("wells", query_98765),
+            ("plates", query_98765),
+            ("wells", query_98764),
+            ("wells", query_56789),
+        ])
 
-        query = {"plateId": "56789", "userAccount": "e14965", "campaignId": "EP_SmarGon"}
-        retrieved_data = self.client.delete_by_query("wells", query)
+        printv(retrieved_data)
 
         printv("Cleanup with tearDown complete")
 
@@ -4547,6 +4564,1668 @@ class ffcsdbclient_integration_test(unittest.TestCase):
             self.delete_by_id("campaign_libraries", inserted_id)
     ### FETCH_TAG add_campaign_library
 
+    ### FETCH_TAG delete_by_ids
+    def test_63_delete_by_ids(self):
+        """
+        Integration test for delete_by_ids.
+
+        Adds two test wells, deletes both with a single delete_by_ids call and verifies that
+        neither of them can be retrieved afterwards.
+        """
+        ### Initialize constants
+        user_account = "e14965"
+        campaign_id = "EP_SmarGon"
+        plate_id = "98765"
+
+        ### Create test wells
+        added_well_id_01 = self.add_test_well(
+            userAccount = user_account,
+            campaignId = campaign_id,
+            plateId = plate_id,
+            well = "A63a",
+            wellEcho = "A63a",
+            x = 488,
+            y = 684,
+            xEcho = 3.32,
+            yEcho = 1.87,
+        )['inserted_id']
+        added_well_id_02 = self.add_test_well(
+            userAccount = user_account,
+            campaignId = campaign_id,
+            plateId = plate_id,
+            well = "B63b",
+            wellEcho = "B63b",
+            x = 500,
+            y = 700,
+            xEcho = 4.32,
+            yEcho = 2.87,
+        )['inserted_id']
+
+        ### Perform the operation
+        retrieved_data = self.client.delete_by_ids("wells", [added_well_id_01, ObjectId(added_well_id_02)])
+        printv(f"\n{json.dumps(retrieved_data, indent=4)}")
+
+        ### Assertions
+        self.assertIsNotNone(retrieved_data, "Result of delete_by_ids function is None.")
+        self.assertTrue(retrieved_data['acknowledged'], "Deletion was not acknowledged.")
+        self.assertEqual(retrieved_data['deleted_count'], 2, "Expected exactly 2 deleted wells.")
+        self.assertFalse(self.client.get_one_well(added_well_id_01).get('_id'), "Well 01 was not deleted.")
+        self.assertFalse(self.client.get_one_well(added_well_id_02).get('_id'), "Well 02 was not deleted.")
+    ### FETCH_TAG delete_by_ids
+
+    ### FETCH_TAG delete_many
+    def test_64_delete_many(self):
+        """
+        Integration test for delete_many.
+
+        Adds a test plate and three test wells, then removes them with one delete_many call that
+        mixes a query-based and an id-based operation, and checks the per-operation counts.
+        """
+        ### Initialize constants
+        user_account = "e14965"
+        campaign_id = "EP_SmarGon"
+        plate_id = "98765"
+
+        ### Create test wells and a test plate
+        added_well_ids = [self.add_test_well(
+            userAccount = user_account,
+            campaignId = campaign_id,
+            plateId = plate_id,
+            well = f"{row}64a",
+            wellEcho = f"{row}64a",
+            x = 488,
+            y = 684,
+            xEcho = 3.32,
+            yEcho = 1.87,
+        )['inserted_id'] for row in "ABC"]
+        added_plate_id = self.add_test_plate(user_account, campaign_id, plate_id, batchId="987654")['inserted_id']
+
+        ### Perform the operation
+        query = {"userAccount": user_account, "campaignId": campaign_id, "plateId": plate_id}
+        retrieved_data = self.client.delete_many([
+            ("wells", query),
+            ("plates", [added_plate_id]),
+        ])
+        printv(f"\n{json.dumps(retrieved_data, indent=4)}")
+
+        try:
+            ### Assertions
+            self.assertIsNotNone(retrieved_data, "Result of delete_many function is None.")
+            self.assertTrue(retrieved_data['acknowledged'], "Deletion was not acknowledged.")
+            self.assertEqual(len(retrieved_data['results']), 2, "Expected one result per operation.")
+            self.assertEqual(retrieved_data['results'][0]['collection'], "wells", "Results are not in operation order.")
+            self.assertEqual(retrieved_data['results'][0]['deleted_count'], len(added_well_ids), "Mismatch in deleted wells.")
+            self.assertEqual(retrieved_data['results'][1]['deleted_count'], 1, "Mismatch in deleted plates.")
+            self.assertFalse(self.client.is_plate_in_database(plate_id), "Plate was not deleted.")
+        finally:
+            ### Delete left-overs in case the operation failed
+            self.client.delete_by_ids("wells", added_well_ids)
+            self.client.delete_by_ids("plates", [added_plate_id])
+    ### FETCH_TAG delete_many
+
+    ### FETCH_TAG record_and_replay
+    def test_65_record_and_replay(self):
+        """
+        Integration test for the HttpCassette record and replay sessions.
+
+        Records get_wells_from_plate for a test well to a cassette, deletes the well and then replays the
+        cassette with a client whose base_url cannot be reached, which must still return the recorded well.
+        """
+        ### Initialize constants
+        user_account = "e14965"
+        campaign_id = "EP_SmarGon"
+        plate_id = "98765"
+        cassette_path = os.path.join(tempfile.mkdtemp(), "test_65.cassette")
+
+        ### Create a test well
+        added_well_id_01 = self.add_test_well(
+            userAccount = user_account,
+            campaignId = campaign_id,
+            plateId = plate_id,
+            well = "A65a",
+            wellEcho = "A65a",
+            x = 488,
+            y = 684,
+            xEcho = 3.32,
+            yEcho = 1.87,
+        )['inserted_id']
+
+        try:
+            ### Record
+            recording_client = ffcsdbclient(Settings.BASE_URL, session=recording_session(cassette_path))
+            recorded_data = recording_client.get_wells_from_plate(user_account, campaign_id, plate_id)
+            recording_client.close()
+        finally:
+            self.delete_by_id("wells", added_well_id_01)
+
+        ### Replay without network, once with reproduced latencies
+        for reproduce_latency in (False, True):
+            replaying_client = ffcsdbclient(Settings.BASE_URL, session=replaying_session(cassette_path, reproduce_latency=reproduce_latency))
+            replayed_data = replaying_client.get_wells_from_plate(user_account, campaign_id, plate_id)
+            printv(f"\n{json.dumps(self.convert_objectid_to_str(replayed_data), indent=4)}")
+
+            ### Assertions
+            self.assertEqual(replayed_data, recorded_data, "Replayed wells do not match the recorded wells.")
+            self.assertTrue(any(str(well['_id']) == added_well_id_01 for well in replayed_data), "Recorded test well is missing.")
+
+        ### Requests that were not recorded are not sent to the server
+        with self.assertRaises(CassetteMiss):
+            replaying_client.session.get(f"{Settings.BASE_URL}/check_if_db_connected")
+    ### FETCH_TAG record_and_replay
+
+    ### FETCH_TAG subscribe_notifications
+    def test_66_subscribe_notifications(self):
+        """
+        Integration test for subscribe_notifications.
+
+        Subscribes to the notifications of the test campaign, sends a notification and checks that it is
+        delivered to the callback exactly once, either pushed by the server or through the polling fallback.
+        """
+        ### Initialize constants
+        user_account = "e14965"
+        campaign_id = "EP_SmarGon"
+        notification_type = "test_notification"
+
+        received = []
+        delivered = threading.Event()
+
+        def callback(notification):
+            received.append(notification)
+            delivered.set()
+
+        subscription = self.client.subscribe_notifications(user_account, campaign_id, callback, poll_interval=0.5)
+        try:
+            ### Send a notification
+            retrieved_data_send = self.client.send_notification(user_account, campaign_id, notification_type)
+            printv(f"\n{json.dumps(retrieved_data_send, indent=4)}")
+            self.assertTrue(retrieved_data_send["acknowledged"], "Notification not acknowledged.")
+            inserted_id = retrieved_data_send["inserted_id"]
+
+            ### Wait for the delivery and for possible duplicates
+            self.assertTrue(delivered.wait(10), "The sent notification was not delivered.")
+            time.sleep(2)
+            printv(f"Subscription mode: {subscription.mode}")
+
+            ### Assertions
+            delivered_ids = [str(notification["_id"]) for notification in received]
+            self.assertIn(str(inserted_id), delivered_ids, "The sent notification was not delivered.")
+            self.assertEqual(delivered_ids.count(str(inserted_id)), 1, "The sent notification was delivered more than once.")
+            self.assertIsInstance(received[0]["_id"], ObjectId, "ObjectId not converted.")
+        finally:
+            subscription.close()
+
+        self.assertFalse(subscription.alive, "Subscription thread is still running after close.")
+    ### FETCH_TAG subscribe_notifications
+
+    ### FETCH_TAG soak_clock
+    def test_67_soak_clock(self):
+        """
+        Integration test for the client-side SoakClock.
+
+        Adds a well that started soaking one hour ago, checks the locally computed soak duration and
+        verifies that the duration is persisted once on the state transition, but not on every tick.
+        """
+        ### Initialize constants
+        user_account = "e14965"
+        campaign_id = "EP_SmarGon"
+        plate_id = "98765"
+        soak_start_time = datetime.now() - timedelta(hours=1)
+
+        ### Create a soaking test well
+        added_well_id_01 = self.add_test_well(
+            userAccount = user_account,
+            campaignId = campaign_id,
+            plateId = plate_id,
+            well = "A67a",
+            wellEcho = "A67a",
+            x = 488,
+            y = 684,
+            xEcho = 3.32,
+            yEcho = 1.87,
+            fished = False,
+            soakTransferStatus = "OK",
+            soakTransferTime = soak_start_time.isoformat(),
+        )['inserted_id']
+
+        try:
+            soak_clock = SoakClock(self.client, user_account, campaign_id, persist_interval=3600, min_delta=60)
+            soak_clock.load(self.client.get_wells_from_plate(user_account, campaign_id, plate_id))
+
+            ### Local durations
+            durations = soak_clock.durations()
+            printv(durations)
+            self.assertIn(added_well_id_01, durations, "Soaking well is not tracked by the soak clock.")
+            self.assertTrue(3590 <= durations[added_well_id_01] <= 3700, f"Unexpected soak duration: {durations[added_well_id_01]}.")
+
+            ### The new soaking well is a state transition and is persisted with the first tick
+            soak_clock.tick()
+            retrieved_data_updated_well_01 = self.client.get_one_well(added_well_id_01)
+            self.assertTrue(retrieved_data_updated_well_01['soakDuration'] >= 3590, f"Soak duration not persisted: {retrieved_data_updated_well_01['soakDuration']}.")
+
+            ### Subsequent ticks within the persist interval do not write to the server
+            self.assertIsNone(soak_clock.flush(), "Soak clock wrote to the server without a transition or elapsed interval.")
+        finally:
+            self.delete_by_id("wells", added_well_id_01)
+    ### FETCH_TAG soak_clock
+
+    ### FETCH_TAG open_replica
+    def test_68_open_replica(self):
+        """
+        Integration test for the local campaign replica.
+
+        Opens a replica of the test campaign in a temporary file, checks that a test plate and well are
+        served locally with the same types as from the server, and that reopening the replica serves them
+        without any request to the server.
+        """
+        ### Initialize constants
+        user_account = "e14965"
+        campaign_id = "EP_SmarGon"
+        plate_id = "98765"
+        replica_path = os.path.join(tempfile.mkdtemp(), "test_68.sqlite")
+
+        ### Create a test plate and well
+        added_plate_id = self.add_test_plate(user_account, campaign_id, plate_id, batchId="987654")['inserted_id']
+        added_well_id_01 = self.add_test_well(
+            userAccount = user_account,
+            campaignId = campaign_id,
+            plateId = plate_id,
+            well = "A68a",
+            wellEcho = "A68e",
+            x = 488,
+            y = 684,
+            xEcho = 3.32,
+            yEcho = 1.87,
+            xtalName = "xtal-68",
+        )['inserted_id']
+
+        try:
+            replica = self.client.open_replica(user_account, campaign_id, path=replica_path, sync_interval=3600)
+            replica.close()
+
+            ### Reopen with a client that cannot reach the server
+            offline_client = ffcsdbclient("http://127.0.0.1:9")
+            replica = offline_client.open_replica(user_account, campaign_id, path=replica_path, sync_interval=3600)
+            try:
+                local_plate = replica.get_plate(plate_id)
+                local_well = replica.get_well(plate_id, "A68a")
+                printv(f"\n{json.dumps(self.convert_objectid_to_str(local_well), indent=4, default=str)}")
+
+                ### Assertions
+                self.assertIsNotNone(local_plate, "Test plate is missing in the replica.")
+                self.assertIsNotNone(local_well, "Test well is missing in the replica.")
+                self.assertEqual(local_well['_id'], ObjectId(added_well_id_01), "Well _id is not an ObjectId or does not match.")
+                self.assertEqual(replica.get_well_by_echo(plate_id, "A68e")['_id'], local_well['_id'], "Lookup by wellEcho failed.")
+                self.assertEqual(replica.get_well_by_xtal_name("xtal-68")['_id'], local_well['_id'], "Lookup by xtalName failed.")
+                self.assertTrue(any(well['_id'] == local_well['_id'] for well in replica.get_wells_from_plate(plate_id)), "Well missing on plate.")
+            finally:
+                replica.close()
+        finally:
+            self.delete_by_id("wells", added_well_id_01)
+            self.delete_by_id("plates", added_plate_id)
+    ### FETCH_TAG open_replica
+
+    ### FETCH_TAG sync_wells
+    def test_69_sync_wells(self):
+        """
+        Integration test for the incremental sync_wells.
+
+        Takes a watermark, then adds, modifies and deletes test wells and checks that the next sync returns
+        exactly these changes and merges them into a caller-held list of wells.
+        """
+        ### Initialize constants
+        user_account = "e14965"
+        campaign_id = "EP_SmarGon"
+        plate_id = "98765"
+
+        def add_well(well):
+            return self.add_test_well(
+                userAccount = user_account,
+                campaignId = campaign_id,
+                plateId = plate_id,
+                well = well,
+                wellEcho = well,
+                x = 488,
+                y = 684,
+                xEcho = 3.32,
+                yEcho = 1.87,
+            )['inserted_id']
+
+        added_well_id_01 = add_well("A69a")
+        added_well_id_02 = add_well("B69b")
+
+        try:
+            ### Full sync without watermark
+            wells = []
+            retrieved_data = self.client.sync_wells(user_account, campaign_id, into=wells)
+            self.assertIsNotNone(retrieved_data, "Result of sync_wells function is None.")
+            self.assertIn(ObjectId(added_well_id_01), [well['_id'] for well in wells], "Test well missing after full sync.")
+            watermark = retrieved_data['watermark']
+
+            ### Changes after the watermark
+            time.sleep(1)
+            added_well_id_03 = add_well("C69c")
+            self.client.update_notes(user_account, campaign_id, added_well_id_01, "test_69")
+            self.delete_by_id("wells", added_well_id_02)
+
+            retrieved_data = self.client.sync_wells(user_account, campaign_id, since=watermark, into=wells)
+            printv(f"\n{json.dumps(self.convert_objectid_to_str(retrieved_data), indent=4, default=str)}")
+
+            ### Assertions
+            changed_ids = {str(well['_id']) for well in retrieved_data['changed']}
+            self.assertEqual(changed_ids & {added_well_id_01, added_well_id_03}, {added_well_id_01, added_well_id_03}, "Changed wells missing in delta.")
+            self.assertIn(added_well_id_02, retrieved_data['deleted'], "Deleted well missing in delta.")
+            self.assertNotEqual(retrieved_data['watermark'], watermark, "Watermark did not advance.")
+
+            wells_by_id = {str(well['_id']): well for well in wells}
+            self.assertEqual(wells_by_id[added_well_id_01]['notes'], "test_69", "Modified well not merged.")
+            self.assertIn(added_well_id_03, wells_by_id, "Added well not merged.")
+            self.assertNotIn(added_well_id_02, wells_by_id, "Deleted well not removed.")
+        finally:
+            self.client.delete_many([("wells", {"userAccount": user_account, "campaignId": campaign_id, "plateId": plate_id})])
+    ### FETCH_TAG sync_wells
+
+    ### FETCH_TAG sync_plates
+    def test_70_sync_plates(self):
+        """
+        Integration test for the incremental sync_plates, analogous to test_69_sync_wells.
+        """
+        ### Initialize constants
+        user_account = "e14965"
+        campaign_id = "EP_SmarGon"
+        plate_id = "98765"
+
+        retrieved_data = self.client.sync_plates(user_account, campaign_id)
+        self.assertIsNotNone(retrieved_data, "Result of sync_plates function is None.")
+        watermark = retrieved_data['watermark']
+
+        time.sleep(1)
+        added_plate_id = self.add_test_plate(user_account, campaign_id, plate_id, batchId="987654")['inserted_id']
+        try:
+            retrieved_data = self.client.sync_plates(user_account, campaign_id, since=watermark)
+            printv(f"\n{json.dumps(retrieved_data, indent=4, default=str)}")
+            self.assertEqual([plate['plateId'] for plate in retrieved_data['changed']], [plate_id], "Delta does not contain exactly the added plate.")
+            watermark = retrieved_data['watermark']
+        finally:
+            self.delete_by_id("plates", added_plate_id)
+
+        retrieved_data = self.client.sync_plates(user_account, campaign_id, since=watermark)
+        self.assertEqual(retrieved_data['changed'], [], "Unexpected changed plates.")
+        self.assertIn(added_plate_id, retrieved_data['deleted'], "Deleted plate missing in delta.")
+    ### FETCH_TAG sync_plates
+
+    ### FETCH_TAG batch
+    def test_71_batch(self):
+        """
+        Integration test for client.batch: several calls are sent in one request to the /batch endpoint and
+        resolve to the same results as the individual calls.
+        """
+        ### Initialize constants
+        user_account = "e14965"
+        campaign_id = "EP_SmarGon"
+        plate_id = "98765"
+
+        added_plate_id = self.add_test_plate(user_account, campaign_id, plate_id, batchId="987654")['inserted_id']
+        added_well_id = self.add_test_well(
+            userAccount = user_account,
+            campaignId = campaign_id,
+            plateId = plate_id,
+            well = "A71a",
+            wellEcho = "A71a",
+            x = 488,
+            y = 684,
+            xEcho = 3.32,
+            yEcho = 1.87,
+        )['inserted_id']
+
+        try:
+            with self.client.batch() as batch:
+                well = batch.get_one_well(added_well_id)
+                wells = batch.get_wells_from_plate(user_account, campaign_id, plate_id)
+                fished = batch.is_crystal_already_fished(plate_id, "A71a")
+                plate_in_database = batch.is_plate_in_database(plate_id)
+
+            printv(f"\n{json.dumps(self.convert_objectid_to_str(well.result()), indent=4, default=str)}")
+
+            ### Assertions
+            self.assertEqual(well.result(), self.client.get_one_well(added_well_id), "Batched get_one_well differs.")
+            self.assertEqual(wells.result(), self.client.get_wells_from_plate(user_account, campaign_id, plate_id),
+                             "Batched get_wells_from_plate differs.")
+            self.assertFalse(fished.result(), "Test well reported as fished.")
+            self.assertTrue(plate_in_database.result(), "Test plate not found.")
+
+            with self.assertRaises(AttributeError):
+                self.client.batch().subscribe_notifications
+        finally:
+            self.delete_by_id("wells", added_well_id)
+            self.delete_by_id("plates", added_plate_id)
+    ### FETCH_TAG batch
+
+    ### FETCH_TAG http2_session
+    def test_72_http2_transport(self):
+        """
+        Integration test for the optional HTTP/2 transport: concurrent calls through an http2_session return the
+        same results as through the default session.
+        """
+        try:
+            from Http2Transport import http2_session
+            session = http2_session()
+        except ImportError as e:
+            self.skipTest(str(e))
+
+        ### Initialize constants
+        user_account = "e14965"
+        campaign_id = "EP_SmarGon"
+        plate_id = "98765"
+
+        added_plate_id = self.add_test_plate(user_account, campaign_id, plate_id, batchId="987654")['inserted_id']
+        added_well_id = self.add_test_well(
+            userAccount = user_account,
+            campaignId = campaign_id,
+            plateId = plate_id,
+            well = "A72a",
+            wellEcho = "A72a",
+            x = 488,
+            y = 684,
+            xEcho = 3.32,
+            yEcho = 1.87,
+        )['inserted_id']
+
+        client = ffcsdbclient(Settings.BASE_URL, session=session)
+        try:
+            expected_data = self.client.get_wells_from_plate(user_account, campaign_id, plate_id)
+            results = [None] * 10
+
+            def fetch(index):
+                results[index] = client.get_wells_from_plate(user_account, campaign_id, plate_id)
+
+            threads = [threading.Thread(target=fetch, args=(index,)) for index in range(len(results))]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            printv(f"\n{json.dumps(self.convert_objectid_to_str(results[0]), indent=4, default=str)}")
+
+            ### Assertions
+            for retrieved_data in results:
+                self.assertEqual(retrieved_data, expected_data, "Result over HTTP/2 transport differs.")
+        finally:
+            client.close()
+            self.delete_by_id("wells", added_well_id)
+            self.delete_by_id("plates", added_plate_id)
+    ### FETCH_TAG http2_session
+
+    ### FETCH_TAG single_flight
+    def test_73_single_flight(self):
+        """
+        Integration test for the coalescing of identical concurrent reads: callers that arrive while an identical
+        get_all_wells request is in flight share its result, but each receives its own copy.
+        """
+        ### Initialize constants
+        user_account = "e14965"
+        campaign_id = "EP_SmarGon"
+
+        ### Slow down the requests, so that all threads arrive while the first request is in flight
+        class SlowAdapter(HTTPAdapter):
+            def send(self, request, **kwargs):
+                time.sleep(1.0)
+                return super().send(request, **kwargs)
+
+        session = requests.Session()
+        session.mount('http://', SlowAdapter())
+        session.mount('https://', SlowAdapter())
+        client = ffcsdbclient(Settings.BASE_URL, session=session)
+
+        results = [None] * 5
+
+        def fetch(index):
+            results[index] = client.get_all_wells(user_account, campaign_id)
+
+        try:
+            threads = [threading.Thread(target=fetch, args=(index,)) for index in range(len(results))]
+            for thread in threads:
+                thread.start()
+                time.sleep(0.05)
+            for thread in threads:
+                thread.join()
+        finally:
+            client.close()
+
+        printv(f"\nmetrics: {client.metrics}")
+
+        ### Assertions
+        self.assertEqual(client.metrics["coalesced_hits"], len(results) - 1, "Concurrent identical reads not coalesced.")
+        for retrieved_data in results[1:]:
+            self.assertEqual(retrieved_data, results[0], "Coalesced results differ.")
+            self.assertIsNot(retrieved_data, results[0], "Coalesced callers share the same result object.")
+        if results[0]:
+            results[0][0]["notes"] = "test_73"
+            self.assertNotEqual(results[1][0].get("notes"), "test_73", "Mutation of one result affects another.")
+    ### FETCH_TAG single_flight
+
+    ### FETCH_TAG get_wells_by_ids
+    def test_74_get_wells_by_ids(self):
+        """
+        Integration test for get_wells_by_ids: order of the ids is preserved, missing ids are reported and the
+        projection to fields is applied.
+        """
+        ### Initialize constants
+        user_account = "e14965"
+        campaign_id = "EP_SmarGon"
+        plate_id = "98765"
+
+        added_well_ids = [self.add_test_well(
+            userAccount = user_account,
+            campaignId = campaign_id,
+            plateId = plate_id,
+            well = well,
+            wellEcho = well,
+            x = 488,
+            y = 684,
+            xEcho = 3.32,
+            yEcho = 1.87,
+        )['inserted_id'] for well in ["A74a", "B74b", "C74c"]]
+        missing_id = str(ObjectId())
+
+        try:
+            ids = [added_well_ids[2], missing_id, added_well_ids[0], added_well_ids[1]]
+            retrieved_data = self.client.get_wells_by_ids(ids)
+            printv(f"\n{json.dumps(self.convert_objectid_to_str(retrieved_data), indent=4, default=str)}")
+
+            ### Assertions
+            self.assertIsNotNone(retrieved_data, "Result of get_wells_by_ids function is None.")
+            self.assertEqual([well['_id'] for well in retrieved_data['documents']],
+                             [ObjectId(added_well_ids[2]), ObjectId(added_well_ids[0]), ObjectId(added_well_ids[1])], "Order of ids not preserved.")
+            self.assertEqual(retrieved_data['missing'], [missing_id], "Missing id not reported.")
+            self.assertEqual(retrieved_data['documents'][1], self.client.get_one_well(added_well_ids[0]), "Well differs from get_one_well.")
+
+            retrieved_data = self.client.get_wells_by_ids(added_well_ids, fields=["well"])
+            self.assertEqual([set(well) for well in retrieved_data['documents']], [{"_id", "well"}] * 3, "Projection not applied.")
+        finally:
+            self.client.delete_by_ids("wells", added_well_ids)
+    ### FETCH_TAG get_wells_by_ids
+
+    ### FETCH_TAG get_libraries_by_ids
+    def test_75_get_libraries_by_ids(self):
+        """
+        Integration test for get_libraries_by_ids with the campaign_libraries collection.
+        """
+        added_library_id = self.insert_campaign_library(
+            userAccount="e14965",
+            campaignId="EP_SmarGon",
+            libraryName="Test_Library_Heidi_C",
+            libraryBarcode="A98765",
+            fragments=[{"compoundCode": "C001", "smiles": "c1ccccc1", "well": "A75a", "used": False}],
+        )['inserted_id']
+        missing_id = str(ObjectId())
+
+        try:
+            retrieved_data = self.client.get_libraries_by_ids([missing_id, added_library_id], collection="campaign_libraries")
+            printv(f"\n{json.dumps(self.convert_objectid_to_str(retrieved_data), indent=4, default=str)}")
+
+            ### Assertions
+            self.assertIsNotNone(retrieved_data, "Result of get_libraries_by_ids function is None.")
+            self.assertEqual(retrieved_data['documents'], [self.client.get_one_campaign_library(added_library_id)],
+                             "Library differs from get_one_campaign_library.")
+            self.assertEqual(retrieved_data['missing'], [missing_id], "Missing id not reported.")
+            with self.assertRaises(ValueError):
+                self.client.get_libraries_by_ids([added_library_id], collection="wells")
+        finally:
+            self.delete_by_id("campaign_libraries", added_library_id)
+    ### FETCH_TAG get_libraries_by_ids
+
+    ### FETCH_TAG update_many_by_object_ids
+    def test_76_update_many_by_object_ids(self):
+        """
+        Integration test for update_many_by_object_ids with different changes per well and a missing well.
+        """
+        ### Initialize constants
+        user_account = "e14965"
+        campaign_id = "EP_SmarGon"
+        plate_id = "98765"
+
+        added_well_ids = [self.add_test_well(
+            userAccount = user_account,
+            campaignId = campaign_id,
+            plateId = plate_id,
+            well = well,
+            wellEcho = well,
+            x = 488,
+            y = 684,
+            xEcho = 3.32,
+            yEcho = 1.87,
+        )['inserted_id'] for well in ["A76a", "B76b"]]
+        missing_id = str(ObjectId())
+
+        try:
+            updates = {
+                added_well_ids[0]: {"notes": "test_76_a", "solventVolume": 1.5},
+                added_well_ids[1]: {"notes": "test_76_b"},
+                missing_id: {"notes": "test_76_c"},
+            }
+            retrieved_data = self.client.update_many_by_object_ids(user_account, campaign_id, "wells", updates)
+            printv(f"\n{json.dumps(retrieved_data.to_dict(), indent=4, default=str)}")
+
+            ### Assertions
+            self.assertIsNotNone(retrieved_data, "Result of update_many_by_object_ids function is None.")
+            self.assertEqual(retrieved_data.matched_count, 2, "Matched count does not equal 2.")
+            self.assertEqual(retrieved_data.modified_count, 2, "Modified count does not equal 2.")
+            results = retrieved_data.raw_result['results']
+            self.assertEqual(results[added_well_ids[0]]['modified_count'], 1, "First well not modified.")
+            self.assertEqual(results[missing_id]['matched_count'], 0, "Missing well reported as matched.")
+
+            wells = self.client.get_wells_by_ids(added_well_ids)['documents']
+            self.assertEqual([well['notes'] for well in wells], ["test_76_a", "test_76_b"], "Notes not updated.")
+            self.assertEqual(wells[0]['solventVolume'], 1.5, "solventVolume not updated.")
+        finally:
+            self.client.delete_by_ids("wells", added_well_ids)
+    ### FETCH_TAG update_many_by_object_ids
+
+    ### FETCH_TAG add_fragments_to_wells
+    def test_77_add_fragments_to_wells(self):
+        """
+        Integration test for add_fragments_to_wells: one request assigns different fragments of a campaign library to
+        several wells and reports the result per well.
+        """
+        ### Initialize constants
+        user_account = "e14965"
+        campaign_id = "EP_SmarGon"
+        plate_id = "98765"
+
+        fragments = [
+            {'well': 'A1', 'smiles': 'c1ccccc1', 'compoundCode': 'C001', 'libraryConcentration': '1.0'},
+            {'well': 'A2', 'smiles': 'O=C(C)Oc1ccccc1C(=O)O', 'compoundCode': 'C002', 'libraryConcentration': '1.0'},
+        ]
+        added_campaign_library_id = self.insert_campaign_library(
+            userAccount=user_account,
+            campaignId=campaign_id,
+            libraryName="Test_Library_Heidi_C",
+            libraryBarcode="A98765",
+            fragments=[dict(fragment, used=False) for fragment in fragments],
+        )['inserted_id']
+        added_well_ids = [self.add_test_well(
+            userAccount = user_account,
+            campaignId = campaign_id,
+            plateId = plate_id,
+            well = well,
+            wellEcho = well,
+            x = 488,
+            y = 684,
+            xEcho = 3.32,
+            yEcho = 1.87,
+        )['inserted_id'] for well in ["A77a", "B77b"]]
+
+        library = {'libraryName': 'TestLibrary', 'libraryBarcode': 'A98765', '_id': ObjectId(added_campaign_library_id)}
+        assignments = [{
+            "well_id": well_id,
+            "fragment": fragment,
+            "solvent_volume": 1.5,
+            "ligand_transfer_volume": 0.5,
+            "ligand_concentration": 1.0,
+        } for well_id, fragment in zip(added_well_ids, fragments)]
+
+        try:
+            retrieved_data = self.client.add_fragments_to_wells(library, assignments)
+            printv(f"\n{json.dumps({well_id: result.to_dict() for well_id, result in retrieved_data.items()}, indent=4)}")
+
+            ### Assertions
+            self.assertIsNotNone(retrieved_data, "Result of add_fragments_to_wells function is None.")
+            self.assertEqual(set(retrieved_data), set(added_well_ids), "Results not reported per well.")
+            for result in retrieved_data.values():
+                self.assertEqual(result.nModified, 1, "No modification was made to the document.")
+            self.assertIsInstance(library['_id'], ObjectId, "Library passed by the caller was modified.")
+
+            wells = self.client.get_wells_by_ids(added_well_ids)['documents']
+            self.assertEqual([well['compoundCode'] for well in wells], ['C001', 'C002'], "Compound codes not assigned.")
+            self.assertTrue(all(well['libraryAssigned'] for well in wells), "Library not assigned in wells.")
+            self.assertTrue(all(well['solventTest'] is False for well in wells), "Solvent test mismatch in wells.")
+
+            retrieved_data_updated_library = self.client.get_one_campaign_library(added_campaign_library_id)
+            self.assertTrue(all(fragment['used'] for fragment in retrieved_data_updated_library['fragments']), "Fragments not marked as used.")
+        finally:
+            self.client.delete_by_ids("wells", added_well_ids)
+            self.delete_by_id("campaign_libraries", added_campaign_library_id)
+    ### FETCH_TAG add_fragments_to_wells
+
+    ### FETCH_TAG remove_fragments_from_wells
+    def test_78_remove_fragments_from_wells(self):
+        """
+        Integration test for remove_fragments_from_wells on wells with an assigned fragment.
+        """
+        ### Initialize constants
+        user_account = "e14965"
+        campaign_id = "EP_SmarGon"
+        plate_id = "98765"
+
+        fragment = {'well': 'A1', 'smiles': 'c1ccccc1', 'compoundCode': 'C001', 'libraryConcentration': '1.0'}
+        added_campaign_library_id = self.insert_campaign_library(
+            userAccount=user_account,
+            campaignId=campaign_id,
+            libraryName="Test_Library_Heidi_C",
+            libraryBarcode="A98765",
+            fragments=[dict(fragment, used=False)],
+        )['inserted_id']
+        added_well_ids = [self.add_test_well(
+            userAccount = user_account,
+            campaignId = campaign_id,
+            plateId = plate_id,
+            well = well,
+            wellEcho = well,
+            x = 488,
+            y = 684,
+            xEcho = 3.32,
+            yEcho = 1.87,
+        )['inserted_id'] for well in ["A78a", "B78b"]]
+
+        library = {'libraryName': 'TestLibrary', 'libraryBarcode': 'A98765', '_id': ObjectId(added_campaign_library_id)}
+        self.client.add_fragments_to_wells(library, [{
+            "well_id": well_id,
+            "fragment": fragment,
+            "solvent_volume": 1.5,
+            "ligand_transfer_volume": 0.5,
+            "ligand_concentration": 1.0,
+        } for well_id in added_well_ids])
+
+        try:
+            retrieved_data = self.client.remove_fragments_from_wells(added_well_ids)
+            printv(f"\n{json.dumps({well_id: result.to_dict() for well_id, result in retrieved_data.items()}, indent=4)}")
+
+            ### Assertions
+            self.assertIsNotNone(retrieved_data, "Result of remove_fragments_from_wells function is None.")
+            for well_id in added_well_ids:
+                self.assertEqual(retrieved_data[well_id].nModified, 1, "No modification was made to the document.")
+
+            wells = self.client.get_wells_by_ids(added_well_ids)['documents']
+            for well in wells:
+                self.assertFalse(well.get('libraryAssigned'), "Library still assigned in well.")
+                self.assertIsNone(well.get('compoundCode'), "Compound code still set in well.")
+
+            ### Malformed responses with status 200 are reported as failed requests
+            for body in [{"detail": "Not supported"}, {"results": [{"well_id": str(added_well_ids[0])}]}]:
+                class MalformedAdapter(HTTPAdapter):
+                    def send(self, request, **kwargs):
+                        return build_response(request, 200, {"Content-Type": "application/json"},
+                                              json.dumps(body).encode('utf-8'), connection=self)
+
+                session = requests.Session()
+                session.mount('http://', MalformedAdapter())
+                session.mount('https://', MalformedAdapter())
+                client = ffcsdbclient(Settings.BASE_URL, session=session)
+                self.assertIsNone(client.remove_fragments_from_wells(added_well_ids), f"Malformed response not rejected: {body}")
+                self.assertIsNone(client.add_fragments_to_wells(library, [{
+                    "well_id": added_well_ids[0],
+                    "fragment": fragment,
+                    "solvent_volume": 1.5,
+                    "ligand_transfer_volume": 0.5,
+                    "ligand_concentration": 1.0,
+                }]), f"Malformed response not rejected: {body}")
+                client.close()
+        finally:
+            self.client.delete_by_ids("wells", added_well_ids)
+            self.delete_by_id("campaign_libraries", added_campaign_library_id)
+    ### FETCH_TAG remove_fragments_from_wells
+
+    ### FETCH_TAG add_cryo_many
+    def test_79_add_cryo_many(self):
+        """
+        Integration test for add_cryo_many with individual cryo parameters per well and a well that does not exist.
+        """
+        ### Initialize constants
+        user_account = "e14965"
+        campaign_id = "EP_SmarGon"
+        plate_id = "98765"
+        target_wells = ["A79a", "B79b"]
+
+        added_well_ids = [self.add_test_well(
+            userAccount = user_account,
+            campaignId = campaign_id,
+            plateId = plate_id,
+            well = well,
+            wellEcho = well,
+            x = 488,
+            y = 684,
+            xEcho = 3.32,
+            yEcho = 1.87,
+        )['inserted_id'] for well in target_wells]
+
+        data = [{
+            'user_account': user_account,
+            'campaign_id': campaign_id,
+            'target_plate': plate_id,
+            'target_well': target_well,
+            'cryo_desired_concentration': 1.5,
+            'cryo_transfer_volume': 100 + index,
+            'cryo_source_well': "C79c",
+            'cryo_name': "Cryo Test",
+            'cryo_barcode': "CT98765",
+        } for index, target_well in enumerate(target_wells + ["D79d"])]
+
+        try:
+            retrieved_data = self.client.add_cryo_many(data)
+            printv(f"\n{json.dumps([result.to_dict() for result in retrieved_data], indent=4)}")
+
+            ### Assertions
+            self.assertIsNotNone(retrieved_data, "Result of add_cryo_many function is None.")
+            self.assertEqual([result.modified_count for result in retrieved_data], [1, 1, 0], "Modified counts per well do not match.")
+
+            wells = self.client.get_wells_by_ids(added_well_ids)['documents']
+            self.assertEqual([well["cryoTransferVolume"] for well in wells], [100, 101], "cryoTransferVolume per well does not match.")
+            self.assertTrue(all(well["cryoProtection"] and well["cryoStatus"] == "pending" for well in wells), "Cryo not applied to all wells.")
+        finally:
+            self.client.delete_by_ids("wells", added_well_ids)
+    ### FETCH_TAG add_cryo_many
+
+    ### FETCH_TAG remove_cryo_from_wells
+    def test_80_remove_cryo_from_wells(self):
+        """
+        Integration test for remove_cryo_from_wells on cryoprotected test wells.
+        """
+        ### Initialize constants
+        user_account = "e14965"
+        campaign_id = "EP_SmarGon"
+        plate_id = "98765"
+
+        added_well_ids = [self.add_test_well(
+            userAccount = user_account,
+            campaignId = campaign_id,
+            plateId = plate_id,
+            well = well,
+            wellEcho = well,
+            x = 488,
+            y = 684,
+            xEcho = 3.32,
+            yEcho = 1.87,
+            cryoProtection = True,
+            cryoStatus = "pending",
+            cryoDesiredConcentration = 1.5,
+            cryoTransferVolume = 100,
+            cryoSourceWell = "C80c",
+            cryoName = "Cryo Test",
+            cryoBarcode = "CT98765",
+        )['inserted_id'] for well in ["A80a", "B80b"]]
+
+        try:
+            retrieved_data = self.client.remove_cryo_from_wells(added_well_ids)
+            printv(f"\n{json.dumps({well_id: result.to_dict() for well_id, result in retrieved_data.items()}, indent=4)}")
+
+            ### Assertions
+            self.assertIsNotNone(retrieved_data, "Result of remove_cryo_from_wells function is None.")
+            for well_id in added_well_ids:
+                self.assertEqual(retrieved_data[well_id].modified_count, 1, "The number of modified documents does not match.")
+
+            for well in self.client.get_wells_by_ids(added_well_ids)['documents']:
+                self.assertEqual(well["cryoProtection"], False, "cryoProtection was not removed.")
+                self.assertIsNone(well["cryoName"], "cryoName is not None.")
+        finally:
+            self.client.delete_by_ids("wells", added_well_ids)
+    ### FETCH_TAG remove_cryo_from_wells
+
+    ### FETCH_TAG remove_new_solvent_from_wells
+    def test_81_remove_new_solvent_from_wells(self):
+        """
+        Integration test for remove_new_solvent_from_wells on redesolved test wells.
+        """
+        ### Initialize constants
+        user_account = "e14965"
+        campaign_id = "EP_SmarGon"
+        plate_id = "98765"
+
+        added_well_ids = [self.add_test_well(
+            userAccount = user_account,
+            campaignId = campaign_id,
+            plateId = plate_id,
+            well = well,
+            wellEcho = well,
+            x = 488,
+            y = 684,
+            xEcho = 3.32,
+            yEcho = 1.87,
+            redesolveExportTime = None,
+            redesolveApplied = True,
+            soakStatus = "exported",
+            redesolveTransferVolume = 100,
+            redesolveName = "Redesolve Test",
+            redesolveBarcode = "RT98765",
+        )['inserted_id'] for well in ["A81a", "B81b"]]
+
+        try:
+            retrieved_data = self.client.remove_new_solvent_from_wells(added_well_ids)
+            printv(f"\n{json.dumps({well_id: result.to_dict() for well_id, result in retrieved_data.items()}, indent=4)}")
+
+            ### Assertions
+            self.assertIsNotNone(retrieved_data, "Result of remove_new_solvent_from_wells function is None.")
+            for well_id in added_well_ids:
+                self.assertEqual(retrieved_data[well_id].modified_count, 1, "The number of modified documents does not match.")
+
+            for well in self.client.get_wells_by_ids(added_well_ids)['documents']:
+                self.assertEqual(well["redesolveApplied"], False, "redesolveApplied does not match.")
+                self.assertIsNone(well["redesolveName"], "redesolveName is not None.")
+        finally:
+            self.client.delete_by_ids("wells", added_well_ids)
+    ### FETCH_TAG remove_new_solvent_from_wells
+
+    ### FETCH_TAG redesolve_in_new_solvent_many
+    def test_82_redesolve_in_new_solvent_many(self):
+        """
+        Integration test for redesolve_in_new_solvent_many with individual transfer volumes per well.
+        """
+        ### Initialize constants
+        user_account = "e14965"
+        campaign_id = "EP_SmarGon"
+        plate_id = "98765"
+        target_wells = ["A82a", "B82b"]
+
+        added_well_ids = [self.add_test_well(
+            userAccount = user_account,
+            campaignId = campaign_id,
+            plateId = plate_id,
+            well = well,
+            wellEcho = well,
+            x = 488,
+            y = 684,
+            xEcho = 3.32,
+            yEcho = 1.87,
+            redesolveExportTime = None,
+            redesolveApplied = False,
+        )['inserted_id'] for well in target_wells]
+
+        targets = [{
+            "target_plate": plate_id,
+            "target_well": target_well,
+            "redesolve_transfer_volume": 50 + index,
+            "redesolve_source_well": "C82c",
+            "redesolve_name": "Redesolve Test",
+            "redesolve_barcode": "RT98765",
+        } for index, target_well in enumerate(target_wells)]
+
+        try:
+            retrieved_data = self.client.redesolve_in_new_solvent_many(user_account, campaign_id, targets)
+            printv(f"\n{json.dumps([result.to_dict() for result in retrieved_data], indent=4)}")
+
+            ### Assertions
+            self.assertIsNotNone(retrieved_data, "Result of redesolve_in_new_solvent_many function is None.")
+            self.assertEqual([result.modified_count for result in retrieved_data], [1, 1], "Modified counts per well do not match.")
+
+            wells = self.client.get_wells_by_ids(added_well_ids)['documents']
+            self.assertEqual([well["redesolveTransferVolume"] for well in wells], [50, 51], "redesolveTransferVolume per well does not match.")
+            self.assertTrue(all(well["redesolveApplied"] and well["redesolveStatus"] == "pending" for well in wells), "Redesolve not applied to all wells.")
+        finally:
+            self.client.delete_by_ids("wells", added_well_ids)
+    ### FETCH_TAG redesolve_in_new_solvent_many
+
+    ### FETCH_TAG EchoTransferReportIngester
+    def test_83_echo_transfer_report_ingester(self):
+        """
+        Integration test for the EchoTransferReportIngester: a report with a completed and a skipped transfer is
+        uploaded in chunks of one well, and a second run with the same state file uploads nothing.
+        """
+        ### Initialize constants
+        user_account = "e14965"
+        campaign_id = "EP_SmarGon"
+        plate_id = "98765"
+
+        added_plate_id = self.add_test_plate(user_account, campaign_id, plate_id, batchId="987654")['inserted_id']
+        added_well_ids = [self.add_test_well(
+            userAccount = user_account,
+            campaignId = campaign_id,
+            plateId = plate_id,
+            well = well,
+            wellEcho = well,
+            x = 488,
+            y = 684,
+            xEcho = 3.32,
+            yEcho = 1.87,
+            soakStatus = "exported",
+        )['inserted_id'] for well in ["A83a", "B83b"]]
+
+        report = f"""<?xml version="1.0" encoding="UTF-8"?>
+<transfer date="2024-01-01">
+  <plateInfo>
+    <plate type="source" barcode="A98765" name="Source[1]"/>
+    <plate type="destination" barcode="{plate_id}" name="Destination[1]"/>
+  </plateInfo>
+  <printmap total="1">
+    <w n="A1" dn="A83a" vt="25" avt="25"/>
+  </printmap>
+  <skippedwells total="1">
+    <w n="A2" dn="B83b" vt="25" avt="0" reason="MM1234: Insufficient volume"/>
+  </skippedwells>
+</transfer>
+"""
+        with tempfile.TemporaryDirectory() as directory:
+            report_path = os.path.join(directory, "transfer_report.xml")
+            state_path = os.path.join(directory, "transfer_report.state")
+            with open(report_path, 'w') as file:
+                file.write(report)
+
+            progress = []
+            ingester = EchoTransferReportIngester(self.client, chunk_size=1, state_path=state_path,
+                                                  progress=lambda uploaded, read, total: progress.append(uploaded))
+            try:
+                retrieved_data = ingester.ingest(report_path)
+                printv(f"\n{json.dumps(retrieved_data, indent=4)}")
+
+                ### Assertions
+                self.assertEqual(retrieved_data, {"uploaded": 2, "skipped": 0, "chunks": 2, "completed": True}, "Summary does not match.")
+                self.assertEqual(progress, [1, 2], "Progress was not reported per chunk.")
+
+                wells = self.client.get_wells_by_ids(added_well_ids)['documents']
+                self.assertEqual([well["soakStatus"] for well in wells], ["done", "done"], "soakStatus does not match.")
+                self.assertEqual([well["soakTransferStatus"] for well in wells], ["OK", "MM1234: Insufficient volume"], "soakTransferStatus does not match.")
+
+                ### The state file records that the report was uploaded completely
+                retrieved_data = ingester.ingest(report_path)
+                self.assertEqual(retrieved_data, {"uploaded": 2, "skipped": 2, "chunks": 0, "completed": True}, "Report was uploaded again.")
+            finally:
+                self.client.delete_by_ids("wells", added_well_ids)
+                self.delete_by_id("plates", added_plate_id)
+    ### FETCH_TAG EchoTransferReportIngester
+
+    ### FETCH_TAG ShifterCsvIngester
+    def test_84_shifter_csv_ingester(self):
+        """
+        Integration test for the ShifterCsvIngester: a Shifter export with two fished wells and an invalid row is
+        uploaded in chunks of one row, and the invalid row is reported with its line number.
+        """
+        ### Initialize constants
+        user_account = "e14965"
+        campaign_id = "EP_SmarGon"
+        plate_id = "98765"
+
+        added_plate_id = self.add_test_plate(user_account, campaign_id, plate_id, batchId="987654")['inserted_id']
+        added_well_ids = [self.add_test_well(
+            userAccount = user_account,
+            campaignId = campaign_id,
+            plateId = plate_id,
+            well = well,
+            wellEcho = well,
+            x = 488,
+            y = 684,
+            xEcho = 3.32,
+            yEcho = 1.87,
+            soakStatus = "done",
+        )['inserted_id'] for well in ["A84a", "B84b"]]
+
+        export = (
+            "PlateType;PlateID;LocationShifter;PlateRow;PlateColumn;PositionSubWell;Comment;CrystalID;TimeArrival;TimeDeparture;PickDuration;DestinationName;DestinationLocation;Barcode;ExternalComment\n"
+            f"SwissCl;{plate_id};1;A;84;a;OK;crystal1;2023-08-03 12:30:15.000;2023-08-03 12:35:15.000;00:05:00;puck1;1;pin1;puckType1\n"
+            f"SwissCl;{plate_id};1;B;84;b;OK;crystal2;2023-08-03 12:36:15.000;2023-08-03 12:38:15.000;;puck1;2;pin2;puckType1\n"
+            f"SwissCl;;1;C;84;c;OK;crystal3;2023-08-03 12:40:15.000;2023-08-03 12:41:15.000;00:01:00;puck1;3;pin3;puckType1\n"
+        )
+        with tempfile.TemporaryDirectory() as directory:
+            export_path = os.path.join(directory, "shifter_export.csv")
+            with open(export_path, 'w') as file:
+                file.write(export)
+
+            progress = []
+            ingester = ShifterCsvIngester(self.client, chunk_size=1, progress=lambda rows, uploaded, failed: progress.append((rows, uploaded, failed)))
+            try:
+                retrieved_data = ingester.ingest(export_path)
+                printv(f"\n{json.dumps(retrieved_data, indent=4)}")
+
+                ### Assertions
+                self.assertEqual(retrieved_data['rows'], 3, "Number of parsed rows does not match.")
+                self.assertEqual(retrieved_data['uploaded'], 2, "Number of uploaded rows does not match.")
+                self.assertEqual(retrieved_data['chunks'], 2, "Number of chunks does not match.")
+                self.assertEqual([failure['row'] for failure in retrieved_data['failures']], [4], "Invalid row not reported.")
+                self.assertEqual(progress[-1], (3, 2, 1), "Progress does not match.")
+
+                wells = self.client.get_wells_by_ids(added_well_ids)['documents']
+                self.assertTrue(all(well['fished'] for well in wells), "Wells not marked as fished.")
+                self.assertEqual([well['shifterXtalId'] for well in wells], ["crystal1", "crystal2"], "shifterXtalId does not match.")
+            finally:
+                self.client.delete_by_ids("wells", added_well_ids)
+                self.delete_by_id("plates", added_plate_id)
+    ### FETCH_TAG ShifterCsvIngester
+
+    ### FETCH_TAG xtal_number_allocator
+    def test_85_xtal_number_allocator(self):
+        """
+        Integration test for the xtal number allocator: two allocators on the same plate, as on two fishing stations,
+        get disjoint numbers, and released numbers are handed out again.
+        """
+        ### Initialize constants
+        user_account = "e14965"
+        campaign_id = "EP_SmarGon"
+        plate_id = "98765"
+
+        added_plate_id = self.add_test_plate(user_account, campaign_id, plate_id, batchId="987654")['inserted_id']
+
+        try:
+            with self.client.xtal_number_allocator(block_size=3) as allocator_01, \
+                 self.client.xtal_number_allocator(block_size=3) as allocator_02:
+                numbers_01 = [allocator_01.next(plate_id) for _ in range(4)]
+                numbers_02 = [allocator_02.next(plate_id) for _ in range(2)]
+            printv(f"\n{numbers_01} {numbers_02}")
+
+            ### Assertions
+            self.assertNotIn(None, numbers_01 + numbers_02, "No xtal numbers could be reserved.")
+            self.assertEqual(numbers_01, sorted(numbers_01), "Numbers of one allocator are not increasing.")
+            self.assertEqual(len(set(numbers_01 + numbers_02)), 6, "Allocators handed out the same number.")
+
+            ### The unused numbers were released, so the next block starts at the lowest of them again
+            lease = self.client.reserve_xtal_numbers(plate_id, 1)
+            self.assertIsNotNone(lease, "Result of reserve_xtal_numbers function is None.")
+            self.assertNotIn(lease['numbers'][0], numbers_01 + numbers_02, "A taken number was reserved again.")
+            self.assertLess(lease['numbers'][0], max(numbers_01 + numbers_02), "Unused numbers were not released.")
+            self.client.release_xtal_numbers(plate_id, lease['lease_id'], lease['numbers'])
+        finally:
+            self.delete_by_id("plates", added_plate_id)
+    ### FETCH_TAG xtal_number_allocator
+
+    ### FETCH_TAG membership_index
+    def test_86_membership_index(self):
+        """
+        Integration test for the membership index: plate existence and fished crystals are answered like by the
+        server, and add_plate and update_shifter_fishing_result of the same client update the index.
+        """
+        ### Initialize constants
+        user_account = "e14965"
+        campaign_id = "EP_SmarGon"
+        plate_id = "98765"
+        plate_id_new = "98764"
+
+        added_plate_id = self.add_test_plate(user_account, campaign_id, plate_id, batchId="987654")['inserted_id']
+        added_well_ids = [self.add_test_well(
+            userAccount = user_account,
+            campaignId = campaign_id,
+            plateId = plate_id,
+            well = well,
+            wellEcho = well,
+            x = 488,
+            y = 684,
+            xEcho = 3.32,
+            yEcho = 1.87,
+            soakStatus = "done",
+            fished = fished,
+        )['inserted_id'] for well, fished in [("A86a", True), ("B86b", False)]]
+        added_plate_id_new = None
+
+        try:
+            index = self.client.membership_index(user_account, campaign_id, max_age=3600)
+
+            ### Assertions
+            self.assertTrue(index.is_plate_in_database(plate_id), "Test plate not in index.")
+            self.assertTrue(index.is_crystal_already_fished(plate_id, "A86a"), "Fished crystal not identified.")
+            self.assertFalse(index.is_crystal_already_fished(plate_id, "B86b"), "Unfished crystal identified as fished.")
+            self.assertEqual(index.is_plate_in_database(plate_id_new), self.client.is_plate_in_database(plate_id_new),
+                             "Unknown plate not answered like by the server.")
+
+            ### Own writes update the index
+            added_plate_id_new = self.add_test_plate(user_account, campaign_id, plate_id_new, batchId="987654")['inserted_id']
+            self.assertTrue(index.is_plate_in_database(plate_id_new), "Added plate not in index.")
+
+            well_shifter_data = {
+                'plateId': plate_id,
+                'plateRow': 'B',
+                'plateColumn': '86',
+                'plateSubwell': 'b',
+                'timeOfArrival': '2023-08-03 12:30:15.000',
+                'timeOfDeparture': '2023-08-03 12:35:15.000',
+                'duration': '0:05:00',
+                'comment': 'OK',
+                'xtalId': 'crystal1',
+                'destinationName': 'puck1',
+                'destinationLocation': '1',
+                'barcode': 'pin1',
+                'externalComment': 'puckType1'
+            }
+            self.client.update_shifter_fishing_result(well_shifter_data, 1, "xtal")
+            self.assertTrue(index.is_crystal_already_fished(plate_id, "B86b"), "Fished crystal not updated in index.")
+        finally:
+            self.client.delete_by_ids("wells", added_well_ids)
+            self.delete_by_id("plates", added_plate_id)
+            if added_plate_id_new is not None:
+                self.delete_by_id("plates", added_plate_id_new)
+    ### FETCH_TAG membership_index
+
+    ### FETCH_TAG_TEST find_users_from_plate_ids
+    def test_87_find_users_from_plate_ids(self):
+        """
+        Test Case for the memoized owners of plates.
+
+        Steps:
+        1. Add two test plates.
+        2. Resolve the owner of one of them with find_user_from_plate_id, which memoizes it.
+        3. Resolve both plates and an unknown plate with find_users_from_plate_ids.
+        4. Assert that the owners are correct and that a client using the same cache file resolves them without
+           sending a request.
+
+        Note:
+        The added test plates will be deleted after the test.
+        """
+        user_account = "e14965"
+        campaign_id = "EP_SmarGon"
+        owner = {"user": user_account, "campaign_id": campaign_id}
+
+        added_plate_ids = [
+            self.add_test_plate(user_account, campaign_id, plate_id)['inserted_id']
+            for plate_id in ["98765", "98764"]
+        ]
+
+        try:
+            with tempfile.TemporaryDirectory() as directory:
+                cache_path = os.path.join(directory, "plate_owners.json")
+                client = ffcsdbclient(Settings.BASE_URL, plate_owner_cache_path=cache_path)
+
+                retrieved_data = client.find_user_from_plate_id("98765")
+                self.assertEqual(retrieved_data['user'], user_account, "The user does not match.")
+                self.assertEqual(retrieved_data['campaign_id'], campaign_id, "The campaign_id does not match.")
+
+                owners = client.find_users_from_plate_ids(["98765", "98764", "00000"])
+                printv(f"\n{json.dumps(owners, indent=4)}")
+                self.assertIsNotNone(owners, "Result of find_users_from_plate_ids function is None.")
+                self.assertEqual(owners["98765"], owner, "The owner of plate 98765 does not match.")
+                self.assertEqual(owners["98764"], owner, "The owner of plate 98764 does not match.")
+                self.assertIsNone(owners["00000"], "An unknown plate has an owner.")
+                client.close()
+
+                ### A client with the same cache file resolves the owners without the server (an empty cassette
+                ### raises CassetteMiss for every request)
+                empty_cassette_path = os.path.join(directory, "empty.cassette")
+                recording_session(empty_cassette_path).close()
+                offline_client = ffcsdbclient(Settings.BASE_URL, session=replaying_session(empty_cassette_path),
+                                              plate_owner_cache_path=cache_path)
+                self.assertEqual(offline_client.find_users_from_plate_ids(["98765", "98764"]),
+                                 {"98765": owner, "98764": owner}, "The owners were not read from the cache file.")
+                self.assertEqual(offline_client.find_user_from_plate_id("98764"), owner, "The owner was not read from the cache file.")
+        finally:
+            self.client.delete_by_ids("plates", added_plate_ids)
+    ### FETCH_TAG_TEST find_users_from_plate_ids
+
+    ### FETCH_TAG_TEST import_library_chunked
+    def test_88_import_library_chunked(self):
+        """
+        Test Case for the chunked import of a library, interrupted and resumed.
+
+        Steps:
+        1. Import a library with fragments from an iterator that fails after the first chunk.
+        2. Import it again with all fragments, which resumes after the acknowledged chunk.
+        3. Assert that the result matches the libraryBarcode and that the library contains every fragment once.
+
+        Note:
+        The imported library will be deleted after the test.
+        """
+        test_library = {
+            "libraryName": "Test_Library_Heidi_A",
+            "libraryBarcode": ObjectId('64d4d1bea8f822476c37f97a'),
+        }
+        fragments = [
+            {
+                "compoundCode": f"C88{index}",
+                "smiles": "C1CCOC1",
+                "well": f"A{index + 1}",
+                "used": False,
+                "libraryConcentration": "0.8"
+            }
+            for index in range(5)
+        ]
+
+        def interrupted_fragments():
+            yield from fragments[:3]
+            raise RuntimeError("Interrupted")
+
+        try:
+            with self.assertRaises(RuntimeError):
+                self.client.import_library_chunked(test_library, interrupted_fragments(), chunk_size=2)
+
+            received = []
+            retrieved_data = self.client.import_library_chunked(test_library, iter(fragments), chunk_size=2, progress=received.append)
+            printv(f"\n{received}")
+
+            self.assertIsInstance(retrieved_data, MockInsertOneResult, "Result of import_library_chunked function is not a MockInsertOneResult.")
+            self.assertTrue(retrieved_data.acknowledged, "The import was not acknowledged.")
+            self.assertEqual(str(retrieved_data.inserted_id), str(test_library['libraryBarcode']), "Expected the returned id to match the libraryBarcode.")
+            self.assertEqual(received, [4, 5], "The import did not resume after the acknowledged chunk.")
+
+            retrieved_data_imported_library = self.convert_objectid_to_str(self.client.get_one_library(str(test_library['libraryBarcode'])))
+            printv(f"\n{json.dumps(retrieved_data_imported_library, indent=4)}")
+            self.assertLibraryData(retrieved_data_imported_library, {**test_library, "fragments": fragments})
+        finally:
+            self.delete_by_id("libraries", str(test_library['libraryBarcode']))
+    ### FETCH_TAG_TEST import_library_chunked
+
+    ### FETCH_TAG_TEST SmilesPreprocessor
+    def test_89_smiles_preprocessor(self):
+        """
+        Test Case for the canonicalization and validation of library SMILES across a process pool.
+
+        Steps:
+        1. Preprocess a library with valid, unparsable and empty SMILES in chunks of two on two processes.
+        2. Assert that the valid fragments keep their order and have their canonical SMILES and InChIKey attached.
+        3. Assert that the invalid fragments are reported with their row numbers.
+        """
+        test_library = {
+            "libraryName": "Test_Library_Heidi_A",
+            "libraryBarcode": "64d4d1bea8f822476c37f97a",
+            "fragments": [
+                {"compoundCode": "C891", "smiles": "OCC", "well": "A1", "used": False},
+                {"compoundCode": "C892", "smiles": "C1CC", "well": "A2", "used": False},
+                {"compoundCode": "C893", "smiles": "C1CCOC1", "well": "A3", "used": False},
+                {"compoundCode": "C894", "smiles": "", "well": "A4", "used": False},
+                {"compoundCode": "C895", "smiles": "c1ccccc1", "well": "A5", "used": False},
+            ]
+        }
+
+        summary = SmilesPreprocessor(processes=2, chunk_size=2).preprocess_library(test_library)
+        printv(f"\n{json.dumps(summary, indent=4)}")
+
+        fragments = summary["library"]["fragments"]
+        self.assertEqual([fragment["compoundCode"] for fragment in fragments], ["C891", "C893", "C895"], "Unexpected valid fragments.")
+        self.assertEqual(fragments[0]["canonicalSmiles"], "CCO", "Unexpected canonical SMILES.")
+        self.assertEqual(fragments[0]["inchiKey"], "LFQSCWFLJHTTHZ-UHFFFAOYSA-N", "Unexpected InChIKey.")
+        self.assertEqual(fragments[0]["smiles"], "OCC", "The original SMILES was changed.")
+        for fragment in fragments:
+            self.assertEqual(fragment["canonicalSmiles"], Chem.MolToSmiles(Chem.MolFromSmiles(fragment["smiles"])), "Unexpected canonical SMILES.")
+
+        self.assertEqual([(failure["row"], failure["compoundCode"]) for failure in summary["failures"]],
+                         [(2, "C892"), (4, "C894")], "Unexpected failures.")
+        self.assertEqual(len(test_library["fragments"]), 5, "The input library was modified.")
+    ### FETCH_TAG_TEST SmilesPreprocessor
+
+    ### FETCH_TAG_TEST fingerprint_index
+    def test_90_fingerprint_index(self):
+        """
+        Test Case for the fingerprint index over imported libraries.
+
+        Steps:
+        1. Create a fingerprint index and import a library through the same client, which adds it to the index
+           in the background.
+        2. Add a well that received one of the compounds.
+        3. Assert the Tanimoto top-k and substructure search and the mapping of the hits to the well.
+        4. Assert that the index is loaded from its file.
+
+        Note:
+        The imported library and the added well will be deleted after the test.
+        """
+        user_account = "e14965"
+        campaign_id = "EP_SmarGon"
+        test_library = {
+            "libraryName": "Test_Library_Heidi_A",
+            "libraryBarcode": ObjectId('64d4d1bea8f822476c37f97a'),
+            "fragments": [
+                {"compoundCode": "C901", "smiles": "Oc1ccccc1", "well": "A1", "used": False},
+                {"compoundCode": "C902", "smiles": "OCCc1ccccc1", "well": "A2", "used": False},
+                {"compoundCode": "C903", "smiles": "C1CCOC1", "well": "A3", "used": False},
+            ]
+        }
+        library_id = str(test_library['libraryBarcode'])
+
+        with tempfile.TemporaryDirectory() as directory:
+            index_path = os.path.join(directory, "fragments.npz")
+            index = self.client.fingerprint_index(path=index_path)
+            added_well_id = None
+
+            try:
+                self.client.import_library(test_library)
+                index.wait()
+                added_well_id = self.add_test_well(
+                    userAccount=user_account, campaignId=campaign_id, plateId="98765", well="A90a",
+                    libraryBarcode=library_id, compoundCode="C902", smiles="OCCc1ccccc1",
+                )['inserted_id']
+
+                hits = [hit for hit in index.similar("Oc1ccccc1", k=3) if hit["libraryBarcode"] == library_id]
+                printv(f"\n{json.dumps(hits, indent=4)}")
+                self.assertEqual(hits[0]["compoundCode"], "C901", "The most similar compound is not the query itself.")
+                self.assertAlmostEqual(hits[0]["similarity"], 1.0, msg="The query is not identical to itself.")
+
+                hits = [hit for hit in index.substructure("c1ccccc1") if hit["libraryBarcode"] == library_id]
+                self.assertEqual(sorted(hit["compoundCode"] for hit in hits), ["C901", "C902"], "Unexpected substructure hits.")
+
+                hits = index.wells_for_hits(user_account, campaign_id, hits)
+                wells = {hit["compoundCode"]: [well["well"] for well in hit["wells"]] for hit in hits}
+                self.assertEqual(wells, {"C901": [], "C902": ["A90a"]}, "The hits were not mapped to the well.")
+
+                reloaded_index = FingerprintIndex(path=index_path)
+                self.assertEqual(len(reloaded_index), len(index), "The index was not saved.")
+                self.assertEqual(reloaded_index.similar("C1CCOC1", k=1)[0]["compoundCode"], "C903", "The saved index differs.")
+            finally:
+                self.delete_by_id("libraries", library_id)
+                if added_well_id is not None:
+                    self.delete_by_id("wells", added_well_id)
+    ### FETCH_TAG_TEST fingerprint_index
+
+    ### FETCH_TAG_TEST get_smiles_for_xtals
+    def test_91_get_smiles_for_xtals(self):
+        """
+        Test Case for retrieving the SMILES strings of several crystals at once.
+
+        Steps:
+        1. Add two test wells with SMILES and crystal names.
+        2. Retrieve their SMILES and the SMILES of an unknown crystal with get_smiles_for_xtals.
+        3. Assert that the mapping matches get_smiles and that a second call is served from the cache.
+
+        Note:
+        The added test wells will be deleted after the test.
+        """
+        user_account = "e14965"
+        campaign_id = "EP_SmarGon"
+        plate_id = "98765"
+        smiles = {"xtal-91a": "C(C(=O)O)N", "xtal-91b": "C1CCOC1"}
+
+        added_well_ids = [
+            self.add_test_well(
+                userAccount=user_account,
+                campaignId=campaign_id,
+                plateId=plate_id,
+                smiles=xtal_smiles,
+                xtalName=xtal_name,
+                well=well,
+                wellEcho=well,
+            )['inserted_id']
+            for (xtal_name, xtal_smiles), well in zip(smiles.items(), ["A91a", "B91a"])
+        ]
+
+        try:
+            client = ffcsdbclient(Settings.BASE_URL)
+            retrieved_data = client.get_smiles_for_xtals(user_account, campaign_id, ["xtal-91a", "xtal-91b", "xtal-91c"])
+            printv(f"\n{json.dumps(retrieved_data, indent=4)}")
+
+            self.assertIsNotNone(retrieved_data, "Result of get_smiles_for_xtals function is None.")
+            self.assertEqual(retrieved_data, {**smiles, "xtal-91c": None}, "The retrieved SMILES strings do not match.")
+            for xtal_name, xtal_smiles in smiles.items():
+                self.assertEqual(self.client.get_smiles(user_account, campaign_id, xtal_name), xtal_smiles, "get_smiles differs.")
+
+            ### The known crystals are cached and no longer need the server (an empty cassette raises
+            ### CassetteMiss for every request)
+            with tempfile.TemporaryDirectory() as directory:
+                empty_cassette_path = os.path.join(directory, "empty.cassette")
+                recording_session(empty_cassette_path).close()
+                client.session = replaying_session(empty_cassette_path)
+                self.assertEqual(client.get_smiles_for_xtals(user_account, campaign_id, list(smiles)), smiles,
+                                 "The SMILES strings were not cached.")
+        finally:
+            self.client.delete_by_ids("wells", added_well_ids)
+    ### FETCH_TAG_TEST get_smiles_for_xtals
+
+    ### FETCH_TAG_TEST depiction_cache
+    def test_92_depiction_cache(self):
+        """
+        Test Case for the on-disk cache of compound depictions.
+
+        Steps:
+        1. Render a compound as SVG and PNG and render it again from a different SMILES of the same compound.
+        2. Import a library through a client with a depiction cache and wait for its pre-rendering.
+        3. Assert that the depictions are shared by canonical SMILES and that the library was pre-rendered.
+
+        Note:
+        The imported library will be deleted after the test.
+        """
+        test_library = {
+            "libraryName": "Test_Library_Heidi_A",
+            "libraryBarcode": ObjectId('64d4d1bea8f822476c37f97a'),
+            "fragments": [
+                {"compoundCode": "C921", "smiles": "C(C(C(=O)O)c1ccccc1)c2ccccc2", "well": "A1", "used": False},
+                {"compoundCode": "C922", "smiles": "C1CCOC1", "well": "A2", "used": False},
+            ]
+        }
+
+        with tempfile.TemporaryDirectory() as directory:
+            depictions = self.client.depiction_cache(directory, processes=2)
+
+            svg = depictions.get("OCC", size=(300, 300), fmt="svg")
+            self.assertIn(b"<svg", svg, "The depiction is not an SVG.")
+            self.assertEqual(depictions.get("CCO", size=(300, 300), fmt="svg"), svg, "The depiction is not shared by canonical SMILES.")
+            self.assertEqual(depictions.path("OCC", fmt="svg"), depictions.path("CCO", fmt="svg"), "The depiction is not shared by canonical SMILES.")
+            with open(depictions.path("OCC", size=(200, 200), fmt="png"), 'rb') as file:
+                self.assertEqual(file.read(8), b"\x89PNG\r\n\x1a\n", "The depiction is not a PNG.")
+            with self.assertRaises(ValueError):
+                depictions.get("C1CC")
+
+            try:
+                self.client.import_library(test_library)
+                depictions.wait()
+
+                ### Nothing is left to render if the import pre-rendered all fragments; path would render missing ones
+                self.assertEqual(depictions.prerender_library(test_library)["rendered"], 0, "The library was not pre-rendered.")
+                for fragment in test_library["fragments"]:
+                    self.assertTrue(os.path.exists(depictions.path(fragment["smiles"], (300, 300), "svg")),
+                                    f"The depiction of {fragment['compoundCode']} is missing.")
+            finally:
+                self.delete_by_id("libraries", str(test_library['libraryBarcode']))
+    ### FETCH_TAG_TEST depiction_cache
+
+    ### FETCH_TAG_TEST EchoPickList
+    def test_93_echo_pick_list(self):
+        """
+        Test Case for the Echo pick list of cryoprotected wells.
+
+        Steps:
+        1. Add a test plate with three cryoprotected wells, one of them with an invalid volume, and one well
+           without cryo.
+        2. Build the cryo pick list of the plate and write it to a CSV file.
+        3. Assert that the transfers are sorted by source well, that the invalid well is reported and that the
+           file contains the transfers.
+
+        Note:
+        The added test plate and wells will be deleted after the test.
+        """
+        user_account = "e14965"
+        campaign_id = "EP_SmarGon"
+        plate_id = "98765"
+
+        added_plate_id = self.add_test_plate(user_account, campaign_id, plate_id)['inserted_id']
+        wells = [
+            ("A93a", "A1", "B2", 25.0, True),
+            ("B93a", "B1", "A10", 50.0, True),
+            ("C93a", "C1", "A2", 26.0, True),
+            ("D93a", "D1", None, None, False),
+        ]
+        added_well_ids = [
+            self.add_test_well(
+                userAccount=user_account, campaignId=campaign_id, plateId=plate_id, well=well, wellEcho=well_echo,
+                x=100, y=100, xEcho=1.5, yEcho=-2.0, cryoProtection=cryo, cryoName="Cryo Test" if cryo else None,
+                cryoBarcode="CB98765" if cryo else None, cryoSourceWell=source_well, cryoTransferVolume=volume,
+            )['inserted_id']
+            for well, well_echo, source_well, volume, cryo in wells
+        ]
+
+        try:
+            pick_list = EchoPickList.from_plates(self.client, user_account, campaign_id, [plate_id], kind="cryo")
+            printv(f"\n{list(pick_list.rows())}\n{pick_list.errors}")
+
+            self.assertEqual(len(pick_list), 2, "Unexpected number of transfers.")
+            self.assertEqual([error["well"] for error in pick_list.errors], ["C93a"], "The invalid volume was not reported.")
+            self.assertEqual(list(pick_list.rows()), [
+                ["Cryo Test", "CB98765", "A10", plate_id, plate_id, "B1", "50", "1.5", "-2"],
+                ["Cryo Test", "CB98765", "B2", plate_id, plate_id, "A1", "25", "1.5", "-2"],
+            ], "The transfers are not sorted by source well.")
+
+            with tempfile.TemporaryDirectory() as directory:
+                paths = pick_list.write_per_plate(directory)
+                self.assertEqual(list(paths), [plate_id], "Unexpected pick list files.")
+                with open(paths[plate_id], newline='') as file:
+                    rows = list(csv.reader(file))
+                self.assertEqual(rows[0], HEADER, "Unexpected header of the pick list.")
+                self.assertEqual(rows[1:], list(pick_list.rows()), "The file does not contain the transfers.")
+        finally:
+            self.client.delete_by_ids("wells", added_well_ids)
+            self.delete_by_id("plates", added_plate_id)
+    ### FETCH_TAG_TEST EchoPickList
+
+    ### FETCH_TAG_TEST load_test
+    def test_94_load_test_export_to_soak(self):
+        """
+        Test Case for the export_to_soak step of the load generator.
+
+        Steps:
+        1. Set up a virtual user of ffcs_db_client_load_test with its test plate and wells.
+        2. Run its export_to_soak step.
+        3. Assert that no error was recorded and that the soak export time of the plate was set.
+
+        Note:
+        The test plate, wells and campaign library of the virtual user will be deleted after the test.
+        """
+        recorder = LatencyRecorder()
+        user = VirtualUser(self.client, recorder, "98765", 2)
+
+        try:
+            user.setup()
+            user.export_to_soak()
+            printv(f"\n{recorder.latencies}\n{recorder.errors}")
+
+            self.assertEqual(len(recorder.latencies.get("export_to_soak", [])), 1, "export_to_soak was not recorded.")
+            self.assertEqual(recorder.errors.get("export_to_soak", 0), 0, "export_to_soak failed.")
+
+            plate = self.convert_objectid_to_str(self.client.get_plate(TEST_USER_ACCOUNT, TEST_CAMPAIGN_ID, "98765"))
+            printv(f"{json.dumps(plate, indent=4)}")
+            self.assertEqual(plate["soakStatus"], "exported", "soakStatus of plate does not match.")
+            self.assertIsNotNone(plate.get("soakExportTime"), "soakExportTime of plate was not set.")
+        finally:
+            user.teardown()
+    ### FETCH_TAG_TEST load_test
+
+    ### FETCH_TAG_TEST subscribe_notifications_malformed
+    def test_95_subscribe_notifications_malformed_event(self):
+        """
+        Test Case for a malformed server-sent event in a notification subscription.
+
+        Steps:
+        1. Serve a notification stream with an event that is not valid JSON and an event with an invalid _id
+           between two valid notifications.
+        2. Subscribe to it.
+        3. Assert that both valid notifications are delivered and the subscription keeps running.
+        """
+        first_id, second_id = str(ObjectId()), str(ObjectId())
+        stream = "\n".join([
+            f'data: {{"_id": "{first_id}", "timestamp": "2024-01-01T00:00:01", "type": "test_notification"}}', "",
+            'data: {"_id": "not-an-object-id", "timestamp": "2024-01-01T00:00:02"}', "",
+            'data: {"_id": ', "",
+            f'data: {{"_id": "{second_id}", "timestamp": "2024-01-01T00:00:03", "type": "test_notification"}}', "", "",
+        ]).encode('utf-8')
+
+        class EventStreamAdapter(HTTPAdapter):
+            def send(self, request, **kwargs):
+                response = build_response(request, 200, {"Content-Type": "text/event-stream"}, b"", connection=self)
+                response.raw = io.BytesIO(stream)  ### Read line by line like a streamed response
+                response._content = False
+                return response
+
+        session = requests.Session()
+        session.mount('http://', EventStreamAdapter())
+        session.mount('https://', EventStreamAdapter())
+        client = ffcsdbclient(Settings.BASE_URL, session=session)
+
+        received = []
+        delivered = threading.Event()
+
+        def callback(notification):
+            received.append(notification)
+            if len(received) == 2:
+                delivered.set()
+
+        subscription = client.subscribe_notifications("e14965", "EP_SmarGon", callback, timestamp="2024-01-01T00:00:00")
+        try:
+            self.assertTrue(delivered.wait(10), "The valid notifications were not delivered.")
+            self.assertTrue(subscription.alive, "The subscription stopped after a malformed event.")
+            self.assertEqual([str(notification["_id"]) for notification in received], [first_id, second_id],
+                             "Unexpected notifications delivered.")
+            self.assertEqual(subscription.mode, "push", "The subscription fell back to polling.")
+        finally:
+            subscription.close()
+            client.close()
+    ### FETCH_TAG_TEST subscribe_notifications_malformed
+
     ### FETCH_TAG_TEST test_dummy_01
     def test_dummy_01(self):
         printv("test_dummy_01")
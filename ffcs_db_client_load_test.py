@@ -0,0 +1,281 @@
+### Standard Libraries
+import argparse
+import json
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+# Your Libraries
+from ffcsdbclient import ffcsdbclient, Settings
+
+### Load generator for ffcs_db_server
+###
+### Replays scripted GUI/beamline sessions with N concurrent virtual users through the ffcsdbclient
+### methods and reports per-endpoint throughput, p50/p99 latency and error rates as JSON.
+###
+###     python ffcs_db_client_load_test.py --users 20 --duration 120 --session gui --report run_a.json
+###     python ffcs_db_client_load_test.py --compare run_a.json run_b.json
+###
+### Every virtual user works on its own test plate (plate ids counting up from --plate-id-base) with
+### test wells and a test campaign library, which are removed again with delete_many at the end.
+
+TEST_USER_ACCOUNT = "e14965"
+TEST_CAMPAIGN_ID = "EP_SmarGon"
+TEST_LIBRARY_NAME = "Test_Library_Load"
+
+def parse_args():
+    """
+    Parse command line arguments for the script.
+    """
+    parser = argparse.ArgumentParser(description="Replay GUI/beamline sessions against ffcs_db_server.")
+    parser.add_argument('--base-url', default=Settings.BASE_URL, help='Base URL of ffcs_db_server.')
+    parser.add_argument('--users', type=int, default=10, help='Number of concurrent virtual users.')
+    parser.add_argument('--duration', type=float, default=60.0, help='Duration of the run in seconds.')
+    parser.add_argument('--session', default='gui', help='Name of a built-in session or JSON file with a list of steps.')
+    parser.add_argument('--wells-per-plate', type=int, default=24, help='Number of test wells per virtual user.')
+    parser.add_argument('--plate-id-base', type=int, default=98700, help='First plate id used for test plates.')
+    parser.add_argument('--report', default=None, help='Write the JSON report to this file.')
+    parser.add_argument('--compare', nargs=2, metavar=('BASELINE', 'CANDIDATE'), help='Compare two JSON reports.')
+    return parser.parse_args()
+
+class LatencyRecorder:
+    """
+    Thread-safe collection of latencies and errors per endpoint.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies: Dict[str, List[float]] = {}
+        self.errors: Dict[str, int] = {}
+
+    def timed(self, endpoint: str, func: Callable, *args, **kwargs) -> Any:
+        """
+        Calls func and records its latency under endpoint. Exceptions and None results count as errors,
+        since most ffcsdbclient methods return None when a request fails.
+        """
+        start = time.perf_counter()
+        try:
+            result = func(*args, **kwargs)
+            failed = result is None
+        except Exception as e:
+            print(f"{endpoint} failed: {e}")
+            result = None
+            failed = True
+        elapsed = time.perf_counter() - start
+
+        with self.lock:
+            self.latencies.setdefault(endpoint, []).append(elapsed)
+            if failed:
+                self.errors[endpoint] = self.errors.get(endpoint, 0) + 1
+        return result
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """
+    Nearest-rank percentile of an already sorted list.
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+class VirtualUser:
+    """
+    One simulated GUI or beamline client with its own test plate, wells and campaign library.
+    """
+
+    def __init__(self, client: ffcsdbclient, recorder: LatencyRecorder, plate_id: str, wells_per_plate: int):
+        self.client = client
+        self.recorder = recorder
+        self.plate_id = plate_id
+        self.wells_per_plate = wells_per_plate
+        self.well_ids: List[str] = []
+        self.library: Optional[dict] = None
+        self.library_id: Optional[str] = None
+        self.fragments: List[dict] = []
+        self.notification_timestamp = datetime.utcnow().isoformat()
+
+    def setup(self):
+        ### Test data is created without recording, only the session steps are measured
+        plate = {"userAccount": TEST_USER_ACCOUNT, "campaignId": TEST_CAMPAIGN_ID, "plateId": self.plate_id, "dropVolume": 0.05}
+        self.client.add_plate(plate)
+        for index in range(self.wells_per_plate):
+            well = {
+                "userAccount": TEST_USER_ACCOUNT,
+                "campaignId": TEST_CAMPAIGN_ID,
+                "plateId": self.plate_id,
+                "well": f"A{index + 1}a",
+                "wellEcho": f"A{index + 1}a",
+                "x": 488, "y": 684, "xEcho": 3.32, "yEcho": 1.87,
+            }
+            self.well_ids.append(str(self.client.add_well(well).inserted_id))
+
+        campaign_library = {
+            "userAccount": TEST_USER_ACCOUNT,
+            "campaignId": TEST_CAMPAIGN_ID,
+            "libraryName": TEST_LIBRARY_NAME,
+            "libraryBarcode": f"L{self.plate_id}",
+            "fragments": [{"compoundCode": f"C{index:03d}", "smiles": "c1ccccc1", "well": f"A{index + 1}", "used": False}
+                          for index in range(self.wells_per_plate)],
+        }
+        self.library_id = str(self.client.insert_campaign_library(campaign_library).inserted_id)
+        self.library = {"_id": self.library_id, "libraryName": TEST_LIBRARY_NAME, "libraryBarcode": campaign_library["libraryBarcode"]}
+        self.fragments = campaign_library["fragments"]
+
+    def teardown(self):
+        self.client.delete_many([
+            ("wells", {"userAccount": TEST_USER_ACCOUNT, "campaignId": TEST_CAMPAIGN_ID, "plateId": self.plate_id}),
+            ("plates", {"userAccount": TEST_USER_ACCOUNT, "campaignId": TEST_CAMPAIGN_ID, "plateId": self.plate_id}),
+            ("campaign_libraries", [self.library_id] if self.library_id else []),
+        ])
+
+    ### Session steps
+
+    def open_campaign(self):
+        self.recorder.timed("get_campaigns", self.client.get_campaigns, TEST_USER_ACCOUNT)
+        self.recorder.timed("get_plates", self.client.get_plates, TEST_USER_ACCOUNT, TEST_CAMPAIGN_ID)
+        self.recorder.timed("get_campaign_libraries", self.client.get_campaign_libraries, TEST_USER_ACCOUNT, TEST_CAMPAIGN_ID)
+
+    def get_all_wells(self):
+        self.recorder.timed("get_all_wells", self.client.get_all_wells, TEST_USER_ACCOUNT, TEST_CAMPAIGN_ID)
+
+    def get_wells_from_plate(self):
+        self.recorder.timed("get_wells_from_plate", self.client.get_wells_from_plate, TEST_USER_ACCOUNT, TEST_CAMPAIGN_ID, self.plate_id)
+
+    def add_fragments_to_plate(self):
+        for well_id, fragment in zip(self.well_ids, self.fragments):
+            self.recorder.timed("add_fragment_to_well", self.client.add_fragment_to_well,
+                                dict(self.library), well_id, fragment, 1.5, 0.5, 1.0)
+
+    def add_fragments_to_plate_bulk(self):
+        assignments = [{"well_id": well_id, "fragment": fragment, "solvent_volume": 1.5,
+                        "ligand_transfer_volume": 0.5, "ligand_concentration": 1.0}
+                       for well_id, fragment in zip(self.well_ids, self.fragments)]
+        self.recorder.timed("add_fragments_to_wells", self.client.add_fragments_to_wells, self.library, assignments)
+
+    def export_to_soak(self):
+        self.recorder.timed("export_to_soak", self.client.export_to_soak,
+                            [{'_id': self.plate_id, 'soak_time': datetime.now()}])
+
+    def poll_notifications(self):
+        for _ in range(3):
+            self.recorder.timed("get_notifications", self.client.get_notifications,
+                                TEST_USER_ACCOUNT, TEST_CAMPAIGN_ID, self.notification_timestamp)
+            time.sleep(0.5)
+
+    def get_fishing_status(self):
+        self.recorder.timed("get_all_fished_wells", self.client.get_all_fished_wells, TEST_USER_ACCOUNT, TEST_CAMPAIGN_ID)
+        self.recorder.timed("get_number_of_unsoaked_wells", self.client.get_number_of_unsoaked_wells, TEST_USER_ACCOUNT, TEST_CAMPAIGN_ID)
+
+    def run(self, steps: List[str], deadline: float):
+        while time.monotonic() < deadline:
+            for step in steps:
+                getattr(self, step)()
+                if time.monotonic() >= deadline:
+                    break
+
+### Built-in sessions, each a list of VirtualUser step names
+SESSIONS = {
+    "gui": ["open_campaign", "get_all_wells", "get_wells_from_plate", "add_fragments_to_plate",
+            "export_to_soak", "poll_notifications"],
+    "beamline": ["get_fishing_status", "poll_notifications", "get_all_wells"],
+}
+
+def load_session(name: str) -> List[str]:
+    if name in SESSIONS:
+        return SESSIONS[name]
+    with open(name, 'r') as file:
+        steps = json.load(file)
+    unknown = [step for step in steps if not callable(getattr(VirtualUser, step, None))]
+    if unknown:
+        raise ValueError(f"Unknown session steps: {unknown}")
+    return steps
+
+def build_report(recorder: LatencyRecorder, elapsed: float, args) -> dict:
+    endpoints = {}
+    for endpoint, latencies in sorted(recorder.latencies.items()):
+        latencies = sorted(latencies)
+        errors = recorder.errors.get(endpoint, 0)
+        endpoints[endpoint] = {
+            "calls": len(latencies),
+            "errors": errors,
+            "error_rate": errors / len(latencies),
+            "throughput_per_s": len(latencies) / elapsed,
+            "p50_ms": percentile(latencies, 0.50) * 1000,
+            "p99_ms": percentile(latencies, 0.99) * 1000,
+            "mean_ms": sum(latencies) / len(latencies) * 1000,
+        }
+    return {
+        "base_url": args.base_url,
+        "session": args.session,
+        "users": args.users,
+        "duration_s": elapsed,
+        "started": datetime.now().isoformat(),
+        "endpoints": endpoints,
+    }
+
+def run_load(args) -> dict:
+    steps = load_session(args.session)
+    recorder = LatencyRecorder()
+    users = [VirtualUser(ffcsdbclient(args.base_url), recorder, str(args.plate_id_base + index), args.wells_per_plate)
+             for index in range(args.users)]
+
+    with ThreadPoolExecutor(max_workers=args.users) as executor:
+        list(executor.map(lambda user: user.setup(), users))
+        try:
+            start = time.monotonic()
+            deadline = start + args.duration
+            list(executor.map(lambda user: user.run(steps, deadline), users))
+            elapsed = time.monotonic() - start
+        finally:
+            list(executor.map(lambda user: user.teardown(), users))
+
+    return build_report(recorder, elapsed, args)
+
+def print_report(report: dict):
+    print(f"{report['users']} users, session '{report['session']}', {report['duration_s']:.1f} s against {report['base_url']}")
+    print(f"{'endpoint':40s}{'calls':>8s}{'req/s':>10s}{'p50 ms':>10s}{'p99 ms':>10s}{'errors':>8s}")
+    for endpoint, stats in report["endpoints"].items():
+        print(f"{endpoint:40s}{stats['calls']:8d}{stats['throughput_per_s']:10.1f}"
+              f"{stats['p50_ms']:10.1f}{stats['p99_ms']:10.1f}{stats['error_rate']:8.1%}")
+
+def compare_reports(baseline_path: str, candidate_path: str):
+    """
+    Prints the relative change of throughput and latencies per endpoint between two reports.
+    """
+    with open(baseline_path, 'r') as file:
+        baseline = json.load(file)
+    with open(candidate_path, 'r') as file:
+        candidate = json.load(file)
+
+    def change(old, new):
+        return f"{(new - old) / old:+.1%}" if old else "n/a"
+
+    print(f"{'endpoint':40s}{'req/s':>10s}{'p50':>10s}{'p99':>10s}{'errors':>16s}")
+    for endpoint in sorted(set(baseline["endpoints"]) | set(candidate["endpoints"])):
+        old = baseline["endpoints"].get(endpoint)
+        new = candidate["endpoints"].get(endpoint)
+        if old is None or new is None:
+            print(f"{endpoint:40s}{'only in ' + ('candidate' if old is None else 'baseline'):>46s}")
+            continue
+        print(f"{endpoint:40s}{change(old['throughput_per_s'], new['throughput_per_s']):>10s}"
+              f"{change(old['p50_ms'], new['p50_ms']):>10s}{change(old['p99_ms'], new['p99_ms']):>10s}"
+              f"{old['error_rate']:>8.1%}{new['error_rate']:>8.1%}")
+
+def main():
+    args = parse_args()
+
+    if args.compare:
+        compare_reports(*args.compare)
+        return
+
+    report = run_load(args)
+    print_report(report)
+    if args.report:
+        with open(args.report, 'w') as file:
+            json.dump(report, file, indent=4)
+
+if __name__ == "__main__":
+    main()
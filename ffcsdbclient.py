@@ -1,15 +1,28 @@
 # Standard Libraries
+from concurrent.futures import Future
+import copy
 from datetime import datetime
+import functools
 import json
 import random
 import re
 import os
 import string
-from typing import List, Optional, Dict, Union, Any
+import threading
+import time
+import weakref
+from typing import Callable, Iterable, List, Optional, Dict, Union, Any
+from urllib.parse import urlparse
 
 # Third-Party Libraries
 from bson import ObjectId
+from bson.errors import InvalidId
 import requests
+from requests.adapters import BaseAdapter
+
+# Your Libraries
+from HttpCassette import build_response
+from LocalReplica import CampaignReplica
 
 ################################
 # NOTE: If changes are made to location or port of database or database name, they also needs to be incorporated
@@ -198,13 +211,651 @@ def convert_objects_to_serializable(data):
     return convert_recursive(data)
 
 
+def convert_datetime_strings(items: List[dict], datetime_fields: List[str]) -> List[dict]:
+    """
+    Converts the ISO datetime strings (with or without microseconds) of the given fields to datetime objects.
+    """
+    for item in items:
+        for field in datetime_fields:
+            if field in item and isinstance(item[field], str):
+                dt_str = item[field]
+                if '.' in dt_str:
+                    item[field] = datetime.strptime(dt_str, "%Y-%m-%dT%H:%M:%S.%f")
+                else:
+                    item[field] = datetime.strptime(dt_str, "%Y-%m-%dT%H:%M:%S")
+    return items
+
+
+def merge_documents(documents: List[dict], changed: List[dict], deleted: List[str]) -> List[dict]:
+    """
+    Merges changed and deleted documents from a delta sync into a list of documents, in place.
+
+    Changed documents replace the document with the same _id or are appended; deleted documents are removed.
+    """
+    deleted = {str(doc_id) for doc_id in deleted}
+    changed_by_id = {str(doc["_id"]): doc for doc in changed}
+
+    merged = []
+    for doc in documents:
+        doc_id = str(doc["_id"])
+        if doc_id in deleted:
+            continue
+        merged.append(changed_by_id.pop(doc_id, doc))
+    merged.extend(changed_by_id.values())
+
+    documents[:] = merged
+    return documents
+
+
+class _Flight:
+    """
+    An in-flight call of a single_flight method, shared by all callers with identical arguments.
+    """
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.followers = 0
+        self.result = None
+        self.error = None
+
+
+def single_flight(method):
+    """
+    Decorator for read methods of ffcsdbclient: concurrent calls with identical arguments share one request.
+
+    The first caller (the leader) sends the request; callers arriving while it is in flight wait for its result
+    and count as coalesced hits in the client metrics. Every caller receives its own deep copy of the converted
+    result, so that mutating it does not affect the others. Calls with unhashable arguments are not coalesced.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        key = (method.__name__, args, tuple(sorted(kwargs.items())))
+        try:
+            hash(key)
+        except TypeError:
+            return method(self, *args, **kwargs)
+
+        with self._flight_lock:
+            flight = self._in_flight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._in_flight[key] = _Flight()
+            else:
+                flight.followers += 1
+                self.metrics["coalesced_hits"] += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return copy.deepcopy(flight.result)
+
+        try:
+            flight.result = method(self, *args, **kwargs)
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._flight_lock:
+                del self._in_flight[key]
+                followers = flight.followers
+            flight.done.set()
+
+        ### Without followers the result is not shared and needs no copy
+        return copy.deepcopy(flight.result) if followers else flight.result
+    return wrapper
+
+
+class NotificationSubscription:
+    """
+    Background subscription to the notifications of a user and campaign, see ffcsdbclient.subscribe_notifications.
+
+    The subscription keeps the ID and timestamp of the last delivered notification, so that reconnects
+    and the polling fallback resume exactly after it without delivering notifications twice. Events that
+    cannot be parsed are reported and skipped. After push_retry_polls polls, the polling fallback tries push
+    again, since the push endpoint may only have been unavailable for a while (e.g. behind a restarting proxy).
+    """
+
+    def __init__(self, client, user_account: str, campaign_id: str, callback: Callable[[dict], None],
+                 timestamp: str, poll_interval: float = 2.0, max_backoff: float = 30.0, push_retry_polls: int = 30):
+        self.client = client
+        self.user_account = user_account
+        self.campaign_id = campaign_id
+        self.callback = callback
+        self.poll_interval = poll_interval
+        self.max_backoff = max_backoff
+        self.push_retry_polls = push_retry_polls
+        self.last_event_id: Optional[str] = None
+        self.last_timestamp = timestamp
+        self.mode = "push"
+        self._seen_at_last_timestamp = set()
+        self._stop = threading.Event()
+        self._response = None
+        self._thread = threading.Thread(target=self._run, name=f"notifications-{user_account}-{campaign_id}", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def close(self, timeout: Optional[float] = 5.0):
+        """
+        Stops the subscription and waits for the background thread to finish.
+        """
+        self._stop.set()
+        response = self._response
+        if response is not None:
+            response.close()  ### Unblocks a thread waiting for the next event
+        self._thread.join(timeout)
+
+    @property
+    def alive(self) -> bool:
+        return self._thread.is_alive()
+
+    def _deliver(self, notification: dict):
+        if not isinstance(notification, dict):
+            print(f"Skipping notification that is not an object: {notification!r}")
+            return
+        try:
+            object_id = ObjectId(notification["_id"]) if "_id" in notification else None
+        except (InvalidId, TypeError) as e:
+            print(f"Skipping notification with invalid _id: {e}")
+            return
+        notification_id = str(notification.get("_id"))
+        notification_timestamp = notification.get("timestamp")
+
+        ### Skip notifications already delivered before a reconnect or a switch to polling
+        if notification_id in self._seen_at_last_timestamp or notification_id == self.last_event_id:
+            return
+        if notification_timestamp is not None and str(notification_timestamp) != self.last_timestamp:
+            self.last_timestamp = str(notification_timestamp)
+            self._seen_at_last_timestamp = set()
+        self._seen_at_last_timestamp.add(notification_id)
+        self.last_event_id = notification_id
+
+        if object_id is not None:
+            notification["_id"] = object_id
+        try:
+            self.callback(notification)
+        except Exception as e:
+            print(f"Error in notification callback: {e}")
+
+    def _run(self):
+        backoff = 1.0
+        while not self._stop.is_set():
+            last_event_id = self.last_event_id
+            error = None
+            try:
+                if self.mode == "push":
+                    self._listen()
+                else:
+                    self._poll()
+            except requests.RequestException as e:
+                error = e
+            if self._stop.is_set():
+                break
+
+            ### Every reconnect waits, also when the server ended the stream normally, so a server that closes
+            ### streams right away is not hammered; only a connection that delivered notifications resets the backoff
+            if self.last_event_id != last_event_id:
+                backoff = 1.0
+            if error is not None:
+                print(f"Notification subscription interrupted, reconnecting in {backoff:.0f} s: {error}")
+            self._stop.wait(backoff)
+            backoff = min(backoff * 2, self.max_backoff)
+
+    def _listen(self):
+        """
+        Receives server-sent events until the connection is closed. Falls back to polling if the server
+        does not provide the push endpoint.
+        """
+        headers = {"Accept": "text/event-stream"}
+        if self.last_event_id is not None:
+            headers["Last-Event-ID"] = self.last_event_id
+        url = f"{self.client.base_url}/subscribe_notifications/{self.user_account}/{self.campaign_id}"
+        response = self.client.session.get(url, params={"timestamp": self.last_timestamp},
+                                           headers=headers, stream=True, timeout=(10, 90))
+        self._response = response
+        try:
+            ### close may have run while connecting, before the response could be closed by it
+            if self._stop.is_set():
+                return
+            if response.status_code in (404, 405, 501) or \
+                    'text/event-stream' not in response.headers.get('Content-Type', ''):
+                print(f"Push notifications not available, polling (push is retried after {self.push_retry_polls} polls).")
+                self.mode = "polling"
+                return
+            response.raise_for_status()
+
+            data_lines = []
+            for line in response.iter_lines(decode_unicode=True):
+                if self._stop.is_set():
+                    return
+                if line:
+                    field, _, value = line.partition(":")
+                    if field == "data":
+                        data_lines.append(value.lstrip())
+                    ### "id", "event" and "retry" fields as well as ":" heartbeat comments are not needed,
+                    ### the notification ID is part of the data
+                    continue
+                ### An empty line terminates an event
+                if data_lines:
+                    data = "\n".join(data_lines)
+                    data_lines = []
+                    try:
+                        notification = json.loads(data)
+                    except ValueError as e:
+                        print(f"Skipping notification that is not valid JSON: {e}")
+                        continue
+                    self._deliver(notification)
+        finally:
+            self._response = None
+            response.close()
+
+    def _poll(self):
+        polls = 0
+        while not self._stop.is_set():
+            cursor = self.client.get_notifications(self.user_account, self.campaign_id, self.last_timestamp)
+            if cursor is None:
+                raise requests.RequestException("get_notifications failed")
+            for notification in sorted(cursor.original_data, key=lambda item: str(item.get("timestamp"))):
+                if "_id" in notification:
+                    notification["_id"] = str(notification["_id"])
+                self._deliver(notification)
+            polls += 1
+            if self.push_retry_polls and polls >= self.push_retry_polls:
+                self.mode = "push"
+                return
+            self._stop.wait(self.poll_interval)
+
+
+class XtalNumberAllocator:
+    """
+    Hands out xtal numbers of plates from blocks reserved on the server, see ffcsdbclient.xtal_number_allocator.
+
+    Instead of one get_next_xtal_number request per fished crystal, a block of block_size numbers is reserved per plate
+    with one reserve_xtal_numbers request and numbers are taken from it locally. Reserved numbers are never handed
+    out by the server to anybody else, so several stations fishing the same plate do not race. Numbers that were
+    not taken are released on close.
+    """
+
+    def __init__(self, client, block_size: int = 20):
+        if block_size < 1:
+            raise ValueError("block_size must be at least 1.")
+        self.client = client
+        self.block_size = block_size
+        self.lock = threading.Lock()
+        self.leases: Dict[str, List[dict]] = {}  ### plate_id -> [{"lease_id", "numbers"}] with the numbers not taken yet
+
+    def next(self, plate_id: str) -> Optional[int]:
+        """
+        Returns the next xtal number of the plate, reserving a new block if the current one is used up.
+
+        Returns:
+            Optional[int]: The xtal number, or None if no block could be reserved.
+        """
+        plate_id = str(plate_id)
+        with self.lock:
+            leases = self.leases.setdefault(plate_id, [])
+            while leases and not leases[0]["numbers"]:
+                leases.pop(0)
+            if not leases:
+                lease = self.client.reserve_xtal_numbers(plate_id, self.block_size)
+                if lease is None:
+                    return None
+                leases.append({"lease_id": lease["lease_id"], "numbers": sorted(lease["numbers"])})
+            return leases[0]["numbers"].pop(0)
+
+    def close(self):
+        """
+        Releases all reserved numbers that were not taken.
+        """
+        with self.lock:
+            leases, self.leases = self.leases, {}
+        for plate_id, plate_leases in leases.items():
+            for lease in plate_leases:
+                if lease["numbers"]:
+                    self.client.release_xtal_numbers(plate_id, lease["lease_id"], lease["numbers"])
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+
+def well_from_shifter_data(well_shifter_data: dict) -> str:
+    """
+    Returns the well in MRC3 notation (e.g. 'A12a') of the plateRow, plateColumn and plateSubwell of Shifter data.
+    """
+    column = str(well_shifter_data.get("plateColumn", "")).strip()
+    if column.isdigit():
+        column = str(int(column))
+    return f"{str(well_shifter_data.get('plateRow', '')).strip()}{column}{str(well_shifter_data.get('plateSubwell', '')).strip()}"
+
+
+class MembershipIndex:
+    """
+    In-memory index of the plates and the fished crystals of a campaign, see ffcsdbclient.membership_index.
+
+    The index is loaded with sync_plates and sync_wells and refreshed incrementally from their watermarks once it is
+    older than max_age seconds. Writes of the own client (add_plate, update_shifter_fishing_result and
+    import_fishing_results) update the index in memory without a refresh; wells whose new state is not known are
+    dropped from it and looked up on the server until the next refresh. Plates and wells that are not in the index
+    (e.g. of other campaigns) are looked up on the server; plates the server does not know are remembered as
+    absent until the next refresh.
+    """
+
+    def __init__(self, client, user_account: str, campaign_id: str, max_age: float = 60.0):
+        self.client = client
+        self.user_account = user_account
+        self.campaign_id = campaign_id
+        self.max_age = max_age
+
+        self.lock = threading.Lock()
+        self.plates: Dict[str, str] = {}                ### plate ObjectId string -> plateId
+        self.plate_ids: set = set()                     ### plateIds of self.plates and of plates added since the last refresh
+        self.absent_plate_ids: set = set()              ### plateIds the server did not know since the last refresh
+        self.wells: Dict[str, tuple] = {}               ### well ObjectId string -> (plateId, well)
+        self.fished: Dict[tuple, bool] = {}             ### (plateId, well) -> fished
+        self.plates_watermark: Optional[str] = None
+        self.wells_watermark: Optional[str] = None
+        self.last_refresh: Optional[float] = None
+
+    def refresh(self) -> bool:
+        """
+        Loads the plates and wells changed since the last refresh.
+
+        Returns:
+            bool: True if the index is up to date, False if the server could not be reached.
+        """
+        with self.lock:
+            plates_watermark, wells_watermark = self.plates_watermark, self.wells_watermark
+
+        plates = self.client.sync_plates(self.user_account, self.campaign_id, since=plates_watermark)
+        wells = self.client.sync_wells(self.user_account, self.campaign_id, since=wells_watermark)
+        if plates is None or wells is None:
+            return False
+
+        with self.lock:
+            for doc_id in plates["deleted"]:
+                self.plates.pop(str(doc_id), None)
+            for plate in plates["changed"]:
+                self.plates[str(plate["_id"])] = str(plate.get("plateId"))
+            for doc_id in wells["deleted"]:
+                key = self.wells.pop(str(doc_id), None)
+                if key is not None:
+                    self.fished.pop(key, None)
+            for well in wells["changed"]:
+                key = (str(well.get("plateId")), well.get("well"))
+                self.wells[str(well["_id"])] = key
+                self.fished[key] = bool(well.get("fished"))
+            self.plate_ids = set(self.plates.values())
+            self.absent_plate_ids = set()
+            self.plates_watermark = plates["watermark"]
+            self.wells_watermark = wells["watermark"]
+            self.last_refresh = time.monotonic()
+        return True
+
+    def _refresh_if_due(self):
+        if self.last_refresh is None or time.monotonic() - self.last_refresh >= self.max_age:
+            self.refresh()
+
+    def is_plate_in_database(self, plate_id: str) -> Optional[bool]:
+        """
+        Like ffcsdbclient.is_plate_in_database, answered from memory for the plates of the campaign.
+        """
+        self._refresh_if_due()
+        with self.lock:
+            if str(plate_id) in self.plate_ids:
+                return True
+            if str(plate_id) in self.absent_plate_ids:
+                return False
+        in_database = self.client.is_plate_in_database(plate_id)
+        if in_database is False:
+            with self.lock:
+                self.absent_plate_ids.add(str(plate_id))
+        return in_database
+
+    def is_crystal_already_fished(self, plate_id: str, well: str) -> Optional[bool]:
+        """
+        Like ffcsdbclient.is_crystal_already_fished, answered from memory for the wells of the campaign.
+        """
+        self._refresh_if_due()
+        with self.lock:
+            fished = self.fished.get((str(plate_id), well))
+        if fished is not None:
+            return fished
+        return self.client.is_crystal_already_fished(plate_id, well)
+
+    ### Updates by writes of the own client
+
+    def _plate_added(self, plate: dict):
+        with self.lock:
+            self.absent_plate_ids.discard(str(plate.get("plateId")))
+            if plate.get("userAccount") == self.user_account and plate.get("campaignId") == self.campaign_id:
+                self.plate_ids.add(str(plate.get("plateId")))
+
+    def _wells_fished(self, keys: List[tuple], certain: bool):
+        with self.lock:
+            for key in keys:
+                if certain and (key in self.fished or key[0] in self.plate_ids):
+                    self.fished[key] = True
+                else:
+                    self.fished.pop(key, None)  ### Looked up on the server until the next refresh
+
+
+class _CallCaptured(BaseException):
+    """
+    Raised by the capturing adapter of a batch to stop a method call right before its request is sent.
+    Derived from BaseException so that the exception handling of the client methods does not catch it.
+    """
+
+    def __init__(self, request):
+        super().__init__()
+        self.request = request
+
+
+class _CapturingAdapter(BaseAdapter):
+    def send(self, request, **kwargs):
+        raise _CallCaptured(request)
+
+    def close(self):
+        pass
+
+
+class _BatchResponseAdapter(BaseAdapter):
+    """
+    Serves the response of one call of a batch, which is set before the call is replayed.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.response_data = None
+
+    def send(self, request, **kwargs):
+        body = self.response_data.get("body")
+        content = json.dumps(body).encode('utf-8') if body is not None else b''
+        headers = {"Content-Type": "application/json", **self.response_data.get("headers", {})}
+        return build_response(request, self.response_data["status"], headers, content, connection=self)
+
+    def close(self):
+        pass
+
+
+class ffcsdbclientBatch:
+    """
+    Collects calls of ffcsdbclient methods and sends their requests to the server in one request to the
+    /batch endpoint, see ffcsdbclient.batch.
+
+    Every queued call returns a concurrent.futures.Future, which resolves, once the batch has been sent, to the
+    same result the method returns when called directly.
+    """
+
+    ### Methods that do not send exactly one request per call and can therefore not be batched
+    NOT_BATCHABLE = {'close', 'batch', 'open_replica', 'subscribe_notifications', 'xtal_number_allocator', 'membership_index',
+                     'import_library_chunked', 'fingerprint_index', 'get_smiles_for_xtals', 'depiction_cache'}
+
+    def __init__(self, client):
+        self.client = client
+        self.calls = []
+
+    def __getattr__(self, name):
+        if name.startswith('_') or name in self.NOT_BATCHABLE or not callable(getattr(self.client, name, None)):
+            raise AttributeError(f"'{name}' cannot be called in a batch.")
+
+        def queue_call(*args, **kwargs) -> Future:
+            future = Future()
+            self.calls.append((name, args, kwargs, future))
+            return future
+        return queue_call
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.execute()
+        else:
+            for _, _, _, future in self.calls:
+                future.cancel()
+        return False
+
+    def execute(self):
+        """
+        Sends all queued calls in one request and resolves their futures.
+        """
+        calls, self.calls = self.calls, []
+
+        ### Run every call against the capturing adapter to obtain the request it sends
+        capturing_session = requests.Session()
+        capturing_session.mount('http://', _CapturingAdapter())
+        capturing_session.mount('https://', _CapturingAdapter())
+        capturing_client = self.client._with_session(capturing_session)
+
+        captured = []
+        for name, args, kwargs, future in calls:
+            try:
+                result = getattr(capturing_client, name)(*args, **kwargs)
+                future.set_result(result)  ### The call did not need the server
+            except _CallCaptured as call:
+                request = call.request
+                body = json.loads(request.body) if request.body else None
+                captured.append(((name, args, kwargs, future), {
+                    "method": request.method,
+                    "path": request.path_url[len(urlparse(self.client.base_url).path):],
+                    "body": body,
+                }))
+            except Exception as e:
+                future.set_exception(e)
+
+        if not captured:
+            return
+
+        try:
+            response = self.client.session.post(f"{self.client.base_url}/batch/",
+                                                json={"requests": [request for _, request in captured]})
+            response.raise_for_status()
+            responses = response.json()["responses"]
+        except Exception as e:
+            for (_, _, _, future), _ in captured:
+                future.set_exception(e)
+            return
+
+        ### Replay every call with its response from the batch, so it returns its usual result type
+        replay_adapter = _BatchResponseAdapter()
+        replay_session = requests.Session()
+        replay_session.mount('http://', replay_adapter)
+        replay_session.mount('https://', replay_adapter)
+        replay_client = self.client._with_session(replay_session)
+
+        for ((name, args, kwargs, future), _), response_data in zip(captured, responses):
+            replay_adapter.response_data = response_data
+            try:
+                future.set_result(getattr(replay_client, name)(*args, **kwargs))
+            except Exception as e:
+                future.set_exception(e)
+
+
 class ffcsdbclient(object):
-    def __init__(self, base_url=Settings.BASE_URL):
+    def __init__(self, base_url=Settings.BASE_URL, session: Optional[requests.Session] = None,
+                 plate_owner_cache_path: Optional[str] = None):
+        """
+        Args:
+            base_url (str): The URL of the ffcs_db_server.
+            session (requests.Session, optional): The session used for all requests to the server, e.g. one
+                created by HttpCassette.recording_session or HttpCassette.replaying_session. A new
+                requests.Session with connection keep-alive is created if not given.
+            plate_owner_cache_path (str, optional): JSON file keeping the owners resolved by find_user_from_plate_id
+                across runs. Without it they are only kept in memory.
+        """
         self.base_url = base_url
+        self.session = session if session is not None else requests.Session()
+
+        ### State of the single_flight methods; coalesced_hits counts calls served by another caller's request
+        self._flight_lock = threading.Lock()
+        self._in_flight: Dict[tuple, _Flight] = {}
+        self.metrics = {"coalesced_hits": 0}
+
+        ### Membership indexes created by membership_index, updated by the writes of this client
+        self._membership_indexes = weakref.WeakSet()
+
+        ### Fingerprint indexes and depiction caches, updated by the library imports of this client
+        self._library_import_listeners = weakref.WeakSet()
+
+        ### SMILES of crystals by (user_account, campaign_id), filled by get_smiles_for_xtals
+        self._smiles_lock = threading.Lock()
+        self._smiles_cache: Dict[tuple, Dict[str, str]] = {}
+
+        ### Owners of plates resolved by find_user_from_plate_id; the owner of a plate never changes while it exists
+        self._plate_owners_lock = threading.Lock()
+        self.plate_owner_cache_path = plate_owner_cache_path
+        self._plate_owners: Dict[str, dict] = self._load_plate_owners()
+
+    ### FETCH_TAG batch
+    def batch(self) -> ffcsdbclientBatch:
+        """
+        Returns a context that collects calls of the client methods and sends them to the server as one request.
+
+        Calls made through the batch are queued and return a concurrent.futures.Future; when the context exits,
+        all queued requests are sent to the server's /batch endpoint in one request and every future resolves to
+        the result the method returns when called directly:
+
+            with client.batch() as b:
+                well = b.get_one_well(well_id)
+                fished = b.is_crystal_already_fished(plate_id, "A1a")
+            well.result(), fished.result()
+
+        Returns:
+            ffcsdbclientBatch: The batch context.
+        """
+        return ffcsdbclientBatch(self)
+    ### FETCH_TAG batch
+
+    def _with_session(self, session: requests.Session) -> 'ffcsdbclient':
+        """
+        Returns a shallow copy of the client that sends its requests through the given session.
+        """
+        clone = copy.copy(self)
+        clone.session = session
+        clone._flight_lock = threading.Lock()
+        clone._in_flight = {}
+        clone.metrics = {"coalesced_hits": 0}
+        return clone
+
+    ### FETCH_TAG close
+    def close(self):
+        """
+        Closes the session and its connections. A recording cassette is written completely on close.
+        """
+        self.session.close()
+    ### FETCH_TAG close
 
     ### FETCH_TAG delete_by_id
     def delete_by_id(self, collection: str, doc_id: str) -> dict:
-        response = requests.delete(f"{self.base_url}/delete_by_id/{collection}/{doc_id}")
+        response = self.session.delete(f"{self.base_url}/delete_by_id/{collection}/{doc_id}")
+
+        if collection == "plates":
+            self._forget_plate_owners()
 
         try:
             ### Get the response data
@@ -217,7 +868,10 @@ class ffcsdbclient(object):
 
     ### FETCH_TAG delete_by_query
     def delete_by_query(self, collection: str, query: dict) -> dict:
-        response = requests.post(f"{self.base_url}/delete_by_query/{collection}", json=query)
+        response = self.session.post(f"{self.base_url}/delete_by_query/{collection}", json=query)
+
+        if collection == "plates":
+            self._forget_plate_owners()
 
         try:
             ### Get the response data
@@ -228,6 +882,186 @@ class ffcsdbclient(object):
             return None
     ### FETCH_TAG delete_by_query
 
+    ### FETCH_TAG delete_by_ids
+    def delete_by_ids(self, collection: str, ids: List[Union[str, ObjectId]]) -> dict:
+        """
+        Sends a POST request to delete all documents of a collection whose ObjectId is in the given list.
+
+        Args:
+            collection (str): The collection key, e.g. 'wells' or 'plates' (see DbCollections).
+            ids (List[Union[str, ObjectId]]): The ObjectIds of the documents to delete.
+
+        Returns:
+            dict: The server response, including 'acknowledged' and 'deleted_count', or None if the
+                  response could not be parsed.
+        """
+        payload = {"ids": [str(doc_id) for doc_id in ids]}
+        response = self.session.post(f"{self.base_url}/delete_by_ids/{collection}", json=payload)
+
+        if collection == "plates":
+            self._forget_plate_owners()
+
+        try:
+            ### Get the response data
+            delete_info = response.json()
+            return delete_info
+        except Exception as e:
+            print(f"Could not parse JSON: {e}")
+            return None
+    ### FETCH_TAG delete_by_ids
+
+    ### FETCH_TAG delete_many
+    def delete_many(self, ops: List[tuple]) -> dict:
+        """
+        Sends a single POST request executing several deletions, e.g. the cleanup of several collections.
+
+        Each operation is a (collection, selector) pair. The selector is either a MongoDB query (dict),
+        which is handled like delete_by_query, or a list of ObjectIds, which is handled like delete_by_ids.
+        The operations are executed in the given order.
+
+        Args:
+            ops (List[tuple]): A list of (collection, query or list of ids) pairs.
+
+        Returns:
+            dict: The server response with 'acknowledged' and 'results', a list with one entry per
+                  operation containing its 'collection' and 'deleted_count'. None if the response
+                  could not be parsed.
+
+        Raises:
+            ValueError: If a selector is neither a dict nor a list of ids.
+        """
+        payload = []
+        for collection, selector in ops:
+            if isinstance(selector, dict):
+                payload.append({"collection": collection, "query": convert_objects_to_serializable(selector)})
+            elif isinstance(selector, (list, tuple)):
+                payload.append({"collection": collection, "ids": [str(doc_id) for doc_id in selector]})
+            else:
+                raise ValueError(f"Selector for collection '{collection}' must be a query dict or a list of ids.")
+
+        if any(collection == "plates" for collection, _ in ops):
+            self._forget_plate_owners()
+
+        response = self.session.post(f"{self.base_url}/delete_many/", json={"ops": payload})
+
+        try:
+            ### Get the response data
+            delete_info = response.json()
+            return delete_info
+        except Exception as e:
+            print(f"Could not parse JSON: {e}")
+            return None
+    ### FETCH_TAG delete_many
+
+    ### FETCH_TAG open_replica
+    def open_replica(self, user_account: str, campaign_id: str, path: Optional[str] = None,
+                     sync_interval: float = 60.0) -> CampaignReplica:
+        """
+        Opens the local SQLite replica of a campaign and starts its background sync with the server.
+
+        Reads of plates, wells and campaign libraries from the returned replica are served locally. An existing
+        replica file is opened without any network round trip and refreshed in the background; a new one is
+        filled with an initial sync before it is returned.
+
+        Args:
+            user_account (str): The user account of the campaign.
+            campaign_id (str): The campaign to replicate.
+            path (str, optional): The SQLite file, by default ~/.ffcs_db_client/replicas/<user>_<campaign>.sqlite.
+            sync_interval (float): Seconds between background syncs.
+
+        Returns:
+            CampaignReplica: The opened replica; call close() to stop the background sync.
+        """
+        replica = CampaignReplica(self, user_account, campaign_id, path)
+        if replica.is_empty():
+            replica.sync()
+            replica.start_sync(sync_interval, immediately=False)
+        else:
+            replica.start_sync(sync_interval, immediately=True)
+        return replica
+    ### FETCH_TAG open_replica
+
+    ### FETCH_TAG membership_index
+    def membership_index(self, user_account: str, campaign_id: str, max_age: float = 60.0) -> MembershipIndex:
+        """
+        Returns an in-memory index of the plates and fished crystals of a campaign, which answers is_plate_in_database
+        and is_crystal_already_fished without a request to the server:
+
+            index = client.membership_index(user_account, campaign_id)
+            if not index.is_crystal_already_fished(plate_id, "A1a"):
+                ...
+
+        The index is loaded right away, refreshed incrementally once it is older than max_age seconds and updated
+        by add_plate, update_shifter_fishing_result and import_fishing_results of this client.
+
+        Args:
+            user_account (str): The user account of the campaign.
+            campaign_id (str): The campaign to index.
+            max_age (float): Seconds after which the index is refreshed on the next check.
+
+        Returns:
+            MembershipIndex: The loaded index.
+        """
+        index = MembershipIndex(self, user_account, campaign_id, max_age=max_age)
+        index.refresh()
+        self._membership_indexes.add(index)
+        return index
+    ### FETCH_TAG membership_index
+
+    ### FETCH_TAG fingerprint_index
+    def fingerprint_index(self, path: Optional[str] = None, radius: int = 2, n_bits: int = 2048):
+        """
+        Returns a local similarity and substructure search index over the compounds of libraries and campaign
+        libraries (see FingerprintIndex), which needs RDKit and numpy:
+
+            index = client.fingerprint_index(path="fragments.npz")
+            index.build(user_account, campaign_id)
+            hits = index.wells_for_hits(user_account, campaign_id, index.similar(smiles, k=10))
+
+        The index is loaded from path if it exists and is not built automatically. Libraries imported with
+        import_library or import_library_chunked of this client are added to it in the background.
+
+        Args:
+            path (str, optional): File the index is loaded from and saved to after every change.
+            radius (int): Radius of the Morgan fingerprints.
+            n_bits (int): Number of bits of the fingerprints.
+
+        Returns:
+            FingerprintIndex: The index.
+        """
+        from FingerprintIndex import FingerprintIndex
+
+        index = FingerprintIndex(self, path=path, radius=radius, n_bits=n_bits)
+        self._library_import_listeners.add(index)
+        return index
+    ### FETCH_TAG fingerprint_index
+
+    ### FETCH_TAG depiction_cache
+    def depiction_cache(self, directory: Optional[str] = None, max_bytes: int = 256 * 1024 * 1024, **kwargs):
+        """
+        Returns an on-disk cache of compound depictions rendered with RDKit (see DepictionCache):
+
+            depictions = client.depiction_cache()
+            svg = depictions.get(smiles, size=(300, 300), fmt="svg")
+
+        Libraries imported with import_library or import_library_chunked of this client are pre-rendered in
+        the background.
+
+        Args:
+            directory (str, optional): Directory of the cache, by default ~/.ffcs_db_client/depictions.
+            max_bytes (int): Size of the cache above which the least recently used depictions are removed.
+            **kwargs: prerender_sizes, prerender_formats and processes of DepictionCache.
+
+        Returns:
+            DepictionCache: The cache.
+        """
+        from DepictionCache import DepictionCache
+
+        cache = DepictionCache(directory, max_bytes=max_bytes, client=self, **kwargs)
+        self._library_import_listeners.add(cache)
+        return cache
+    ### FETCH_TAG depiction_cache
+
     ### FETCH_TAG merge_two_dictionaries
     def __merge_two_dictionaries(self, d1, d2):
         """
@@ -252,7 +1086,7 @@ class ffcsdbclient(object):
             Exception: If the response status code is not 200 or other errors occur during the request.
         """
         try:
-            response = requests.get(f"{self.base_url}/check_if_db_connected")
+            response = self.session.get(f"{self.base_url}/check_if_db_connected")
             response.raise_for_status()
         except Exception as e:
             ### Handle exceptions and raise a detailed error message
@@ -264,7 +1098,7 @@ class ffcsdbclient(object):
 
     ### FETCH_TAG get_collection
     def __get_collection(self, name: str) -> str:
-        response = requests.get(f"{self.base_url}/get_collection/{name}")
+        response = self.session.get(f"{self.base_url}/get_collection/{name}")
 
         try:
             ### Get the response data
@@ -289,7 +1123,7 @@ class ffcsdbclient(object):
         Raises:
             Exception: Captures any exception that occurs during the request or JSON parsing and logs the error message.
         """
-        response = requests.get(f"{self.base_url}/get_libraries/")
+        response = self.session.get(f"{self.base_url}/get_libraries/")
     
         try:
             libraries = response.json()
@@ -323,7 +1157,7 @@ class ffcsdbclient(object):
             'campaign_id': campaign_id
         }
         try:
-            response = requests.post(f"{self.base_url}/get_campaign_libraries/", json=payload)
+            response = self.session.post(f"{self.base_url}/get_campaign_libraries/", json=payload)
             libraries = response.json()
             return libraries
         except Exception as e:
@@ -333,7 +1167,7 @@ class ffcsdbclient(object):
 
     ### FETCH_TAG get_plate
     def get_plate(self, user_account: str, campaign_id: int, plate_id: int) -> dict:
-        response = requests.get(f"{self.base_url}/get_plate/{user_account}/{campaign_id}/{plate_id}")
+        response = self.session.get(f"{self.base_url}/get_plate/{user_account}/{campaign_id}/{plate_id}")
 
         try:
             ### Get the response data
@@ -346,7 +1180,7 @@ class ffcsdbclient(object):
 
     ### FETCH_TAG get_plates
     def get_plates(self, user_account: str, campaign_id: int) -> list:
-        response = requests.get(f"{self.base_url}/get_plates/{user_account}/{campaign_id}")
+        response = self.session.get(f"{self.base_url}/get_plates/{user_account}/{campaign_id}")
 
         try:
             ### Get the response data
@@ -372,9 +1206,49 @@ class ffcsdbclient(object):
             return None
     ### FETCH_TAG get_plates
 
+    ### FETCH_TAG sync_plates
+    def sync_plates(self, user_account: str, campaign_id: str, since: Optional[str] = None,
+                    into: Optional[List[dict]] = None) -> Optional[dict]:
+        """
+        Sends a GET request to retrieve only the plates of a campaign that were changed or deleted after a watermark.
+
+        Works like sync_wells; changed plates are converted like in get_plates.
+
+        Args:
+            user_account (str): The user account identifier.
+            campaign_id (str): The campaign identifier.
+            since (str, optional): The watermark returned by the previous sync.
+            into (List[dict], optional): A caller-held list of plates, into which the changes are merged in place.
+
+        Returns:
+            Optional[dict]: A dictionary with 'changed' (list of plates), 'deleted' (list of ObjectId strings) and
+                            'watermark' for the next call, or None if the request failed.
+        """
+        params = {"user_account": user_account, "campaign_id": campaign_id}
+        if since is not None:
+            params["since"] = since
+
+        try:
+            response = self.session.get(f"{self.base_url}/sync_plates/", params=params)
+            response.raise_for_status()
+            result = response.json()
+        except requests.RequestException as e:
+            print(f"Request failed: {e}")
+            return None
+        except ValueError as e:
+            print(f"Could not parse JSON: {e}")
+            return None
+
+        changed = convert_datetime_strings(result["changed"], ['createdOn', 'lastImaged', 'soakExportTime'])
+
+        if into is not None:
+            merge_documents(into, changed, result["deleted"])
+        return {"changed": changed, "deleted": result["deleted"], "watermark": result["watermark"]}
+    ### FETCH_TAG sync_plates
+
     ### FETCH_TAG get_campaigns
     def get_campaigns(self, user_account: str) -> list:
-        response = requests.get(f"{self.base_url}/get_campaigns/{user_account}")
+        response = self.session.get(f"{self.base_url}/get_campaigns/{user_account}")
 
         try:
             ### Get the response data
@@ -388,11 +1262,15 @@ class ffcsdbclient(object):
     ### FETCH_TAG add_plate
     def add_plate(self, plate: dict) -> dict:
         plate = convert_objects_to_serializable(plate)
-        response = requests.post(f"{self.base_url}/add_plate/", json=plate)
+        response = self.session.post(f"{self.base_url}/add_plate/", json=plate)
 
         try:
             ### Get the response data
             plate_info = response.json()
+            if isinstance(plate_info, dict) and plate_info.get("inserted_id"):
+                self._forget_plate_owners([plate.get("plateId")])
+                for index in list(self._membership_indexes):
+                    index._plate_added(plate)
             return plate_info
         except Exception as e:
             print(f"Could not parse JSON: {e}")
@@ -402,7 +1280,7 @@ class ffcsdbclient(object):
     ### FETCH_TAG add_well
     def add_well(self, well: dict) -> dict:
         well = convert_objects_to_serializable(well)
-        response = requests.post(f"{self.base_url}/add_well/", json=well)
+        response = self.session.post(f"{self.base_url}/add_well/", json=well)
 
         try:
             ### Get the response data
@@ -434,7 +1312,7 @@ class ffcsdbclient(object):
         """
         campaign_library = convert_objects_to_serializable(campaign_library)
         try:
-            response = requests.post(f"{self.base_url}/insert_campaign_library/", json=campaign_library)
+            response = self.session.post(f"{self.base_url}/insert_campaign_library/", json=campaign_library)
             campaign_library_info = response.json()
             return MockInsertOneResult(campaign_library_info["acknowledged"], campaign_library_info["inserted_id"])
         except Exception as e:
@@ -445,7 +1323,7 @@ class ffcsdbclient(object):
     ### FETCH_TAG add_wells
     def add_wells(self, list_of_wells: List[dict]) -> dict:
         list_of_wells = [convert_objects_to_serializable(item) for item in list_of_wells]
-        response = requests.post(f"{self.base_url}/add_wells/", json=list_of_wells)
+        response = self.session.post(f"{self.base_url}/add_wells/", json=list_of_wells)
         try:
             ### Get the response data
             wells_info = response.json()
@@ -460,7 +1338,7 @@ class ffcsdbclient(object):
         
         kwargs = convert_objects_to_serializable(kwargs)
 
-        response = requests.put(f"{self.base_url}/update_by_object_id",
+        response = self.session.put(f"{self.base_url}/update_by_object_id",
                                 json={
                                     "user_account": user,
                                     "campaign_id": campaign_id,
@@ -483,7 +1361,7 @@ class ffcsdbclient(object):
 
         kwargs = convert_objects_to_serializable(kwargs)
 
-        response = requests.put(f"{self.base_url}/update_by_object_id_NEW",
+        response = self.session.put(f"{self.base_url}/update_by_object_id_NEW",
                                 json={
                                     "user_account": user,
                                     "campaign_id": campaign_id,
@@ -501,9 +1379,66 @@ class ffcsdbclient(object):
             return None
     ### FETCH_TAG update_by_object_id_NEW
 
+    ### FETCH_TAG update_many_by_object_ids
+    def update_many_by_object_ids(self, user: str, campaign_id: str, collection: str,
+                                  updates: Dict[Union[str, ObjectId], dict]) -> Optional[MockUpdateResult]:
+        """
+        Sends a PUT request to update many documents with individual changes, executed as one bulk write on the server.
+
+        This replaces calling update_by_object_id once per document, e.g. when a column of the well grid is edited.
+
+        Args:
+            user (str): The user account identifier.
+            campaign_id (str): The campaign identifier.
+            collection (str): The collection of the documents, e.g. "wells" or "plates".
+            updates (Dict[Union[str, ObjectId], dict]): Maps the ObjectId of each document to the fields to set,
+                                                        like the kwargs of update_by_object_id.
+
+        Returns:
+            Optional[MockUpdateResult]: The summed matched_count and modified_count of all documents; raw_result
+                                        contains 'acknowledged' and 'results', which maps every ObjectId string
+                                        to its own 'matched_count', 'modified_count' and 'error' (None if the
+                                        update succeeded). None if the request failed.
+        """
+        if not updates:
+            return MockUpdateResult(matched_count=0, modified_count=0, upserted_id=None, raw_result={"acknowledged": True, "results": {}})
+
+        payload = {
+            "user_account": user,
+            "campaign_id": campaign_id,
+            "collection": collection,
+            "updates": [{"doc_id": str(doc_id), "kwargs": convert_objects_to_serializable(kwargs)}
+                        for doc_id, kwargs in updates.items()],
+        }
+
+        try:
+            response = self.session.put(f"{self.base_url}/update_many_by_object_ids", json=payload)
+            response.raise_for_status()
+            result = response.json()
+        except requests.RequestException as e:
+            print(f"Request failed: {e}")
+            return None
+        except ValueError as e:
+            print(f"Could not parse JSON: {e}")
+            return None
+
+        results = {str(item["doc_id"]): {
+                       "matched_count": item.get("matched_count", 0),
+                       "modified_count": item.get("modified_count", 0),
+                       "error": item.get("error"),
+                   } for item in result.get("results", [])}
+
+        return MockUpdateResult(
+            matched_count=sum(item["matched_count"] for item in results.values()),
+            modified_count=sum(item["modified_count"] for item in results.values()),
+            upserted_id=None,
+            raw_result={"acknowledged": result.get("acknowledged", True), "results": results},
+        )
+    ### FETCH_TAG update_many_by_object_ids
+
     ### FETCH_TAG is_plate_in_database
     def is_plate_in_database(self, plate_id: str) -> bool:
-        response = requests.get(f"{self.base_url}/is_plate_in_database/{plate_id}")
+        response = self.session.get(f"{self.base_url}/is_plate_in_database/{plate_id}")
         try:
             ### Get the response data
             result = response.json()
@@ -515,7 +1450,7 @@ class ffcsdbclient(object):
 
     ### FETCH_TAG get_unselected_plates
     def get_unselected_plates(self, user_account: str) -> List[dict]:
-        response = requests.get(f"{self.base_url}/get_unselected_plates/{user_account}")
+        response = self.session.get(f"{self.base_url}/get_unselected_plates/{user_account}")
         try:
             result = response.json()
 
@@ -544,7 +1479,7 @@ class ffcsdbclient(object):
             "batch_id": batch_id
         }
 
-        response = requests.put(f"{self.base_url}/mark_plate_done", json=data)
+        response = self.session.put(f"{self.base_url}/mark_plate_done", json=data)
 
         try:
             ### Get the response data
@@ -556,12 +1491,13 @@ class ffcsdbclient(object):
     ### FETCH_TAG mark_plate_done
 
     ### FETCH_TAG get_all_wells
+    @single_flight
     def get_all_wells(self, user_account: str, campaign_id: str) -> List[dict]:
         params = {
             "user_account": user_account,
             "campaign_id": campaign_id
         }
-        response = requests.get(f"{self.base_url}/get_all_wells/", params=params)
+        response = self.session.get(f"{self.base_url}/get_all_wells/", params=params)
 
         try:
             wells = response.json()
@@ -591,6 +1527,53 @@ class ffcsdbclient(object):
             return []
     ### FETCH_TAG get_all_wells
 
+    ### FETCH_TAG sync_wells
+    def sync_wells(self, user_account: str, campaign_id: str, since: Optional[str] = None,
+                   into: Optional[List[dict]] = None) -> Optional[dict]:
+        """
+        Sends a GET request to retrieve only the wells of a campaign that were changed or deleted after a watermark.
+
+        The watermark is an opaque value returned by the previous call (based on the modification time the server
+        keeps for every document). Without a watermark, all wells of the campaign are returned as changed.
+        Changed wells are converted like in get_all_wells.
+
+        Args:
+            user_account (str): The user account identifier.
+            campaign_id (str): The campaign identifier.
+            since (str, optional): The watermark returned by the previous sync.
+            into (List[dict], optional): A caller-held list of wells, into which the changes are merged in place.
+
+        Returns:
+            Optional[dict]: A dictionary with 'changed' (list of wells), 'deleted' (list of ObjectId strings) and
+                            'watermark' for the next call, or None if the request failed.
+        """
+        params = {"user_account": user_account, "campaign_id": campaign_id}
+        if since is not None:
+            params["since"] = since
+
+        try:
+            response = self.session.get(f"{self.base_url}/sync_wells/", params=params)
+            response.raise_for_status()
+            result = response.json()
+        except requests.RequestException as e:
+            print(f"Request failed: {e}")
+            return None
+        except ValueError as e:
+            print(f"Could not parse JSON: {e}")
+            return None
+
+        changed = result["changed"]
+        for well in changed:
+            well["_id"] = ObjectId(well["_id"])
+            if "libraryID" in well:
+                well["libraryID"] = ObjectId(well["libraryID"])
+        convert_datetime_strings(changed, ['soakExportTime', 'soakTransferTime', 'cryoExportTime', 'shifterTimeOfArrival', 'shifterTimeOfDeparture', 'shifterDuration'])
+
+        if into is not None:
+            merge_documents(into, changed, result["deleted"])
+        return {"changed": changed, "deleted": result["deleted"], "watermark": result["watermark"]}
+    ### FETCH_TAG sync_wells
+
     ### FETCH_TAG get_wells_from_plate
     def get_wells_from_plate(self, user_account: str, campaign_id: str, plate_id: str, **kwargs) -> list:
 
@@ -598,7 +1581,7 @@ class ffcsdbclient(object):
 
         base_request = {"user_account": user_account, "campaign_id": campaign_id, "plate_id": plate_id}
         request = {**base_request, **kwargs}
-        response = requests.get(f"{self.base_url}/get_wells_from_plate/",
+        response = self.session.get(f"{self.base_url}/get_wells_from_plate/",
                                 params=request)
 
         try:
@@ -614,7 +1597,7 @@ class ffcsdbclient(object):
 
     ### FETCH_TAG get_one_well
     def get_one_well(self, well_id: str) -> dict:
-        response = requests.get(f"{self.base_url}/get_one_well/", params={"well_id": well_id})
+        response = self.session.get(f"{self.base_url}/get_one_well/", params={"well_id": well_id})
 
         try:
             well = response.json()
@@ -633,7 +1616,7 @@ class ffcsdbclient(object):
 
     ### FETCH_TAG get_one_campaign_library
     def get_one_campaign_library(self, library_id: str) -> dict:
-        response = requests.get(f"{self.base_url}/get_one_campaign_library/", params={"library_id": library_id})
+        response = self.session.get(f"{self.base_url}/get_one_campaign_library/", params={"library_id": library_id})
 
         try:
             library = response.json()
@@ -665,7 +1648,7 @@ class ffcsdbclient(object):
         Raises:
             Exception: Captures any exception that occurs during the request or JSON parsing and logs the error message.
         """
-        response = requests.get(f"{self.base_url}/get_one_library/", params={"library_id": library_id})
+        response = self.session.get(f"{self.base_url}/get_one_library/", params={"library_id": library_id})
 
         try:
             library = response.json()
@@ -675,6 +1658,95 @@ class ffcsdbclient(object):
             return {}
     ### FETCH_TAG get_one_library
 
+    ### FETCH_TAG get_wells_by_ids
+    def get_wells_by_ids(self, ids: List[Union[str, ObjectId]], fields: Optional[List[str]] = None) -> Optional[dict]:
+        """
+        Sends a POST request to retrieve any number of wells by their ObjectIds in one request, e.g. instead of calling
+        get_one_well for every well of a selection.
+
+        Args:
+            ids (List[Union[str, ObjectId]]): The ObjectIds of the wells.
+            fields (List[str], optional): Fields to return for each well (_id is always returned); all fields if not given.
+
+        Returns:
+            Optional[dict]: A dictionary with 'documents' (the found wells, in the order of ids, converted like in
+                            get_one_well) and 'missing' (ObjectId strings of the ids that were not found), or None
+                            if the request failed.
+        """
+        payload = {"ids": [str(doc_id) for doc_id in ids]}
+        if fields is not None:
+            payload["fields"] = list(fields)
+
+        result = self._get_documents_by_ids("get_wells_by_ids", payload)
+        if result is None:
+            return None
+
+        for well in result["documents"]:
+            well["_id"] = ObjectId(well["_id"])
+            if "libraryID" in well:
+                well["libraryID"] = ObjectId(well["libraryID"])
+        return result
+    ### FETCH_TAG get_wells_by_ids
+
+    ### FETCH_TAG get_libraries_by_ids
+    def get_libraries_by_ids(self, ids: List[Union[str, ObjectId]], collection: str = "libraries") -> Optional[dict]:
+        """
+        Sends a POST request to retrieve any number of libraries by their IDs in one request, e.g. instead of calling
+        get_one_library or get_one_campaign_library in a loop.
+
+        Args:
+            ids (List[Union[str, ObjectId]]): The IDs of the libraries.
+            collection (str): "libraries" or "campaign_libraries".
+
+        Returns:
+            Optional[dict]: A dictionary with 'documents' (the found libraries, in the order of ids, converted like in
+                            get_one_library or get_one_campaign_library) and 'missing' (the ids that were not found),
+                            or None if the request failed.
+
+        Raises:
+            ValueError: If collection is neither "libraries" nor "campaign_libraries".
+        """
+        if collection not in ("libraries", "campaign_libraries"):
+            raise ValueError(f"Unsupported collection for get_libraries_by_ids: {collection}")
+
+        result = self._get_documents_by_ids(f"get_libraries_by_ids/{collection}", {"ids": [str(doc_id) for doc_id in ids]})
+        if result is None:
+            return None
+
+        if collection == "campaign_libraries":
+            result["documents"] = [convert_strings_to_objectids(library) for library in result["documents"]]
+        return result
+    ### FETCH_TAG get_libraries_by_ids
+
+    def _get_documents_by_ids(self, endpoint: str, payload: dict) -> Optional[dict]:
+        """
+        Posts ids to a bulk read endpoint and orders the returned documents like the requested ids.
+        """
+        try:
+            response = self.session.post(f"{self.base_url}/{endpoint}/", json=payload)
+            response.raise_for_status()
+            documents = response.json()
+        except requests.RequestException as e:
+            print(f"Request failed: {e}")
+            return None
+        except ValueError as e:
+            print(f"Could not parse JSON: {e}")
+            return None
+
+        documents_by_id = {str(document["_id"]): document for document in documents}
+        ordered = []
+        missing = []
+        seen = set()
+        for doc_id in payload["ids"]:
+            document = documents_by_id.get(doc_id)
+            if document is None:
+                missing.append(doc_id)
+            else:
+                ### Repeated ids get their own copy, so the conversion is not applied twice to the same document
+                ordered.append(copy.deepcopy(document) if doc_id in seen else document)
+                seen.add(doc_id)
+        return {"documents": ordered, "missing": missing}
+
     ### FETCH_TAG get_smiles
     def get_smiles(self, user_account: str, campaign_id: str, xtal_name: str) -> Optional[str]:
         """
@@ -695,7 +1767,7 @@ class ffcsdbclient(object):
         Raises:
             Exception: Captures any exception that occurs during the request or JSON parsing and logs the error message.
         """
-        response = requests.get(f"{self.base_url}/get_smiles/", params={"user_account": user_account, "campaign_id": campaign_id, "xtal_name": xtal_name})
+        response = self.session.get(f"{self.base_url}/get_smiles/", params={"user_account": user_account, "campaign_id": campaign_id, "xtal_name": xtal_name})
         
         try:
             data = response.json()
@@ -705,6 +1777,66 @@ class ffcsdbclient(object):
             return None
     ### FETCH_TAG get_smiles
 
+    ### FETCH_TAG get_smiles_for_xtals
+    def get_smiles_for_xtals(self, user_account: str, campaign_id: str, xtal_names: List[str],
+                             refresh: bool = False) -> Optional[Dict[str, Optional[str]]]:
+        """
+        Retrieves the SMILES strings of several crystals like get_smiles.
+
+        The SMILES of a campaign are cached per campaign. On the first call for a campaign, the cache is filled
+        from get_all_fished_wells; crystals that are not in the cache are then resolved with one POST request
+        for all of them.
+
+        Args:
+            user_account (str): The identifier of the user account.
+            campaign_id (str): The identifier of the campaign.
+            xtal_names (List[str]): The names of the crystals.
+            refresh (bool): Reload the cache of the campaign from get_all_fished_wells first.
+
+        Returns:
+            Optional[Dict[str, Optional[str]]]: The SMILES string by crystal name, None for crystals without
+                                                SMILES. None if the request failed.
+        """
+        xtal_names = list(xtal_names)
+        key = (user_account, campaign_id)
+        with self._smiles_lock:
+            loaded = key in self._smiles_cache and not refresh
+        if not loaded:
+            fished_smiles = {well["xtalName"]: well["smiles"] for well in self.get_all_fished_wells(user_account, campaign_id)
+                             if well.get("xtalName") and well.get("smiles")}
+            with self._smiles_lock:
+                self._smiles_cache[key] = fished_smiles
+
+        with self._smiles_lock:
+            cache = self._smiles_cache[key]
+            smiles = {xtal_name: cache[xtal_name] for xtal_name in xtal_names if xtal_name in cache}
+        missing = list(dict.fromkeys(xtal_name for xtal_name in xtal_names if xtal_name not in smiles))
+        if not missing:
+            return smiles
+
+        payload = {"user_account": user_account, "campaign_id": campaign_id, "xtal_names": missing}
+        try:
+            response = self.session.post(f"{self.base_url}/get_smiles_for_xtals/", json=payload)
+            response.raise_for_status()
+            resolved = response.json()["smiles"]
+        except requests.RequestException as http_error:
+            print(f"HTTP error occurred: {http_error}")
+            return None
+        except KeyError as key_error:
+            print(f"Unexpected format: {key_error} key missing in the JSON response.")
+            return None
+        except ValueError as json_error:
+            print(f"Could not parse JSON: {json_error}")
+            return None
+
+        ### Crystals without SMILES are not cached, they may be soaked or named later
+        with self._smiles_lock:
+            cache.update({xtal_name: value for xtal_name, value in resolved.items() if value})
+        for xtal_name in missing:
+            smiles[xtal_name] = resolved.get(xtal_name)
+        return smiles
+    ### FETCH_TAG get_smiles_for_xtals
+
     ### FETCH_TAG get_not_matched_wells
     def get_not_matched_wells(self, user_account: str, campaign_id: str) -> list:
         """
@@ -725,7 +1857,7 @@ class ffcsdbclient(object):
         try:
             # Prepare the request with query parameters
             params = {"user_account": user_account, "campaign_id": campaign_id}
-            response = requests.get(f"{self.base_url}/get_not_matched_wells/", params=params)
+            response = self.session.get(f"{self.base_url}/get_not_matched_wells/", params=params)
     
             # Attempt to parse the JSON response
             wells = response.json()
@@ -761,7 +1893,7 @@ class ffcsdbclient(object):
             RequestException: For issues like network problems, or connection timeouts.
         """
         try:
-            response = requests.get(f"{self.base_url}/get_id_of_plates_to_soak/",
+            response = self.session.get(f"{self.base_url}/get_id_of_plates_to_soak/",
                                     params={"user_account": user_account, "campaign_id": campaign_id})
             response.raise_for_status()  # Raises an HTTPError, if the HTTP request returned an unsuccessful status code
             return response.json()
@@ -796,7 +1928,7 @@ class ffcsdbclient(object):
         Raises:
             JSONDecodeError: If the response body does not contain valid JSON.
         """
-        response = requests.get(f"{self.base_url}/get_id_of_plates_to_cryo_soak/",
+        response = self.session.get(f"{self.base_url}/get_id_of_plates_to_cryo_soak/",
                                 params={"user_account": user_account, "campaign_id": campaign_id})
     
         try:
@@ -830,7 +1962,7 @@ class ffcsdbclient(object):
         Raises:
             JSONDecodeError: If the response body does not contain valid JSON.
         """
-        response = requests.get(f"{self.base_url}/get_id_of_plates_for_redesolve/",
+        response = self.session.get(f"{self.base_url}/get_id_of_plates_for_redesolve/",
                                 params={"user_account": user_account, "campaign_id": campaign_id})
     
         try:
@@ -862,7 +1994,7 @@ class ffcsdbclient(object):
         payload = {"user": user, "campaign_id": campaign_id, "data": data}
 
         try:
-            response = requests.post(url, json=payload)
+            response = self.session.post(url, json=payload)
             response.raise_for_status()  # Raises HTTPError for bad requests (4xx or 5xx)
             return response.json()
         except requests.exceptions.HTTPError as http_err:
@@ -904,7 +2036,7 @@ class ffcsdbclient(object):
         payload = {"user": user, "campaign_id": campaign_id, "data": data}
         
         try:
-            response = requests.post(url, json=payload)
+            response = self.session.post(url, json=payload)
             response.raise_for_status()  # Raises an HTTPError if the HTTP request returned an unsuccessful status code
             return response.json()
         except requests.exceptions.HTTPError as http_err:
@@ -945,7 +2077,7 @@ class ffcsdbclient(object):
         payload = {"user": user, "campaign_id": campaign_id, "data": data}
         
         try:
-            response = requests.post(url, json=payload, headers=headers)
+            response = self.session.post(url, json=payload, headers=headers)
             response.raise_for_status()  # Raises a RequestException for HTTP errors
             try:
                 return response.json()
@@ -980,7 +2112,7 @@ class ffcsdbclient(object):
         data = [convert_objects_to_serializable(item) for item in data]
 
         try:
-            response = requests.post(f"{self.base_url}/export_to_soak/", json=data)
+            response = self.session.post(f"{self.base_url}/export_to_soak/", json=data)
             response.raise_for_status()  # Check for HTTP request errors
             result = response.json()
             # Assuming MockUpdateResult simulates the structure of the actual result
@@ -1024,7 +2156,7 @@ class ffcsdbclient(object):
         data = [convert_objects_to_serializable(item) for item in data]
 
         try:
-            response = requests.post(f"{self.base_url}/export_redesolve_to_soak/", json=data)
+            response = self.session.post(f"{self.base_url}/export_redesolve_to_soak/", json=data)
             response.raise_for_status()  # Raises HTTPError if one occurred during the request
             result = response.json()
             # MockUpdateResult mimics the pymongo UpdateResult object
@@ -1066,7 +2198,7 @@ class ffcsdbclient(object):
         data = [convert_objects_to_serializable(item) for item in data]
 
         try:
-            response = requests.post(f"{self.base_url}/export_cryo_to_soak/", json=data)
+            response = self.session.post(f"{self.base_url}/export_cryo_to_soak/", json=data)
             response.raise_for_status()  # Check for HTTP request errors
             result = response.json()
             # MockUpdateResult is used for demonstration; replace with actual parsing logic
@@ -1108,7 +2240,7 @@ class ffcsdbclient(object):
 
 
         try:
-            response = requests.post(f"{self.base_url}/import_soaking_results/", json=wells_data)
+            response = self.session.post(f"{self.base_url}/import_soaking_results/", json=wells_data)
             response.raise_for_status()  # Will raise an HTTPError if the HTTP request returned an unsuccessful status code
             return response.json()
         except requests.exceptions.HTTPError as http_err:
@@ -1154,7 +2286,7 @@ class ffcsdbclient(object):
             "well_echo": well_echo,
             "transfer_status": transfer_status
         }
-        response = requests.post(f"{self.base_url}/mark_soak_for_well_in_echo_done/", json=data)
+        response = self.session.post(f"{self.base_url}/mark_soak_for_well_in_echo_done/", json=data)
         
         # Check for successful request before attempting to parse the response.
         if response.status_code != 200:
@@ -1202,7 +2334,7 @@ class ffcsdbclient(object):
         data = convert_objects_to_serializable(data)
 
         try:
-            response = requests.post(f"{self.base_url}/add_cryo/", json=data)
+            response = self.session.post(f"{self.base_url}/add_cryo/", json=data)
             response.raise_for_status()  # Raise an HTTPError if the HTTP request returned an unsuccessful status code
     
             result = response.json()
@@ -1235,7 +2367,7 @@ class ffcsdbclient(object):
             ValueError: If the response from the server cannot be parsed as JSON.
             HTTPError: If the server responds with a non-200 status code.
         """
-        response = requests.patch(f"{self.base_url}/remove_cryo_from_well/{well_id}")
+        response = self.session.patch(f"{self.base_url}/remove_cryo_from_well/{well_id}")
 
         if response.ok:
             try:
@@ -1276,7 +2408,7 @@ class ffcsdbclient(object):
             RequestException: If the HTTP request fails.
         """
         try:
-            response = requests.patch(f"{self.base_url}/remove_new_solvent_from_well/{well_id}")
+            response = self.session.patch(f"{self.base_url}/remove_new_solvent_from_well/{well_id}")
             response.raise_for_status()  # This will raise an HTTPError if the HTTP request returned an unsuccessful status code
             result = response.json()
     
@@ -1314,7 +2446,7 @@ class ffcsdbclient(object):
         request_url = f"{self.base_url}/get_cryo_usage/{user}/{campaign_id}"
         
         # Send the GET request and capture the response
-        response = requests.get(request_url)
+        response = self.session.get(request_url)
         
         try:
             # Attempt to parse the JSON response
@@ -1350,7 +2482,7 @@ class ffcsdbclient(object):
         request_url = f"{self.base_url}/get_solvent_usage/{user}/{campaign_id}"
     
         ### Execute the GET request.
-        response = requests.get(request_url)
+        response = self.session.get(request_url)
     
         try:
             ### Parse the JSON response.
@@ -1396,7 +2528,7 @@ class ffcsdbclient(object):
     
         # Send PATCH request
         try:
-            response = requests.patch(f"{self.base_url}/redesolve_in_new_solvent/", json=request_data)
+            response = self.session.patch(f"{self.base_url}/redesolve_in_new_solvent/", json=request_data)
             response.raise_for_status()  # Check if the request was successful
         except requests.RequestException as req_error:
             print(f"Failed to send request: {req_error}")
@@ -1417,6 +2549,115 @@ class ffcsdbclient(object):
             return None
     ### FETCH_TAG redesolve_in_new_solvent
 
+    ### FETCH_TAG add_cryo_many
+    def add_cryo_many(self, data: List[Dict[str, Any]]) -> Optional[List[MockUpdateResult]]:
+        """
+        Sends one POST request to add cryoprotection details to many wells, executed as one bulk write on the server.
+
+        Args:
+            data: A list of dictionaries, one per target well, each with the keys of add_cryo ('user_account',
+                  'campaign_id', 'target_plate', 'target_well', 'cryo_desired_concentration', 'cryo_transfer_volume',
+                  'cryo_source_well', 'cryo_name' and 'cryo_barcode').
+
+        Returns:
+            Optional[List[MockUpdateResult]]: The result of every target well in the order of data, or None if the
+                                              request failed. The raw_result of a failed well contains its 'error'.
+        """
+        return self._bulk_update("post", "add_cryo_many", {"targets": [convert_objects_to_serializable(item) for item in data]})
+    ### FETCH_TAG add_cryo_many
+
+    ### FETCH_TAG remove_cryo_from_wells
+    def remove_cryo_from_wells(self, well_ids: List[Union[str, ObjectId]]) -> Optional[Dict[str, MockUpdateResult]]:
+        """
+        Sends one PATCH request to remove the cryoprotectant data from many wells, the bulk counterpart of
+        remove_cryo_from_well.
+
+        Args:
+            well_ids (List[Union[str, ObjectId]]): The ObjectIds of the wells.
+
+        Returns:
+            Optional[Dict[str, MockUpdateResult]]: The result of every well, keyed by its ObjectId string, or None if
+                                                   the request failed. Repeated ObjectIds are sent once.
+        """
+        return self._bulk_update_wells("remove_cryo_from_wells", well_ids)
+    ### FETCH_TAG remove_cryo_from_wells
+
+    ### FETCH_TAG remove_new_solvent_from_wells
+    def remove_new_solvent_from_wells(self, well_ids: List[Union[str, ObjectId]]) -> Optional[Dict[str, MockUpdateResult]]:
+        """
+        Sends one PATCH request to remove the New Solvent from many wells, the bulk counterpart of
+        remove_new_solvent_from_well.
+
+        Args:
+            well_ids (List[Union[str, ObjectId]]): The ObjectIds of the wells.
+
+        Returns:
+            Optional[Dict[str, MockUpdateResult]]: The result of every well, keyed by its ObjectId string, or None if
+                                                   the request failed. Repeated ObjectIds are sent once.
+        """
+        return self._bulk_update_wells("remove_new_solvent_from_wells", well_ids)
+    ### FETCH_TAG remove_new_solvent_from_wells
+
+    ### FETCH_TAG redesolve_in_new_solvent_many
+    def redesolve_in_new_solvent_many(self, user_account: str, campaign_id: str,
+                                      targets: List[Dict[str, Any]]) -> Optional[List[MockUpdateResult]]:
+        """
+        Sends one PATCH request to redesolve many wells in a new solvent, executed as one bulk write on the server.
+
+        Args:
+            user_account (str): The user account identifier.
+            campaign_id (str): The campaign identifier.
+            targets (List[Dict[str, Any]]): One dictionary per target well with the keys 'target_plate', 'target_well',
+                                            'redesolve_transfer_volume', 'redesolve_source_well', 'redesolve_name' and
+                                            'redesolve_barcode', like the arguments of redesolve_in_new_solvent.
+
+        Returns:
+            Optional[List[MockUpdateResult]]: The result of every target well in the order of targets, or None if the
+                                              request failed. The raw_result of a failed well contains its 'error'.
+        """
+        payload = {
+            "user_account": user_account,
+            "campaign_id": campaign_id,
+            "targets": [convert_objects_to_serializable(target) for target in targets],
+        }
+        return self._bulk_update("patch", "redesolve_in_new_solvent_many", payload)
+    ### FETCH_TAG redesolve_in_new_solvent_many
+
+    def _bulk_update_wells(self, endpoint: str, well_ids: List[Union[str, ObjectId]]) -> Optional[Dict[str, MockUpdateResult]]:
+        """
+        Sends a bulk write for the given wells, each sent once, and returns the results keyed by ObjectId string.
+        """
+        well_ids = list(dict.fromkeys(str(well_id) for well_id in well_ids))
+        results = self._bulk_update("patch", endpoint, {"well_ids": well_ids})
+        if results is None:
+            return None
+        if len(results) != len(well_ids):
+            print(f"{endpoint} returned {len(results)} results for {len(well_ids)} wells.")
+            return None
+        return dict(zip(well_ids, results))
+
+    def _bulk_update(self, method: str, endpoint: str, payload: dict) -> Optional[List[MockUpdateResult]]:
+        """
+        Sends a bulk write request and returns the per-well results in the order of the request.
+        """
+        try:
+            response = self.session.request(method.upper(), f"{self.base_url}/{endpoint}/", json=payload)
+            response.raise_for_status()
+            results = response.json()["results"]
+        except requests.RequestException as e:
+            print(f"Request failed: {e}")
+            return None
+        except (ValueError, KeyError) as e:
+            print(f"Could not parse JSON: {e}")
+            return None
+
+        return [MockUpdateResult(
+                    matched_count=result.get("matched_count", 0),
+                    modified_count=result.get("modified_count", 0),
+                    upserted_id=result.get("upserted_id"),
+                    raw_result=result.get("raw_result") or {"error": result.get("error")},
+                ) for result in results]
+
     ### FETCH_TAG update_notes
     def update_notes(self, user: str, campaign_id: str, doc_id: str, note: str) -> Any:
         """
@@ -1447,7 +2688,7 @@ class ffcsdbclient(object):
         }
     
         # Perform the PATCH request
-        response = requests.patch(f"{self.base_url}/update_notes/", json=payload)
+        response = self.session.patch(f"{self.base_url}/update_notes/", json=payload)
     
         # Try to parse the JSON response
         try:
@@ -1476,7 +2717,7 @@ class ffcsdbclient(object):
             None: Any exceptions are caught and printed.
         """
         ### Send a GET request to the corresponding API endpoint
-        response = requests.get(f"{self.base_url}/is_crystal_already_fished/{plate_id}/{well_id}")
+        response = self.session.get(f"{self.base_url}/is_crystal_already_fished/{plate_id}/{well_id}")
     
         try:
             ### Parse the JSON result from the server response
@@ -1494,7 +2735,7 @@ class ffcsdbclient(object):
 
     ### FETCH_TAG update_shifter_fishing_result
     def update_shifter_fishing_result(self, well_shifter_data: dict, xtal_name_index: int, xtal_name_prefix: str) -> Any:
-        response = requests.patch(f"{self.base_url}/update_shifter_fishing_result", json={
+        response = self.session.patch(f"{self.base_url}/update_shifter_fishing_result", json={
             'well_shifter_data': well_shifter_data,
             'xtal_name_index': xtal_name_index,
             'xtal_name_prefix': xtal_name_prefix
@@ -1508,6 +2749,9 @@ class ffcsdbclient(object):
                 upserted_id=result["upserted_id"],
                 raw_result=result["raw_result"],
                 )
+            key = (str(well_shifter_data.get("plateId")), well_from_shifter_data(well_shifter_data))
+            for index in list(self._membership_indexes):
+                index._wells_fished([key], certain=bool(update_result.modified_count))
             return update_result
 
         except Exception as e:
@@ -1540,7 +2784,7 @@ class ffcsdbclient(object):
 
         try:
             ### Make a POST request to the ffcs_db server with fishing results as JSON payload
-            response = requests.post(f"{self.base_url}/import_fishing_results", json=fishing_results)
+            response = self.session.post(f"{self.base_url}/import_fishing_results", json=fishing_results)
     
             ### Attempt to parse the JSON response from the server
             result = response.json()
@@ -1552,6 +2796,11 @@ class ffcsdbclient(object):
                 upserted_id=result["upserted_id"],
                 raw_result=result["raw_result"]
             )
+
+            ### The result has no counts per well, so the wells are looked up on the server until the next refresh
+            keys = [(str(item.get("plateId")), well_from_shifter_data(item)) for item in fishing_results]
+            for index in list(self._membership_indexes):
+                index._wells_fished(keys, certain=False)
     
             return update_result
         except Exception as e:
@@ -1564,6 +2813,10 @@ class ffcsdbclient(object):
     def find_user_from_plate_id(self, plate_id: str) -> Any:
         """
         Retrieves user information based on the provided plate ID by sending a GET request to the server.
+
+        The owner of a plate does not change while the plate exists, so resolved owners are memoized (and kept in
+        plate_owner_cache_path if given) and later calls for the same plate do not send a request. Adding or
+        deleting plates through this client forgets the affected owners.
         
         Parameters:
         - plate_id (str): The plate ID used to search for the user.
@@ -1577,10 +2830,16 @@ class ffcsdbclient(object):
         Exceptions:
         - Raises any exceptions originating from the requests library or from JSON parsing.
         """
-        response = requests.get(f"{self.base_url}/find_user_from_plate_id/{plate_id}")
+        with self._plate_owners_lock:
+            owner = self._plate_owners.get(str(plate_id))
+        if owner is not None:
+            return dict(owner)
+
+        response = self.session.get(f"{self.base_url}/find_user_from_plate_id/{plate_id}")
     
         try:
             result = response.json()  ### Parse the JSON response
+            self._remember_plate_owners({str(plate_id): result})
             return result  ### Return the parsed result
         except Exception as e:
             ### Handle exceptions during JSON parsing
@@ -1588,6 +2847,98 @@ class ffcsdbclient(object):
             return None  ### Return None if JSON parsing fails
     ### FETCH_TAG find_user_from_plate_id
 
+    ### FETCH_TAG find_users_from_plate_ids
+    def find_users_from_plate_ids(self, plate_ids: List[str]) -> Optional[Dict[str, Optional[dict]]]:
+        """
+        Retrieves the user information of several plates like find_user_from_plate_id. Owners that are not
+        memoized yet are resolved with one POST request for all of them.
+
+        Args:
+            plate_ids (List[str]): The plate IDs.
+
+        Returns:
+            Optional[Dict[str, Optional[dict]]]: The user information ('user', 'campaign_id') by plate ID, None for
+                                                 plates that are not found. None if the request failed.
+        """
+        plate_ids = [str(plate_id) for plate_id in plate_ids]
+        with self._plate_owners_lock:
+            owners = {plate_id: dict(self._plate_owners[plate_id]) for plate_id in plate_ids if plate_id in self._plate_owners}
+        missing = list(dict.fromkeys(plate_id for plate_id in plate_ids if plate_id not in owners))
+        if not missing:
+            return owners
+
+        try:
+            response = self.session.post(f"{self.base_url}/find_users_from_plate_ids/", json={"plate_ids": missing})
+            response.raise_for_status()
+            resolved = response.json()["users"]
+        except requests.RequestException as http_error:
+            print(f"HTTP error occurred: {http_error}")
+            return None
+        except KeyError as key_error:
+            print(f"Unexpected format: {key_error} key missing in the JSON response.")
+            return None
+        except ValueError as json_error:
+            print(f"Could not parse JSON: {json_error}")
+            return None
+
+        self._remember_plate_owners(resolved)
+        for plate_id in missing:
+            owners[plate_id] = resolved.get(plate_id)
+        return owners
+    ### FETCH_TAG find_users_from_plate_ids
+
+    def _load_plate_owners(self) -> Dict[str, dict]:
+        if not self.plate_owner_cache_path or not os.path.exists(self.plate_owner_cache_path):
+            return {}
+        try:
+            with open(self.plate_owner_cache_path, 'r') as file:
+                return json.load(file)
+        except (OSError, ValueError) as e:
+            print(f"Could not read plate owner cache {self.plate_owner_cache_path}: {e}")
+            return {}
+
+    def _save_plate_owners(self):
+        """
+        Writes the memoized owners to plate_owner_cache_path; called with _plate_owners_lock held.
+        """
+        if not self.plate_owner_cache_path:
+            return
+        temp_path = f"{self.plate_owner_cache_path}.tmp"
+        try:
+            with open(temp_path, 'w') as file:
+                json.dump(self._plate_owners, file)
+            os.replace(temp_path, self.plate_owner_cache_path)
+        except OSError as e:
+            print(f"Could not write plate owner cache {self.plate_owner_cache_path}: {e}")
+
+    def _remember_plate_owners(self, owners: Dict[str, Any]):
+        """
+        Memoizes the owners of plates that were found; other results (None, error messages) are not kept.
+        """
+        found = {plate_id: {"user": owner["user"], "campaign_id": owner["campaign_id"]}
+                 for plate_id, owner in owners.items()
+                 if isinstance(owner, dict) and owner.get("user") and owner.get("campaign_id")}
+        if not found:
+            return
+        with self._plate_owners_lock:
+            self._plate_owners.update(found)
+            self._save_plate_owners()
+
+    def _forget_plate_owners(self, plate_ids: Optional[List[str]] = None):
+        """
+        Forgets the memoized owners of the given plates, of all plates if plate_ids is None.
+        """
+        with self._plate_owners_lock:
+            if plate_ids is None:
+                changed = bool(self._plate_owners)
+                self._plate_owners.clear()
+            else:
+                changed = False
+                for plate_id in plate_ids:
+                    changed = self._plate_owners.pop(str(plate_id), None) is not None or changed
+            if changed:
+                self._save_plate_owners()
+
     ### FETCH_TAG find_last_fished_xtal
     def find_last_fished_xtal(self, user: str, campaign_id: str) -> Any:
         """
@@ -1608,7 +2959,7 @@ class ffcsdbclient(object):
         
         ### Perform the HTTP GET request
         try:
-            response = requests.get(url)
+            response = self.session.get(url)
             response.raise_for_status()  ### Raise HTTPError for bad responses
         except requests.HTTPError as http_err:
             print(f"HTTP error occurred: {http_err}")
@@ -1642,7 +2993,7 @@ class ffcsdbclient(object):
         :return: An integer representing the next available crystal number or None if unsuccessful
         """
         try:
-            response = requests.get(f"{self.base_url}/get_next_xtal_number/{plate_id}")
+            response = self.session.get(f"{self.base_url}/get_next_xtal_number/{plate_id}")
             response.raise_for_status()  ### Raise exception for HTTP errors
     
             result = response.json()
@@ -1657,7 +3008,78 @@ class ffcsdbclient(object):
         return None  ### Return None if any exception occurs
     ### FETCH_TAG get_next_xtal_number
 
+    ### FETCH_TAG reserve_xtal_numbers
+    def reserve_xtal_numbers(self, plate_id: str, count: int) -> Optional[dict]:
+        """
+        Sends a POST request to reserve a block of xtal numbers of a plate, which the server does not hand out again
+        until they are released. Used by XtalNumberAllocator.
+
+        Args:
+            plate_id (str): The identifier of the plate.
+            count (int): Number of xtal numbers to reserve.
+
+        Returns:
+            Optional[dict]: A dictionary with 'lease_id' and the reserved 'numbers', or None if the request failed.
+        """
+        try:
+            response = self.session.post(f"{self.base_url}/reserve_xtal_numbers/", json={"plate_id": str(plate_id), "count": count})
+            response.raise_for_status()
+            result = response.json()
+            return {"lease_id": result["lease_id"], "numbers": result["numbers"]}
+        except requests.RequestException as http_error:
+            print(f"HTTP error occurred: {http_error}")
+        except KeyError as key_error:
+            print(f"Unexpected format: {key_error} key missing in the JSON response.")
+        except ValueError as json_error:
+            print(f"Could not parse JSON: {json_error}")
+        return None
+    ### FETCH_TAG reserve_xtal_numbers
+
+    ### FETCH_TAG release_xtal_numbers
+    def release_xtal_numbers(self, plate_id: str, lease_id: str, numbers: List[int]) -> Optional[dict]:
+        """
+        Sends a POST request to return reserved xtal numbers that were not used.
+
+        Args:
+            plate_id (str): The identifier of the plate.
+            lease_id (str): The lease_id returned by reserve_xtal_numbers.
+            numbers (List[int]): The unused numbers of the lease.
+
+        Returns:
+            Optional[dict]: The response of the server, or None if the request failed.
+        """
+        try:
+            response = self.session.post(f"{self.base_url}/release_xtal_numbers/",
+                                         json={"plate_id": str(plate_id), "lease_id": lease_id, "numbers": list(numbers)})
+            response.raise_for_status()
+            return response.json()
+        except requests.RequestException as http_error:
+            print(f"HTTP error occurred: {http_error}")
+        except ValueError as json_error:
+            print(f"Could not parse JSON: {json_error}")
+        return None
+    ### FETCH_TAG release_xtal_numbers
+
+    ### FETCH_TAG xtal_number_allocator
+    def xtal_number_allocator(self, block_size: int = 20) -> XtalNumberAllocator:
+        """
+        Returns an allocator that replaces get_next_xtal_number when naming fished crystals:
+
+            with client.xtal_number_allocator(block_size=20) as allocator:
+                xtal_name_index = allocator.next(plate_id)
+                client.update_shifter_fishing_result(well_shifter_data, xtal_name_index, xtal_name_prefix)
+
+        Args:
+            block_size (int): Number of xtal numbers reserved per plate and request.
+
+        Returns:
+            XtalNumberAllocator: The allocator; unused numbers are released when it is closed.
+        """
+        return XtalNumberAllocator(self, block_size=block_size)
+    ### FETCH_TAG xtal_number_allocator
+
     ### FETCH_TAG get_soaked_wells
+    @single_flight
     def get_soaked_wells(self, user: str, campaign_id: str) -> Any:
         """
         Retrieve soaked wells from the server for a given user and campaign ID.
@@ -1668,7 +3090,7 @@ class ffcsdbclient(object):
         """
         try:
             # Make the HTTP request
-            response = requests.get(f"{self.base_url}/get_soaked_wells/{user}/{campaign_id}")
+            response = self.session.get(f"{self.base_url}/get_soaked_wells/{user}/{campaign_id}")
     
             # Validate HTTP response
             if response.status_code != 200:
@@ -1697,6 +3119,7 @@ class ffcsdbclient(object):
     ### FETCH_TAG get_soaked_wells
 
     ### FETCH_TAG get_number_of_unsoaked_wells
+    @single_flight
     def get_number_of_unsoaked_wells(self, user: str, campaign_id: str) -> int:
         """
         Retrieve the number of unsoaked wells for a given user and campaign ID by querying the FastAPI server.
@@ -1710,7 +3133,7 @@ class ffcsdbclient(object):
         
         try:
             ### Send the GET request to the server
-            response = requests.get(url)
+            response = self.session.get(url)
             
             ### Parse the JSON response
             result = response.json()
@@ -1748,7 +3171,7 @@ class ffcsdbclient(object):
     
         try:
             # Sending the PUT request
-            response = requests.put(f"{self.base_url}/update_soaking_duration", json=payload)
+            response = self.session.put(f"{self.base_url}/update_soaking_duration", json=payload)
             response.raise_for_status()  # Raise exception for HTTP errors
             result_json = response.json()  # Parse the JSON response
         except requests.RequestException as req_err:
@@ -1785,7 +3208,7 @@ class ffcsdbclient(object):
         api_url = f"{self.base_url}/get_all_fished_wells/{user}/{campaign_id}"
         
         ### Execute the GET request to fetch data from the server
-        response = requests.get(api_url)
+        response = self.session.get(api_url)
         
         try:
             ### Parse the JSON response from the server
@@ -1813,7 +3236,7 @@ class ffcsdbclient(object):
             list: A list of well data that meet the conditions, or an empty list if an error occurs.
         """
         url = f"{self.base_url}/get_all_wells_not_exported_to_datacollection_xls/{user}/{campaign_id}"
-        response = requests.get(url)
+        response = self.session.get(url)
         try:
             result = response.json()
             if "wells_not_exported_to_xls" in result:
@@ -1842,7 +3265,7 @@ class ffcsdbclient(object):
         url = f"{self.base_url}/mark_exported_to_xls"
         
         try:
-            response = requests.put(url, json=payload)
+            response = self.session.put(url, json=payload)
             response.raise_for_status()
             response_json = response.json()
             
@@ -1871,7 +3294,7 @@ class ffcsdbclient(object):
         dict: A dictionary containing acknowledgement status and inserted_id if successful.
         """
         try:
-            response = requests.post(f"{self.base_url}/send_notification/{user_account}/{campaign_id}/{notification_type}")
+            response = self.session.post(f"{self.base_url}/send_notification/{user_account}/{campaign_id}/{notification_type}")
             response.raise_for_status()
             data = response.json()
             if 'status' in data and data['status'] == "success":
@@ -1897,7 +3320,7 @@ class ffcsdbclient(object):
         Side-effects:
             - Prints an error message if the operation fails.
         """
-        response = requests.get(f"{self.base_url}/get_notifications/{user_account}/{campaign_id}/{timestamp}")
+        response = self.session.get(f"{self.base_url}/get_notifications/{user_account}/{campaign_id}/{timestamp}")
         if response.status_code == 200:
             data = response.json()["notifications"]
     
@@ -1912,6 +3335,35 @@ class ffcsdbclient(object):
             return None
     ### FETCH_TAG get_notifications
 
+    ### FETCH_TAG subscribe_notifications
+    def subscribe_notifications(self, user_account: str, campaign_id: str, callback: Callable[[dict], None],
+                                timestamp: Optional[str] = None, poll_interval: float = 2.0) -> 'NotificationSubscription':
+        """
+        Subscribes to new notifications of a user and campaign instead of polling get_notifications.
+
+        Notifications are pushed by the server as server-sent events from the /subscribe_notifications
+        endpoint and passed to the callback in a background thread, in the same format as the items of
+        get_notifications. Dropped connections are re-established automatically and resume after the last
+        received notification. If the server does not support push, the subscription falls back to polling
+        get_notifications every poll_interval seconds while keeping track of the last seen notification, and
+        tries push again every 30 polls. Events that cannot be parsed are reported and skipped.
+
+        Args:
+            user_account (str): The user account to receive notifications for.
+            campaign_id (str): The campaign ID to receive notifications for.
+            callback (Callable[[dict], None]): Called once for every new notification.
+            timestamp (str, optional): Only notifications after this ISO timestamp are delivered. Defaults to now (UTC).
+            poll_interval (float): Seconds between requests if the subscription falls back to polling.
+
+        Returns:
+            NotificationSubscription: The running subscription; call close() to stop it.
+        """
+        subscription = NotificationSubscription(self, user_account, campaign_id, callback,
+                                                timestamp or datetime.utcnow().isoformat(), poll_interval)
+        subscription.start()
+        return subscription
+    ### FETCH_TAG subscribe_notifications
+
     ### FETCH_TAG add_fragment_to_well
     def add_fragment_to_well(self, library, well_id, fragment, solvent_volume,
                              ligand_transfer_volume, ligand_concentration,
@@ -1948,7 +3400,7 @@ class ffcsdbclient(object):
         }
     
         try:
-            response = requests.post(f"{self.base_url}/add_fragment_to_well/", json=payload)
+            response = self.session.post(f"{self.base_url}/add_fragment_to_well/", json=payload)
             response.raise_for_status()  # Check for HTTP request errors
             result = response.json()
             return MockUpdateOneResultOld(result["result"]["nModified"], result["result"]["ok"], result["result"]["n"])
@@ -1957,6 +3409,52 @@ class ffcsdbclient(object):
             return None
     ### FETCH_TAG add_fragment_to_well
 
+    ### FETCH_TAG add_fragments_to_wells
+    def add_fragments_to_wells(self, library: dict, assignments: List[dict]) -> Optional[Dict[str, MockUpdateOneResultOld]]:
+        """
+        Sends one POST request to add fragments of a library to many wells, e.g. to assign a library to a whole plate.
+
+        The library is sent once for all wells, instead of once per well as with add_fragment_to_well.
+
+        Args:
+            library (dict): Information about the library including its ID, name, and barcode.
+            assignments (List[dict]): One dictionary per well with the keys 'well_id', 'fragment', 'solvent_volume',
+                                      'ligand_transfer_volume', 'ligand_concentration' and optionally 'is_solvent_test'
+                                      (defaults to False), with the same meaning as the arguments of add_fragment_to_well.
+
+        Returns:
+            Optional[Dict[str, MockUpdateOneResultOld]]: The result of every well, keyed by its ObjectId string, or
+                                                         None if the request failed.
+        """
+        library = dict(library)
+        library['_id'] = str(library['_id'])
+        payload = {
+            "library": library,
+            "assignments": [{
+                "well_id": str(assignment["well_id"]),
+                "fragment": convert_objects_to_serializable(assignment["fragment"]),
+                "solvent_volume": assignment["solvent_volume"],
+                "ligand_transfer_volume": assignment["ligand_transfer_volume"],
+                "ligand_concentration": assignment["ligand_concentration"],
+                "is_solvent_test": assignment.get("is_solvent_test", False),
+            } for assignment in assignments],
+        }
+
+        try:
+            response = self.session.post(f"{self.base_url}/add_fragments_to_wells/", json=payload)
+            response.raise_for_status()  # Check for HTTP request errors
+            result = response.json()
+            return {str(item["well_id"]): MockUpdateOneResultOld(item["result"]["nModified"], item["result"]["ok"], item["result"]["n"])
+                    for item in result["results"]}
+        except (ValueError, KeyError, TypeError) as e:
+            ### Also an error body such as {"detail": ...} or a result without the expected fields
+            print(f"Could not parse JSON: {e}")
+            return None
+        except requests.RequestException as e:
+            print(f"Request failed: {e}")
+            return None
+    ### FETCH_TAG add_fragments_to_wells
+
     ### FETCH_TAG remove_fragment_from_well
     def remove_fragment_from_well(self, well_id: ObjectId) -> dict:
         """
@@ -1977,7 +3475,7 @@ class ffcsdbclient(object):
             RequestException: For issues like network problems, or connection timeouts.
         """
         try:
-            response = requests.post(f"{self.base_url}/remove_fragment_from_well/?well_id={str(well_id)}")
+            response = self.session.post(f"{self.base_url}/remove_fragment_from_well/?well_id={str(well_id)}")
             response.raise_for_status()  # Raises HTTPError for bad HTTP response statuses
     
             result = response.json()
@@ -1991,6 +3489,34 @@ class ffcsdbclient(object):
             return {}
     ### FETCH_TAG remove_fragment_from_well
 
+    ### FETCH_TAG remove_fragments_from_wells
+    def remove_fragments_from_wells(self, well_ids: List[Union[str, ObjectId]]) -> Optional[Dict[str, MockUpdateOneResultOld]]:
+        """
+        Sends one POST request to remove the fragments from many wells, the bulk counterpart of remove_fragment_from_well.
+
+        Args:
+            well_ids (List[Union[str, ObjectId]]): The ObjectIds of the wells.
+
+        Returns:
+            Optional[Dict[str, MockUpdateOneResultOld]]: The result of every well, keyed by its ObjectId string, or
+                                                         None if the request failed.
+        """
+        try:
+            response = self.session.post(f"{self.base_url}/remove_fragments_from_wells/",
+                                         json={"well_ids": [str(well_id) for well_id in well_ids]})
+            response.raise_for_status()  # Raises HTTPError for bad HTTP response statuses
+            result = response.json()
+            return {str(item["well_id"]): MockUpdateOneResultOld(item["result"]["nModified"], item["result"]["ok"], item["result"]["n"])
+                    for item in result["results"]}
+        except (json.JSONDecodeError, KeyError, TypeError) as e:
+            ### Also an error body such as {"detail": ...} or a result without the expected fields
+            print(f"Could not parse JSON: {e}")
+            return None
+        except requests.RequestException as e:
+            print(f"Request failed: {e}")
+            return None
+    ### FETCH_TAG remove_fragments_from_wells
+
     ### FETCH_TAG import_library
     def import_library(self, library: dict) -> dict:
         """
@@ -2011,20 +3537,128 @@ class ffcsdbclient(object):
         """
         library['libraryBarcode'] = str(library['libraryBarcode'])
         library = convert_objects_to_serializable(library)
-        response = requests.post(f"{self.base_url}/import_library/", json=library)
+        response = self.session.post(f"{self.base_url}/import_library/", json=library)
         try:
             result = response.json()
-            return MockInsertOneResult(result["result"]["ok"] == 1.0, result["result"]["_id"])
+            insert_result = MockInsertOneResult(result["result"]["ok"] == 1.0, result["result"]["_id"])
         except Exception as e:
             print(f"Could not parse JSON: {e}")
             return {}
+
+        self._notify_library_imported(str(insert_result.inserted_id), library)
+        return insert_result
     ### FETCH_TAG import_library
 
+    def _notify_library_imported(self, library_id: str, library: Optional[dict] = None):
+        """
+        Passes an imported library to the fingerprint indexes and depiction caches of the client. A failing
+        listener is reported and does not affect the import or the other listeners.
+        """
+        for listener in list(self._library_import_listeners):
+            try:
+                listener._library_imported(library_id, library)
+            except Exception as e:
+                print(f"Could not pass library {library_id} to {type(listener).__name__}: {e}")
+
+    ### FETCH_TAG import_library_chunked
+    def import_library_chunked(self, library: dict, fragments: Iterable[dict], chunk_size: int = 500,
+                               progress: Optional[Callable[[int], None]] = None) -> Union[MockInsertOneResult, dict]:
+        """
+        Imports a library like import_library, with its fragments taken from an iterator and uploaded in chunks,
+        so large libraries are neither built in memory nor sent as one request body.
+
+        The import is opened on the server under the libraryBarcode, which keeps the number of fragments it has
+        acknowledged. If a chunk fails, the import can be resumed by calling the method again with the same library
+        and the same fragments from the beginning: fragments the server already acknowledged are skipped. The
+        library is only created once all fragments are uploaded and the import is committed.
+
+        Args:
+            library (dict): The library data without 'fragments' (e.g. 'libraryName' and 'libraryBarcode').
+            fragments (Iterable[dict]): The fragments of the library, each with 'compoundCode', 'smiles', 'well',
+                                        'used' and optionally 'libraryConcentration'.
+            chunk_size (int): Number of fragments per request.
+            progress (Callable, optional): Called after every acknowledged chunk with the number of fragments
+                                           the server has received.
+
+        Returns:
+            MockInsertOneResult: The result of the import once committed, as returned by import_library. An empty
+                                 dictionary if a request failed; the import can then be resumed.
+
+        Raises:
+            ValueError: If chunk_size is less than 1 or the library contains 'fragments'.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1.")
+        if 'fragments' in library:
+            raise ValueError("Pass the fragments of the library separately to import_library_chunked.")
+
+        library = dict(library)
+        library['libraryBarcode'] = str(library['libraryBarcode'])
+        library = convert_objects_to_serializable(library)
+
+        def post(endpoint: str, payload: dict) -> Optional[dict]:
+            try:
+                response = self.session.post(f"{self.base_url}/{endpoint}/", json=payload)
+                response.raise_for_status()
+                return response.json()
+            except requests.RequestException as http_error:
+                print(f"HTTP error occurred: {http_error}")
+            except ValueError as json_error:
+                print(f"Could not parse JSON: {json_error}")
+            return None
+
+        ### The server returns the number of fragments acknowledged by an earlier, interrupted import
+        begin = post("import_library_begin", library)
+        if not isinstance(begin, dict) or "upload_id" not in begin:
+            print(f"Could not begin the import of library {library['libraryBarcode']}: {begin}")
+            return {}
+        upload_id = begin["upload_id"]
+        received = begin.get("received", 0)
+
+        def upload(offset: int, chunk: List[dict]) -> bool:
+            nonlocal received
+            result = post("import_library_chunk", {"upload_id": upload_id, "offset": offset, "fragments": chunk})
+            acknowledged = result.get("received") if isinstance(result, dict) else None
+            if acknowledged != offset + len(chunk):
+                ### A chunk the server did not acknowledge completely is failed, so no unacknowledged count is committed
+                print(f"Upload of fragments {offset} to {offset + len(chunk)} of library {library['libraryBarcode']} failed"
+                      f" (received: {acknowledged}).")
+                return False
+            received = acknowledged
+            if progress is not None:
+                progress(received)
+            return True
+
+        count = 0
+        chunk: List[dict] = []
+        for fragment in fragments:
+            count += 1
+            if count <= received:
+                continue
+            chunk.append(convert_objects_to_serializable(fragment))
+            if len(chunk) >= chunk_size:
+                if not upload(count - len(chunk), chunk):
+                    return {}
+                chunk = []
+        if chunk and not upload(count - len(chunk), chunk):
+            return {}
+
+        result = post("import_library_commit", {"upload_id": upload_id, "count": count})
+        try:
+            insert_result = MockInsertOneResult(result["result"]["ok"] == 1.0, result["result"]["_id"])
+        except (KeyError, TypeError) as e:
+            print(f"Could not commit the import of library {library['libraryBarcode']}: {e}")
+            return {}
+
+        self._notify_library_imported(str(insert_result.inserted_id))
+        return insert_result
+    ### FETCH_TAG import_library_chunked
+
     ### FETCH_TAG add_campaign_library
     def add_campaign_library(self, campaign_library: dict) -> dict:
         ### campaign_library = [convert_objects_to_serializable(item) for item in campaign_library]
         campaign_library = convert_objects_to_serializable(campaign_library)
-        response = requests.post(f"{self.base_url}/add_campaign_library/", json=campaign_library)
+        response = self.session.post(f"{self.base_url}/add_campaign_library/", json=campaign_library)
 
         try:
             ### Get the response data
@@ -2057,7 +3691,7 @@ class ffcsdbclient(object):
                        error message.
         """
         try:
-            response = requests.get(
+            response = self.session.get(
                 f"{self.base_url}/get_library_usage_count/",
                 params={"user": user, "campaign_id": campaign_id, "library_id": library_id}
             )